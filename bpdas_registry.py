@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+BPDAS Registry
+Daftar database BPDAS dari endpoint wilayah, di-cache ke disk bersama slug-nya
+(BPDAS_SLUG_MAP) dan dipakai bersama oleh compile_pmn, pemutakhiran_baseline
+dan cleanup_baseline.
+
+Request ke API memakai conditional request (ETag / If-Modified-Since). Selama
+cache ada, daftar langsung dilayani dari cache dan refresh berjalan di background,
+sehingga API tidak berada di critical path. Jika API tidak bisa diakses dan cache
+belum ada, dipakai daftar bawaan (DEFAULT_BPDAS_LIST).
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import logging
+import tempfile
+import threading
+import unicodedata
+from typing import List, Dict, Any, Optional
+
+# Konfigurasi endpoint wilayah
+BPDAS_API_CONFIG = {
+    'url': 'https://api.ptnaghayasha.com/api/master/cursor/wilayah',
+    'params': {
+        'include_bpdas': 'true',
+        'include_provinsi': 'false',
+        'include_kabupaten': 'false',
+        'include_kecamatan': 'false',
+        'include_desa': 'false'
+    },
+    'timeout': 10
+}
+
+# Konfigurasi cache registry di disk
+BPDAS_REGISTRY_CONFIG = {
+    'cache_path': os.path.join(tempfile.gettempdir(), 'pmn_bpdas_registry.json'),
+    'ttl_seconds': 6 * 3600  # Setelah TTL, cache tetap dipakai tetapi di-refresh di background
+}
+
+# Mapping nama database BPDAS ke slug yang benar
+# Key: nama database (lowercase), Value: slug untuk filename
+BPDAS_SLUG_MAP = {
+    'agamkuantan': 'agam_kuantan',
+    'akemalamo': 'ake_malamo',
+    'asahanbarumun': 'asahan_barumun',
+    'barito': 'barito',
+    'batanghari': 'batanghari',
+    'baturusacerucuk': 'baturusa_cerucuk',
+    'benainnoelmina': 'benain_noelmina',
+    'bonebolango': 'bone_bolango',
+    'bonelimboto': 'bone_limboto',
+    'brantassampean': 'brantas_sampean',
+    'cimanukcitanduy': 'cimanuk_citanduy',
+    'citarumciliwung': 'citarum_ciliwung',
+    'dodokanmoyosari': 'dodokan_moyosari',
+    'indragirirokan': 'indragiri_rokan',
+    'jeneberangsaddang': 'jeneberang_saddang',
+    'kahayan': 'kahayan',
+    'kapuas': 'kapuas',
+    'karama': 'karama',
+    'ketahun': 'ketahun',
+    'konaweha': 'konaweha',
+    'kruengaceh': 'krueng_aceh',
+    'lariangmamasa': 'lariang_mamasa',
+    'mahakamberau': 'mahakam_berau',
+    'memberamo': 'memberamo',
+    'musi': 'musi',
+    'paluposo': 'palu_poso',
+    'pemalijratun': 'pemali_jratun',
+    'remuransiki': 'remu_ransiki',
+    'sampara': 'sampara',
+    'seijangduriangkang': 'sei_jang_duriangkang',
+    'serayuopakprogo': 'serayu_opak_progo',
+    'solo': 'solo',
+    'tondano': 'tondano',
+    'undaanyar': 'unda_anyar',
+    'waehapubatumerah': 'waehapu_batu_merah',
+    'wampuseiular': 'wampu_sei_ular',
+    'wayseputihwaysekampung': 'way_seputih_way_sekampung',
+}
+
+# Daftar bawaan, hanya dipakai jika API tidak bisa diakses dan cache belum pernah dibuat
+DEFAULT_BPDAS_LIST = [
+    'agamkuantan', 'akemalamo', 'asahanbarumun',
+    'barito', 'batanghari', 'baturusacerucuk', 'benainnoelmina',
+    'bonelimboto', 'brantassampean', 'cimanukcitanduy', 'citarumciliwung',
+    'dodokanmoyosari', 'indragirirokan', 'jeneberangsaddang', 'kahayan', 'kapuas',
+    'karama', 'ketahun', 'konaweha', 'kruengaceh', 'mahakamberau', 'memberamo', 'musi',
+    'paluposo', 'pemalijratun', 'remuransiki', 'seijangduriangkang', 'serayuopakprogo',
+    'solo', 'tondano', 'undaanyar', 'waehapubatumerah', 'wampuseiular', 'wayseputihwaysekampung'
+]
+
+logger = logging.getLogger(__name__)
+
+
+def slugify(value: str) -> str:
+    """
+    Normalisasi & 'slugify' nama -> lowercase, underscore, alfanumerik.
+    Digunakan untuk membuat nama file yang aman.
+    """
+    value = str(value)
+    value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii")
+    value = value.lower().strip()
+    value = re.sub(r"\s+", "_", value)               # spasi -> underscore
+    value = re.sub(r"[^a-z0-9_]+", "", value)        # hanya a-z0-9_
+    value = re.sub(r"_+", "_", value).strip("_")     # rapikan underscore
+    return value or "unknown"
+
+
+def bpdas_key(value: str) -> str:
+    """Normalisasi nama BPDAS ke bentuk nama database (lowercase, tanpa spasi/underscore/dash)"""
+    return str(value).lower().replace(' ', '').replace('_', '').replace('-', '')
+
+
+class BPDASRegistry:
+    def __init__(self, cache_path: str = None, ttl_seconds: int = None):
+        self.cache_path = cache_path or BPDAS_REGISTRY_CONFIG['cache_path']
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else BPDAS_REGISTRY_CONFIG['ttl_seconds']
+        self._refresh_thread = None
+        self._slugs = None  # nama -> slug dari cache, dibaca sekali per instance (lihat get_slug)
+    
+    def __getstate__(self):
+        """State untuk pickle (mis. ke worker process); thread refresh tidak ikut"""
+        state = self.__dict__.copy()
+        state['_refresh_thread'] = None
+        return state
+    
+    def _load_cache(self) -> Optional[Dict[str, Any]]:
+        """Load cache registry dari disk"""
+        try:
+            if not os.path.exists(self.cache_path):
+                return None
+
+            with open(self.cache_path, 'r') as f:
+                cache = json.load(f)
+
+            if not cache.get('bpdas'):
+                return None
+
+            return cache
+
+        except Exception as e:
+            logger.warning(f"Failed to read BPDAS registry cache: {e}")
+            return None
+
+    def _save_cache(self, cache: Dict[str, Any]):
+        """Simpan cache registry ke disk (atomic rename)"""
+        tmp_path = f"{self.cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp_path, self.cache_path)
+        self._slugs = None
+
+    def refresh(self, timeout: int = None) -> bool:
+        """
+        Refresh daftar BPDAS dari API dengan conditional request.
+
+        Returns:
+            True jika cache sudah up-to-date (200 atau 304), False jika request gagal
+        """
+        import requests
+
+        cache = self._load_cache() or {}
+        headers = {}
+        if cache.get('etag'):
+            headers['If-None-Match'] = cache['etag']
+        if cache.get('last_modified'):
+            headers['If-Modified-Since'] = cache['last_modified']
+
+        try:
+            response = requests.get(
+                BPDAS_API_CONFIG['url'],
+                params=BPDAS_API_CONFIG['params'],
+                headers=headers,
+                timeout=timeout or BPDAS_API_CONFIG['timeout']
+            )
+
+            if response.status_code == 304 and cache:
+                cache['fetched_at'] = time.time()
+                self._save_cache(cache)
+                logger.info("BPDAS registry not modified (304), cache revalidated")
+                return True
+
+            response.raise_for_status()
+
+            data = response.json()
+            names = [bpdas_key(item['value']) for item in data['data'] if item['type'] == 'bpdas']
+            if not names:
+                logger.warning("BPDAS registry API returned an empty list, keeping current cache")
+                return False
+
+            # Hapus duplikat dengan tetap menjaga urutan dari API
+            names = list(dict.fromkeys(names))
+
+            added = sorted(set(names) - {item['name'] for item in cache.get('bpdas', [])})
+            if cache and added:
+                logger.info(f"New BPDAS in registry: {added}")
+
+            self._save_cache({
+                'fetched_at': time.time(),
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'bpdas': [{'name': name, 'slug': BPDAS_SLUG_MAP.get(name, slugify(name))} for name in names]
+            })
+            logger.info(f"BPDAS registry refreshed from API: {len(names)} BPDAS")
+            return True
+
+        except Exception as e:
+            logger.warning(f"Failed to refresh BPDAS registry from API: {e}")
+            return False
+
+    def refresh_in_background(self):
+        """
+        Jalankan refresh di thread terpisah (tidak memblok pemanggil). Thread daemon: tidak
+        menahan interpreter saat exit; cache ditulis atomic sehingga refresh yang terputus
+        tidak merusak cache.
+        """
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+
+        self._refresh_thread = threading.Thread(target=self.refresh, name='bpdas-registry-refresh', daemon=True)
+        self._refresh_thread.start()
+
+    def get_entries(self) -> List[Dict[str, str]]:
+        """
+        Daftar BPDAS beserta slug-nya.
+
+        Cache dipakai langsung jika ada; jika cache sudah melewati TTL, refresh
+        dijalankan di background. Request sinkron hanya dilakukan jika cache belum ada.
+        """
+        cache = self._load_cache()
+
+        if cache:
+            age = time.time() - cache.get('fetched_at', 0)
+            if age > self.ttl_seconds:
+                logger.info(f"BPDAS registry cache is {age:.0f}s old, refreshing in background")
+                self.refresh_in_background()
+            return cache['bpdas']
+
+        if self.refresh():
+            cache = self._load_cache()
+            if cache:
+                return cache['bpdas']
+
+        logger.warning("BPDAS registry unavailable (no cache, API unreachable), using built-in list")
+        return [{'name': name, 'slug': BPDAS_SLUG_MAP.get(name, slugify(name))} for name in DEFAULT_BPDAS_LIST]
+
+    def get_bpdas_list(self) -> List[str]:
+        """Daftar nama database BPDAS"""
+        return [item['name'] for item in self.get_entries()]
+
+    def get_slug(self, bpdas_name: str) -> str:
+        """Slug BPDAS untuk nama file (registry -> BPDAS_SLUG_MAP -> slugify)"""
+        key = bpdas_key(bpdas_name)
+
+        # File cache hanya dibaca sekali (dipanggil per BPDAS di step 9B)
+        if self._slugs is None:
+            cache = self._load_cache()
+            self._slugs = {item['name']: item['slug'] for item in cache['bpdas']} if cache else {}
+
+        if key in self._slugs:
+            return self._slugs[key]
+
+        return BPDAS_SLUG_MAP.get(key, slugify(bpdas_name))
+
+
+def main():
+    """Main function"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ('refresh', 'list'):
+        print("Usage:")
+        print("  python bpdas_registry.py refresh      # Refresh cache dari API (untuk cron)")
+        print("  python bpdas_registry.py list         # Tampilkan daftar BPDAS dari cache")
+        sys.exit(1)
+
+    registry = BPDASRegistry()
+
+    if sys.argv[1] == 'refresh':
+        sys.exit(0 if registry.refresh() else 1)
+
+    for item in registry.get_entries():
+        print(f"  {item['name']} -> {item['slug']}")
+
+
+if __name__ == "__main__":
+    main()
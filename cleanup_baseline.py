@@ -8,6 +8,7 @@ import sys
 import logging
 import psycopg2
 from typing import List
+from bpdas_registry import BPDASRegistry
 
 # Konfigurasi Database
 DB_CONFIG = {
@@ -62,15 +63,7 @@ class CleanupBaseline:
             self.bpdas_list = ['bpdastesting']
             logger.info("TEST MODE: Only cleaning bpdastesting")
         else:
-            self.bpdas_list = [
-                'agamkuantan', 'akemalamo', 'asahanbarumun', 
-                'barito', 'batanghari', 'baturusacerucuk', 'benainnoelmina', 
-                'bonelimboto', 'brantassampean', 'cimanukcitanduy', 'citarumciliwung', 
-                'dodokanmoyosari', 'indragirirokan', 'jeneberangsaddang', 'kahayan', 'kapuas', 
-                'karama', 'ketahun', 'konaweha', 'kruengaceh', 'mahakamberau', 'memberamo', 'musi', 
-                'paluposo', 'pemalijratun', 'remuransiki', 'seijangduriangkang', 'serayuopakprogo', 
-                'solo', 'tondano', 'undaanyar', 'waehapubatumerah', 'wampuseiular', 'wayseputihwaysekampung'
-            ]
+            self.bpdas_list = BPDASRegistry().get_bpdas_list()
         
         logger.info(f"Total BPDAS to cleanup: {len(self.bpdas_list)}")
 
@@ -7,26 +7,28 @@ Mengkompilasi data mangrove dari berbagai database BPDAS ke dalam format final
 
 import os
 import sys
-import re
 import json
 import hashlib
 import logging
-import zipfile
+import time
 import tempfile
 import subprocess
-import unicodedata
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from shapely.ops import unary_union, polygonize
-from shapely.geometry import MultiPolygon
-import requests
-import psycopg2
-import psycopg2.extras
-import geopandas as gpd
-import boto3
-from botocore.exceptions import ClientError
-import pandas as pd
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 from pathlib import Path
+from bpdas_registry import BPDASRegistry, BPDAS_SLUG_MAP, slugify  # BPDAS_SLUG_MAP tetap di-export untuk kompatibilitas
+from geojson_stream import GeoJSONStreamError, inspect_feature_collection, validate_feature_collection, describe_feature_count
+from s3_stream import S3MultipartWriter, upload_file as s3_upload_file
+from zip_builder import ParallelZipWriter, ZIP_BUILDER_CONFIG
+from dbf_writer import DBF_WRITER_CONFIG, plan_fields as plan_dbf_fields, record_size as dbf_record_size, write_dbf
+
+# Library berat (geopandas, pandas, shapely, boto3, psycopg2, requests) di-import
+# di dalam fungsi yang memakainya, agar subcommand ringan seperti `check` bisa start cepat.
+if TYPE_CHECKING:
+    import numpy as np
+    import psycopg2
 
 # Konfigurasi Database
 DB_CONFIG = {
@@ -36,6 +38,18 @@ DB_CONFIG = {
     'password': '~nagha2025yasha@~'
 }
 
+# Konfigurasi read replica (opsional)
+# Jika host diisi, stage read-only (export GeoJSON, generate PMTiles, cek status database BPDAS)
+# membaca dari replica, sedangkan semua write tetap ke primary (DB_CONFIG).
+# Bisa juga diarahkan ke instance PostgreSQL lokal kedua sebagai pengganti replica.
+DB_READ_CONFIG = {
+    'host': '',  # Kosong = semua query ke primary
+    'port': 5432,
+    'user': 'pg',
+    'password': '',
+    'max_replay_wait_seconds': 120  # Batas tunggu replica mengejar WAL primary setelah agregasi
+}
+
 # Konfigurasi AWS S3
 S3_CONFIG = {
     'access_key': '',
@@ -54,46 +68,148 @@ PMTILES_BPDAS_CONFIG = {
     's3_prefix': 'idpm/static/layer'  # Base path di S3: idpm/static/layer/{theme}/{year}/bpdas/
 }
 
-# Mapping nama database BPDAS ke slug yang benar
-# Key: nama database (lowercase), Value: slug untuk filename
-BPDAS_SLUG_MAP = {
-    'agamkuantan': 'agam_kuantan',
-    'akemalamo': 'ake_malamo',
-    'asahanbarumun': 'asahan_barumun',
-    'barito': 'barito',
-    'batanghari': 'batanghari',
-    'baturusacerucuk': 'baturusa_cerucuk',
-    'benainnoelmina': 'benain_noelmina',
-    'bonebolango': 'bone_bolango',
-    'bonelimboto': 'bone_limboto',
-    'brantassampean': 'brantas_sampean',
-    'cimanukcitanduy': 'cimanuk_citanduy',
-    'citarumciliwung': 'citarum_ciliwung',
-    'dodokanmoyosari': 'dodokan_moyosari',
-    'indragirirokan': 'indragiri_rokan',
-    'jeneberangsaddang': 'jeneberang_saddang',
-    'kahayan': 'kahayan',
-    'kapuas': 'kapuas',
-    'karama': 'karama',
-    'ketahun': 'ketahun',
-    'konaweha': 'konaweha',
-    'kruengaceh': 'krueng_aceh',
-    'lariangmamasa': 'lariang_mamasa',
-    'mahakamberau': 'mahakam_berau',
-    'memberamo': 'memberamo',
-    'musi': 'musi',
-    'paluposo': 'palu_poso',
-    'pemalijratun': 'pemali_jratun',
-    'remuransiki': 'remu_ransiki',
-    'sampara': 'sampara',
-    'seijangduriangkang': 'sei_jang_duriangkang',
-    'serayuopakprogo': 'serayu_opak_progo',
-    'solo': 'solo',
-    'tondano': 'tondano',
-    'undaanyar': 'unda_anyar',
-    'waehapubatumerah': 'waehapu_batu_merah',
-    'wampuseiular': 'wampu_sei_ular',
-    'wayseputihwaysekampung': 'way_seputih_way_sekampung',
+# Konfigurasi publikasi artifact ke S3
+# ZIP Shapefile/GDB dikompresi langsung ke multipart upload S3 selagi dibuat (tanpa ZIP lokal
+# dan tanpa fase upload terpisah); PMTiles per BPDAS bisa ditulis ogr2ogr langsung ke /vsis3/.
+# Disk lokal hanya menampung file intermediate dan dataset satu tema sebelum di-zip.
+PUBLISH_CONFIG = {
+    'part_size': 64 * 1024 * 1024,  # Ukuran part multipart upload
+    # True = PMTiles per BPDAS ditulis ogr2ogr langsung ke /vsis3/ (tanpa MD5/SHA-256 di manifest);
+    # False = ditulis lokal lalu di-stream ke S3 dengan checksum
+    'gdal_vsis3': False,
+    'min_free_disk_gb': 4,          # Minimal ruang kosong temp dir (preflight)
+    # Kompresi ZIP paralel (zip_builder); member dan chunk member besar dikompres di thread pool
+    'zip_compress_level': 6,        # Level zlib 1-9
+    'zip_workers': None             # None = jumlah CPU dibagi jumlah process tema (lihat _thread_budget)
+}
+
+# Konfigurasi cache artifact (content-addressed, dibagi antar host compiler)
+# Key = hash isi tabel tema (tidak bergantung urutan baris / ogc_fid) + konfigurasi output.
+# Jika data dan konfigurasi tidak berubah, artifact di {s3_prefix}/{prefix}/{fingerprint}/
+# dipublish dengan server-side copy, tanpa export/konversi/tippecanoe ulang.
+# Sebelum agregasi, signature murah tabel sumber BPDAS (_compute_source_signature) dicocokkan
+# ke {prefix}/sources/: jika sumber tidak berubah, agregasi (step 2, 4) dan hash isi tabel dilewati.
+ARTIFACT_CACHE_CONFIG = {
+    'enabled': True,
+    'prefix': 'pmn-cache',
+    # Naikkan untuk membatalkan semua entry saat kode yang menentukan isi artifact berubah
+    # (logika konversi, argumen tippecanoe/ogr2ogr); perubahan konfigurasi output sudah
+    # masuk fingerprint (_artifact_fingerprint)
+    'version': 4
+}
+
+# Konfigurasi cache hasil preflight (status database BPDAS)
+# Hasil cek database BPDAS disimpan ke file agar run berikutnya dalam TTL tidak perlu cek ulang.
+# Hanya hasil pasti yang di-cache; BPDAS yang gagal dicek (error koneksi, timeout) dicek ulang.
+PREFLIGHT_CACHE_CONFIG = {
+    'path': os.path.join(tempfile.gettempdir(), 'pmn_preflight_cache.json'),
+    'ttl_seconds': 900
+}
+
+# Konfigurasi export data nasional (step 7)
+EXPORT_CONFIG = {
+    'fetch_size': 5000,  # Jumlah baris per fetch dari server-side cursor
+    # Format file intermediate yang dipakai step 8 dan 9:
+    #   'parquet'    - GeoParquet (geometry WKB, kolom bertipe), dibaca via Arrow; untuk tippecanoe
+    #                  ditulis ke GeoJSONSeq sementara agar dibaca paralel (-P)
+    #   'flatgeobuf' - FlatGeobuf dengan packed Hilbert R-tree, juga dipakai langsung oleh step 9B
+    #   'geojsonseq' - GeoJSONSeq (RFC 8142), dibaca paralel oleh tippecanoe (-P)
+    #   'geojson'    - GeoJSON FeatureCollection
+    'intermediate_format': 'parquet',
+    # Presisi koordinat (jumlah desimal derajat) untuk semua output; 7 desimal ~1 cm.
+    # Diterapkan sekali saat export via ST_ReducePrecision (hasil tetap valid secara topologi).
+    # None = presisi penuh
+    'coordinate_precision': 7,
+    # Estimasi penghematan ukuran kuantisasi di log (satu query sampel tambahan per export)
+    'estimate_precision_savings': False,
+    'precision_sample_size': 2000  # Jumlah geometry sampel untuk estimasi penghematan ukuran
+}
+
+# Konfigurasi kolom per output (proyeksi kolom pada query export)
+# Tiap profile berisi 'include' (hanya kolom ini) atau 'exclude' (semua kolom kecuali ini).
+# Nama kolom yang tidak ada di tabel tema diabaikan, sehingga satu profile berlaku untuk
+# existing dan potensi. Geometry selalu disertakan; urutan kolom mengikuti tabel.
+OUTPUT_COLUMN_PROFILES = {
+    # PMTiles nasional: hanya atribut yang dirender / ditampilkan di peta
+    'tiles_national': {'include': [
+        'bpdas', 'prov', 'kab', 'namobj', 'fcode', 'kawasan', 'fungsikws', 'konservasi', 'kws',
+        'kttj', 'ints', 'struktur_v', 'klshtn', 'lsmgr', 'lspmgr', 'tahun',
+        'status_p', 'kttj_p', 'ptrmgr_p'
+    ]},
+    # PMTiles per BPDAS: seperti nasional, tanpa bpdas (nilainya sama dalam satu file)
+    'tiles_bpdas': {'include': [
+        'prov', 'kab', 'namobj', 'fcode', 'kawasan', 'fungsikws', 'konservasi', 'kws',
+        'kttj', 'ints', 'struktur_v', 'klshtn', 'lsmgr', 'lspmgr', 'tahun',
+        'status_p', 'kttj_p', 'ptrmgr_p'
+    ]},
+    # Download Shapefile dan GDB: semua atribut kecuali ID internal PostgreSQL
+    'shp': {'exclude': ['ogc_fid']},
+    'gdb': {'exclude': ['ogc_fid']}
+}
+
+# Profile yang dilayani file intermediate step 7 (kolom = gabungan kolom profile ini)
+INTERMEDIATE_PROFILES = ('shp', 'gdb', 'tiles_national')
+
+# Konfigurasi paralelisme pipeline per tema (step 7-9)
+# Tema existing dan potensi diproses di process terpisah; 1 = berurutan di process utama
+PIPELINE_CONFIG = {
+    'max_theme_workers': 2,
+    'artifact_sink_workers': 2  # Thread penulis Shapefile dan GDB dari frame yang sama (step 8)
+}
+
+# Konfigurasi engine I/O file vektor (geopandas read_file/to_file, validator)
+# pyogrio membaca/menulis secara vectorized (use_arrow: batch Arrow + WKB); jika pyogrio
+# tidak terpasang, otomatis kembali ke fiona
+IO_CONFIG = {
+    'engine': 'pyogrio',
+    'use_arrow': True
+}
+
+# Konfigurasi dtype atribut di memori (step 8)
+# Kolom teks berkardinalitas rendah (bpdas, prov, kab, kawasan, ...) disimpan sebagai category,
+# sisanya sebagai string[pyarrow]. Dipilih otomatis dari jumlah nilai unik per kolom.
+DTYPE_CONFIG = {
+    'category_max_unique': 5000,   # Maksimal nilai unik untuk category
+    'category_max_ratio': 0.5      # Maksimal rasio nilai unik / jumlah baris untuk category
+}
+
+# Konfigurasi Shapefile multi-part (step 8)
+# Ukuran .shp dan .dbf diperkirakan dari data sebelum ditulis. Jika melewati batas format
+# (2 GB per file), output dipecah menjadi ..._part01, ..._part02, ... per BPDAS (BPDAS yang
+# sendirian melebihi batas dipecah per rentang feature); semua part masuk ke ZIP yang sama.
+SHAPEFILE_CONFIG = {
+    'max_file_bytes': 1900 * 1024 * 1024,  # Batas per file .shp / .dbf, dengan margin di bawah 2 GB
+    'split_column': 'bpdas'                # None = langsung per rentang feature
+}
+
+# Konfigurasi build reproducible (step 7-9)
+# Data yang sama menghasilkan artifact yang identik per byte, sehingga MD5 di
+# pmn.compiler_datasets, ETag S3 dan cache klien/CDN tidak berubah tanpa perubahan data:
+# urutan feature Shapefile/GDB dan input PMTiles (tippecanoe, ogr2ogr per BPDAS) dari isi baris
+# (ogc_fid diisi ulang setiap agregasi), timestamp member ZIP dan tanggal header DBF tetap, urutan
+# member ZIP stabil, dan UUID katalog GDB deterministik.
+REPRODUCIBLE_CONFIG = {
+    'enabled': True,
+    'build_date': None  # datetime tetap untuk metadata artifact; None = 1 Januari tahun data
+}
+
+# Konfigurasi timeout per kelas operasi
+# statement_timeout dikirim ke PostgreSQL per koneksi (0 = tanpa batas).
+# Proses eksternal (ogr2ogr, tippecanoe) diawasi watchdog: dihentikan jika melewati
+# batas total, atau jika tidak ada progres (output / ukuran file) selama idle_seconds.
+TIMEOUT_CONFIG = {
+    'connect_seconds': 15,
+    'statement_seconds': {
+        'default': 300,       # Query metadata, progress, DDL
+        'aggregate': 1800,    # Query agregasi per BPDAS (step 4)
+        'export': 3600        # Export tabel nasional (step 7, 9B)
+    },
+    'subprocess_seconds': {
+        'ogr2ogr': 3600,
+        'ogr2ogr_bpdas': 1800,
+        'tippecanoe': 4 * 3600
+    },
+    'idle_seconds': 600
 }
 
 # Setup logging
@@ -112,9 +228,18 @@ class PMNCompiler:
     def __init__(self, process_id: str, year: int):
         self.process_id = process_id
         self.year = year
-        self.s3_client = None
+        self._s3_client = None
         self.temp_dir = None
         self.accessible_bpdas = []  # Add this line
+        self.read_replica_ready = None  # None = belum dicek, False = fallback ke primary
+        self._table_schema_cache = {}
+        self._precision_savings = {}  # Estimasi penghematan ukuran kuantisasi koordinat per tema
+        self._artifacts = []  # Artifact yang dipublish run ini (untuk manifest, lihat _write_manifest)
+        self._data_hashes = {}  # Hash isi tabel per tema (untuk cache artifact, lihat _data_hash)
+        self._source_signature = (None, [])  # (signature, BPDAS) sumber agregasi, lihat _restore_aggregation
+        self._aggregation_failures = set()  # BPDAS yang gagal diagregasi di step 4
+        self._theme_processes = 1  # Process tema yang berjalan bersamaan (lihat _thread_budget)
+        self.bpdas_registry = BPDASRegistry()
         
         # Initialize S3 client
         self._init_s3()
@@ -125,33 +250,216 @@ class PMNCompiler:
 
     def _init_s3(self):
         """Initialize AWS S3 client"""
-        try:
-            self.s3_client = boto3.client(
-                's3',
-                aws_access_key_id=S3_CONFIG['access_key'],
-                aws_secret_access_key=S3_CONFIG['secret_key'],
-                region_name=S3_CONFIG['region']
-            )
-            logger.info("AWS S3 client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize S3 client: {e}")
-            raise
+        self._s3_client = _create_s3_client()
+    
+    @property
+    def s3_client(self):
+        """S3 client, dibuat ulang jika belum ada (mis. di worker process)"""
+        if self._s3_client is None:
+            self._s3_client = _create_s3_client()
+        return self._s3_client
+    
+    def __getstate__(self):
+        """State untuk pickle ke worker process (S3 client tidak bisa di-pickle)"""
+        state = self.__dict__.copy()
+        state['_s3_client'] = None
+        return state
 
-    def _get_db_connection(self, database: str = 'postgres') -> psycopg2.extensions.connection:
-        """Get database connection"""
+    def _get_db_connection(self, database: str = 'postgres', read_only: bool = False,
+                           operation: str = 'default') -> 'psycopg2.extensions.connection':
+        """
+        Get database connection
+        
+        Args:
+            database: Nama database
+            read_only: Jika True, koneksi diarahkan ke read replica (jika dikonfigurasi)
+                dan session di-set read-only
+            operation: Kelas operasi untuk statement_timeout (lihat TIMEOUT_CONFIG)
+        """
+        import psycopg2
+
+        db_config = self._read_db_config() if read_only else DB_CONFIG
+        
         try:
             conn = psycopg2.connect(
-                host=DB_CONFIG['host'],
-                port=DB_CONFIG['port'],
-                user=DB_CONFIG['user'],
-                password=DB_CONFIG['password'],
-                database=database
+                host=db_config['host'],
+                port=db_config['port'],
+                user=db_config['user'],
+                password=db_config['password'],
+                database=database,
+                connect_timeout=TIMEOUT_CONFIG['connect_seconds'],
+                options=f"-c statement_timeout={self._statement_timeout_ms(operation)}",
+                keepalives=1,
+                keepalives_idle=30,
+                keepalives_interval=10,
+                keepalives_count=3
             )
+            if read_only:
+                conn.set_session(readonly=True)
             return conn
         except Exception as e:
-            logger.error(f"Failed to connect to database {database}: {e}")
+            logger.error(f"Failed to connect to database {database} on {db_config['host']}: {e}")
             raise
 
+    def _read_db_config(self) -> Dict[str, Any]:
+        """Konfigurasi database untuk query read-only (replica jika tersedia, selain itu primary)"""
+        if DB_READ_CONFIG['host'] and self.read_replica_ready is not False:
+            return DB_READ_CONFIG
+        return DB_CONFIG
+
+    def _statement_timeout_ms(self, operation: str) -> int:
+        """statement_timeout (ms) untuk kelas operasi"""
+        timeouts = TIMEOUT_CONFIG['statement_seconds']
+        return int(timeouts.get(operation, timeouts['default']) * 1000)
+
+    def _pg_connection_string(self, database: str = 'postgres', read_only: bool = False,
+                              operation: str = 'export') -> str:
+        """Connection string PG: untuk ogr2ogr"""
+        db_config = self._read_db_config() if read_only else DB_CONFIG
+        return (f"PG:host={db_config['host']} port={db_config['port']} dbname={database} "
+                f"user={db_config['user']} password={db_config['password']} "
+                f"connect_timeout={TIMEOUT_CONFIG['connect_seconds']} "
+                f"options='-c statement_timeout={self._statement_timeout_ms(operation)}'")
+
+    def _run_with_watchdog(self, cmd: List[str], timeout: float, progress_path: str = None,
+                           idle_seconds: float = None, check: bool = False, **kwargs) -> subprocess.CompletedProcess:
+        """
+        Jalankan proses eksternal dengan watchdog.
+
+        Proses dianggap ada progres jika menulis ke stdout/stderr atau ukuran
+        progress_path (file atau direktori) bertambah. Proses di-kill dan
+        subprocess.TimeoutExpired di-raise jika tidak ada progres selama
+        idle_seconds, atau jika total waktu melewati timeout.
+
+        Returns:
+            subprocess.CompletedProcess (stdout/stderr sebagai text, dipotong ke bagian akhir)
+        """
+        import threading
+
+        idle_seconds = idle_seconds or TIMEOUT_CONFIG['idle_seconds']
+        max_output = 64 * 1024
+        output = {'stdout': bytearray(), 'stderr': bytearray()}
+        last_progress = [time.monotonic()]
+
+        def _drain(stream, name):
+            for chunk in iter(lambda: stream.read1(8192), b''):
+                buf = output[name]
+                buf.extend(chunk)
+                if len(buf) > max_output:
+                    del buf[:len(buf) - max_output]
+                last_progress[0] = time.monotonic()
+
+        def _path_size(path):
+            if not path or not os.path.exists(path):
+                return 0
+            if os.path.isdir(path):
+                return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            return os.path.getsize(path)
+
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **kwargs)
+        readers = [threading.Thread(target=_drain, args=(proc.stdout, 'stdout'), daemon=True),
+                   threading.Thread(target=_drain, args=(proc.stderr, 'stderr'), daemon=True)]
+        for reader in readers:
+            reader.start()
+
+        start = time.monotonic()
+        last_size = _path_size(progress_path)
+        reason = None
+
+        while proc.poll() is None:
+            time.sleep(2)
+            now = time.monotonic()
+
+            size = _path_size(progress_path)
+            if size != last_size:
+                last_size = size
+                last_progress[0] = now
+
+            if now - start > timeout:
+                reason = f"exceeded {timeout:.0f}s"
+            elif now - last_progress[0] > idle_seconds:
+                reason = f"no progress for {idle_seconds:.0f}s"
+
+            if reason:
+                proc.kill()
+                proc.wait()
+                break
+
+        for reader in readers:
+            reader.join(timeout=5)
+
+        stdout = output['stdout'].decode('utf-8', errors='replace')
+        stderr = output['stderr'].decode('utf-8', errors='replace')
+
+        if reason:
+            logger.error(f"Watchdog killed {cmd[0]}: {reason}")
+            raise subprocess.TimeoutExpired(cmd, timeout, output=stdout, stderr=stderr)
+
+        if check and proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, output=stdout, stderr=stderr)
+
+        return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+    def _sync_read_replica(self) -> bool:
+        """
+        Pastikan read replica sudah me-replay semua WAL primary (hasil agregasi step 4)
+        sebelum stage read-only membaca dari replica. Jika replica tertinggal lebih lama
+        dari max_replay_wait_seconds, stage read-only fallback ke primary.
+        """
+        if not DB_READ_CONFIG['host']:
+            return False
+
+        try:
+            conn = self._get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute("SELECT pg_current_wal_lsn()::text")
+            primary_lsn = cursor.fetchone()[0]
+            cursor.close()
+            conn.close()
+
+            # Paksa koneksi ke replica untuk pengecekan
+            self.read_replica_ready = None
+            replica_conn = self._get_db_connection(read_only=True)
+            replica_conn.autocommit = True
+            replica_cursor = replica_conn.cursor()
+
+            deadline = time.time() + DB_READ_CONFIG['max_replay_wait_seconds']
+            while True:
+                replica_cursor.execute("""
+                    SELECT pg_is_in_recovery(),
+                           pg_last_wal_replay_lsn() >= %s::pg_lsn
+                """, (primary_lsn,))
+                in_recovery, caught_up = replica_cursor.fetchone()
+
+                if not in_recovery:
+                    # Bukan streaming replica (mis. instance lokal pengganti), pakai apa adanya
+                    logger.warning(f"Read database {DB_READ_CONFIG['host']} is not a streaming replica, "
+                                   "using it without replay check")
+                    self.read_replica_ready = True
+                    break
+
+                if caught_up:
+                    logger.info(f"Read replica {DB_READ_CONFIG['host']} caught up with primary (LSN {primary_lsn})")
+                    self.read_replica_ready = True
+                    break
+
+                if time.time() >= deadline:
+                    logger.warning(f"Read replica did not reach LSN {primary_lsn} within "
+                                   f"{DB_READ_CONFIG['max_replay_wait_seconds']}s, reading from primary")
+                    self.read_replica_ready = False
+                    break
+
+                time.sleep(2)
+
+            replica_cursor.close()
+            replica_conn.close()
+
+        except Exception as e:
+            logger.warning(f"Read replica check failed, reading from primary: {e}")
+            self.read_replica_ready = False
+
+        return self.read_replica_ready
+
     def _update_progress(self, progress: int, status: str = 'PROCESSING'):
         """Update progress in compiler_status table"""
         try:
@@ -175,6 +483,8 @@ class PMNCompiler:
 
     def _check_s3_connection(self) -> bool:
         """Check AWS S3 connection and bucket accessibility"""
+        from botocore.exceptions import ClientError
+
         logger.info("Checking AWS S3 connection...")
         
         try:
@@ -283,12 +593,85 @@ class PMNCompiler:
             connection_status['compiler_status_table'] = False
             connection_status['compiler_datasets_table'] = False
         
-        # Check BPDAS databases
-        accessible_bpdas = []
-        inaccessible_bpdas = []
-        
+        # Check BPDAS databases (gunakan cache preflight jika masih berlaku; BPDAS yang
+        # belum ada di cache, kedaluwarsa, atau gagal dicek di run sebelumnya dicek ulang)
+        bpdas_status = self._load_preflight_cache(bpdas_list)
+        unchecked = [bpdas for bpdas in bpdas_list if bpdas not in bpdas_status]
+        if unchecked:
+            checked, failed = self._check_bpdas_databases(unchecked)
+            bpdas_status.update(checked)
+            self._save_preflight_cache({bpdas: status for bpdas, status in checked.items() if bpdas not in failed})
+
+        connection_status.update(bpdas_status)
+        accessible_bpdas = [bpdas for bpdas in bpdas_list if bpdas_status.get(bpdas, False)]
+        inaccessible_bpdas = [bpdas for bpdas in bpdas_list if not bpdas_status.get(bpdas, False)]
+
+        # Summary
+        logger.info("=" * 60)
+        logger.info("DATABASE CONNECTION SUMMARY:")
+        logger.info(f"  Accessible BPDAS: {len(accessible_bpdas)}/{len(bpdas_list)}")
+        logger.info(f"  Inaccessible BPDAS: {len(inaccessible_bpdas)}/{len(bpdas_list)}")
+
+        if inaccessible_bpdas:
+            logger.warning(f"  Inaccessible databases: {', '.join(inaccessible_bpdas[:5])}" +
+                        (f" and {len(inaccessible_bpdas)-5} more..." if len(inaccessible_bpdas) > 5 else ""))
+
+        logger.info("=" * 60)
+
+        return connection_status
+
+    def _discover_bpdas_databases(self, bpdas_list: List[str]) -> List[str]:
+        """
+        Cari database BPDAS yang benar-benar ada dengan satu query ke pg_database,
+        sehingga database yang tidak ada tidak perlu dicoba connect satu per satu.
+        Query ke primary, server yang sama dengan agregasi step 4 (replica bisa tertinggal).
+        """
+        conn = self._get_db_connection('postgres')
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT datname
+            FROM pg_database
+            WHERE datallowconn
+            AND NOT datistemplate
+            AND datname = ANY(%s)
+        """, (list(bpdas_list),))
+
+        existing_dbs = {row[0] for row in cursor.fetchall()}
+
+        cursor.close()
+        conn.close()
+
+        return [bpdas for bpdas in bpdas_list if bpdas in existing_dbs]
+
+    def _check_bpdas_databases(self, bpdas_list: List[str]) -> tuple:
+        """
+        Check BPDAS databases yang ada di server (tabel existing/potensi tahun berjalan).
+
+        Returns:
+            (bpdas_status, failed): status per BPDAS, dan BPDAS yang gagal dicek karena error
+            koneksi / timeout (status False sementara, tidak boleh di-cache)
+        """
+        import psycopg2
+
+        bpdas_status = {}
+        failed = set()
+
+        try:
+            existing_dbs = self._discover_bpdas_databases(bpdas_list)
+            logger.info(f"Found {len(existing_dbs)}/{len(bpdas_list)} BPDAS databases in pg_database")
+        except Exception as e:
+            logger.warning(f"Failed to query pg_database, checking every BPDAS database: {e}")
+            existing_dbs = list(bpdas_list)
+
         for bpdas_db in bpdas_list:
+            if bpdas_db not in existing_dbs:
+                bpdas_status[bpdas_db] = False
+                logger.warning(f"✗ BPDAS '{bpdas_db}': Database does not exist")
+                continue
+
             try:
+                # Primary, sama dengan step 4: replica yang tertinggal tidak boleh membuang BPDAS valid
                 conn = self._get_db_connection(bpdas_db)
                 cursor = conn.cursor()
                 
@@ -315,40 +698,92 @@ class PMNCompiler:
                 conn.close()
                 
                 if existing_exists and potensi_exists:
-                    connection_status[bpdas_db] = True
-                    accessible_bpdas.append(bpdas_db)
+                    bpdas_status[bpdas_db] = True
                     logger.info(f"✓ BPDAS '{bpdas_db}': Connected (tables exist)")
                 elif existing_exists or potensi_exists:
-                    connection_status[bpdas_db] = True
-                    accessible_bpdas.append(bpdas_db)
+                    bpdas_status[bpdas_db] = True
                     logger.warning(f"⚠ BPDAS '{bpdas_db}': Connected (partial tables: existing={existing_exists}, potensi={potensi_exists})")
                 else:
-                    connection_status[bpdas_db] = False
-                    inaccessible_bpdas.append(bpdas_db)
+                    bpdas_status[bpdas_db] = False
                     logger.warning(f"✗ BPDAS '{bpdas_db}': Connected but tables not found")
                     
             except psycopg2.OperationalError as e:
-                connection_status[bpdas_db] = False
-                inaccessible_bpdas.append(bpdas_db)
+                bpdas_status[bpdas_db] = False
+                failed.add(bpdas_db)
                 logger.warning(f"✗ BPDAS '{bpdas_db}': Connection failed - {e}")
             except Exception as e:
-                connection_status[bpdas_db] = False
-                inaccessible_bpdas.append(bpdas_db)
+                bpdas_status[bpdas_db] = False
+                failed.add(bpdas_db)
                 logger.warning(f"✗ BPDAS '{bpdas_db}': Unexpected error - {e}")
         
-        # Summary
-        logger.info("=" * 60)
-        logger.info("DATABASE CONNECTION SUMMARY:")
-        logger.info(f"  Accessible BPDAS: {len(accessible_bpdas)}/{len(bpdas_list)}")
-        logger.info(f"  Inaccessible BPDAS: {len(inaccessible_bpdas)}/{len(bpdas_list)}")
-        
-        if inaccessible_bpdas:
-            logger.warning(f"  Inaccessible databases: {', '.join(inaccessible_bpdas[:5])}" + 
-                        (f" and {len(inaccessible_bpdas)-5} more..." if len(inaccessible_bpdas) > 5 else ""))
-        
-        logger.info("=" * 60)
-        
-        return connection_status
+        return bpdas_status, failed
+
+    def _preflight_cache_key(self) -> str:
+        """Key cache preflight: host primary dan read replica + tahun yang diproses"""
+        return (f"{DB_CONFIG['host']}:{DB_CONFIG['port']}:"
+                f"{DB_READ_CONFIG['host']}:{DB_READ_CONFIG['port']}:{self.year}")
+
+    def _load_preflight_cache(self, bpdas_list: List[str]) -> Dict[str, bool]:
+        """
+        Status BPDAS dari cache preflight yang belum kedaluwarsa (TTL dihitung per BPDAS).
+        BPDAS yang tidak ada di hasil harus dicek ulang.
+        """
+        cache_path = PREFLIGHT_CACHE_CONFIG['path']
+
+        try:
+            if not os.path.exists(cache_path):
+                return {}
+
+            with open(cache_path, 'r') as f:
+                cache = json.load(f)
+
+            entries = cache.get(self._preflight_cache_key(), {})
+            now = time.time()
+            bpdas_status = {bpdas: entries[bpdas]['accessible'] for bpdas in bpdas_list
+                            if bpdas in entries
+                            and now - entries[bpdas]['checked_at'] <= PREFLIGHT_CACHE_CONFIG['ttl_seconds']}
+
+            if bpdas_status:
+                logger.info(f"Using cached BPDAS status from preflight for {len(bpdas_status)}/{len(bpdas_list)} "
+                            f"BPDAS (TTL {PREFLIGHT_CACHE_CONFIG['ttl_seconds']}s)")
+            return bpdas_status
+
+        except Exception as e:
+            logger.warning(f"Failed to read preflight cache: {e}")
+            return {}
+
+    def _save_preflight_cache(self, bpdas_status: Dict[str, bool]):
+        """
+        Simpan status BPDAS ke cache preflight. Hanya hasil pasti (database / tabel ada atau
+        tidak ada) yang disimpan; BPDAS yang gagal dicek karena error tidak diberikan ke sini.
+        """
+        cache_path = PREFLIGHT_CACHE_CONFIG['path']
+        if not bpdas_status:
+            return
+
+        try:
+            cache = {}
+            if os.path.exists(cache_path):
+                with open(cache_path, 'r') as f:
+                    cache = json.load(f)
+
+            key = self._preflight_cache_key()
+            entries = cache.get(key, {})
+            if 'bpdas_status' in entries:
+                entries = {}  # Format lama (satu timestamp untuk semua BPDAS)
+            checked_at = time.time()
+            entries.update({bpdas: {'accessible': status, 'checked_at': checked_at}
+                            for bpdas, status in bpdas_status.items()})
+            cache[key] = entries
+
+            # Tulis ke file sementara lalu rename agar cache tidak pernah setengah tertulis
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, cache_path)
+
+        except Exception as e:
+            logger.warning(f"Failed to write preflight cache: {e}")
 
     def _check_system_requirements(self) -> Dict[str, bool]:
         """Check system requirements (ogr2ogr, tippecanoe)"""
@@ -399,9 +834,10 @@ class PMNCompiler:
             stat = os.statvfs(tempfile.gettempdir())
             free_space_gb = (stat.f_bavail * stat.f_frsize) / (1024**3)
             
-            if free_space_gb < 10:  # Minimum 10GB required
+            min_free_gb = PUBLISH_CONFIG['min_free_disk_gb']
+            if free_space_gb < min_free_gb:
                 requirements['disk_space'] = False
-                logger.error(f"✗ Insufficient disk space: {free_space_gb:.2f}GB available (minimum 10GB required)")
+                logger.error(f"✗ Insufficient disk space: {free_space_gb:.2f}GB available (minimum {min_free_gb}GB required)")
             else:
                 requirements['disk_space'] = True
                 logger.info(f"✓ Sufficient disk space: {free_space_gb:.2f}GB available")
@@ -434,15 +870,9 @@ class PMNCompiler:
                 logger.error(f"Missing requirements: {', '.join(failed_reqs)}")
                 all_checks_passed = False
             
-            # 3. Get BPDAS list first
+            # 3. Get BPDAS list first (dari cache BPDAS registry)
             logger.info("Fetching BPDAS list for database checks...")
-            bpdas_list = ['agamkuantan', 'akemalamo', 'asahanbarumun', 
-            'barito', 'batanghari', 'baturusacerucuk', 'benainnoelmina', 
-            'bonelimboto', 'brantassampean', 'cimanukcitanduy', 'citarumciliwung', 
-            'dodokanmoyosari', 'indragirirokan', 'jeneberangsaddang', 'kahayan', 'kapuas', 
-            'karama', 'ketahun', 'konaweha', 'kruengaceh', 'mahakamberau', 'memberamo', 'musi', 
-            'paluposo', 'pemalijratun', 'remuransiki', 'seijangduriangkang', 'serayuopakprogo', 
-            'solo', 'tondano', 'undaanyar', 'waehapubatumerah', 'wampuseiular', 'wayseputihwaysekampung']
+            bpdas_list = self.bpdas_registry.get_bpdas_list()
             
             # 4. Check database connections
             db_status = self._check_database_connections(bpdas_list)
@@ -629,20 +1059,7 @@ class PMNCompiler:
         logger.info("Step 3: Getting BPDAS list...")
         
         try:
-            url = "https://api.ptnaghayasha.com/api/master/cursor/wilayah"
-            params = {
-                'include_bpdas': 'true',
-                'include_provinsi': 'false',
-                'include_kabupaten': 'false',
-                'include_kecamatan': 'false',
-                'include_desa': 'false' 
-            }
-            
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            bpdas_list = [item['value'].lower() for item in data['data'] if item['type'] == 'bpdas']
+            bpdas_list = self._accessible_bpdas_list()
             
             logger.info(f"Found {len(bpdas_list)} BPDAS databases: {bpdas_list}")
             
@@ -655,12 +1072,25 @@ class PMNCompiler:
             logger.error(f"Step 3 failed: {e}")
             raise
 
+    def _accessible_bpdas_list(self) -> List[str]:
+        """Daftar BPDAS dari registry, tanpa BPDAS yang tidak bisa diakses saat preflight"""
+        # Daftar dilayani dari cache registry; API wilayah di-refresh di luar critical path
+        bpdas_list = self.bpdas_registry.get_bpdas_list()
+        
+        # Lewati BPDAS yang sudah diketahui tidak bisa diakses saat preflight
+        if self.accessible_bpdas:
+            bpdas_list = [bpdas for bpdas in bpdas_list if bpdas in self.accessible_bpdas]
+        return bpdas_list
+
     def step_4_aggregate_data(self, bpdas_list: List[str]):
         """Step 4: Agregasi Data dari Semua BPDAS (40%)"""
+        import psycopg2
+        import psycopg2.extras
+
         logger.info("Step 4: Aggregating data from all BPDAS...")
         
         try:
-            target_conn = self._get_db_connection()
+            target_conn = self._get_db_connection(operation='aggregate')
             target_cursor = target_conn.cursor()
             
             for bpdas_db in bpdas_list:
@@ -668,7 +1098,7 @@ class PMNCompiler:
                 
                 try:
                     # Connect to BPDAS database
-                    bpdas_conn = self._get_db_connection(bpdas_db)
+                    bpdas_conn = self._get_db_connection(bpdas_db, operation='aggregate')
                     bpdas_cursor = bpdas_conn.cursor()
                     
                     # ========== PROCESS POTENSI DATA ==========
@@ -802,9 +1232,16 @@ class PMNCompiler:
                                     logger.info(f"✓ Inserted {len(potensi_data)} potensi records from {bpdas_db}")
                                 else:
                                     logger.info(f"No potensi data in {bpdas_db}")
+                        
+                        target_conn.commit()
                                     
                     except psycopg2.Error as e:
+                        # Termasuk QueryCanceled (statement_timeout): batalkan transaksi yang gagal
+                        # agar koneksi bisa dipakai lagi untuk tema/BPDAS berikutnya
                         logger.warning(f"Failed to process potensi from {bpdas_db}: {e}")
+                        self._aggregation_failures.add(bpdas_db)
+                        bpdas_conn.rollback()
+                        target_conn.rollback()
                     
                     # ========== PROCESS EXISTING DATA ==========
                     try:
@@ -937,9 +1374,16 @@ class PMNCompiler:
                                     logger.info(f"✓ Inserted {len(existing_data)} existing records from {bpdas_db}")
                                 else:
                                     logger.info(f"No existing data in {bpdas_db}")
+                        
+                        target_conn.commit()
                                     
                     except psycopg2.Error as e:
+                        # Termasuk QueryCanceled (statement_timeout): batalkan transaksi yang gagal
+                        # agar koneksi bisa dipakai lagi untuk tema/BPDAS berikutnya
                         logger.warning(f"Failed to process existing from {bpdas_db}: {e}")
+                        self._aggregation_failures.add(bpdas_db)
+                        bpdas_conn.rollback()
+                        target_conn.rollback()
                     
                     # Commit after each BPDAS
                     target_conn.commit()
@@ -951,9 +1395,13 @@ class PMNCompiler:
                     
                 except psycopg2.OperationalError as e:
                     logger.warning(f"✗ Cannot connect to {bpdas_db}: {e}")
+                    self._aggregation_failures.add(bpdas_db)
+                    target_conn.rollback()
                     continue
                 except Exception as e:
                     logger.warning(f"✗ Error processing {bpdas_db}: {e}")
+                    self._aggregation_failures.add(bpdas_db)
+                    target_conn.rollback()
                     continue
             
             # Final commit
@@ -1012,6 +1460,8 @@ class PMNCompiler:
 
     def step_6_delete_old_pmtiles(self):
         """Step 6: Hapus PMTiles Lama (60%)"""
+        from botocore.exceptions import ClientError
+
         logger.info("Step 6: Deleting old PMTiles...")
         
         try:
@@ -1037,359 +1487,1202 @@ class PMNCompiler:
             logger.error(f"Step 6 failed: {e}")
             raise
 
-    def step_7_export_geojson(self) -> Dict[str, str]:
-        """Step 7: Export ke GeoJSON (70%)"""
-        logger.info("Step 7: Exporting to GeoJSON...")
+    def _geometry_expr(self) -> str:
+        """Ekspresi SQL geometry export, dengan presisi koordinat dari EXPORT_CONFIG"""
+        precision = EXPORT_CONFIG['coordinate_precision']
+        if precision is None:
+            return 'geometry'
+        return f"ST_Multi(ST_ReducePrecision(geometry, {10.0 ** -precision!r}))"
+    
+    def _build_source_query(self, conn: 'psycopg2.extensions.connection', theme: str,
+                            profiles: tuple = INTERMEDIATE_PROFILES, extra_columns: tuple = (),
+                            ordered: bool = False) -> str:
+        """
+        Query sumber export satu tema: kolom sesuai profile output (OUTPUT_COLUMN_PROFILES),
+        geometry sudah dikuantisasi. Geometry yang menjadi kosong setelah kuantisasi
+        (sliver lebih kecil dari grid) dibuang. Jika ordered, baris diurutkan stabil dari
+        isinya saat build reproducible (lihat _stable_order_by).
+        """
+        columns = [column['name'] for column in self._get_export_columns(conn, theme, profiles, extra_columns)]
+        select_cols = [f"{self._geometry_expr()} AS geometry" if col == 'geometry' else f'"{col}"' for col in columns]
+        query = f"SELECT {', '.join(select_cols)} FROM pmn.{theme}_{self.year}"
+        
+        if EXPORT_CONFIG['coordinate_precision'] is not None:
+            # OFFSET 0 mencegah subquery di-inline, agar ST_ReducePrecision hanya dihitung sekali per baris
+            query = (f"SELECT * FROM ({query} OFFSET 0) AS src "
+                     f"WHERE geometry IS NULL OR NOT ST_IsEmpty(geometry)")
+        
+        order_by = _stable_order_by(columns) if ordered else ''
+        if order_by:
+            # Dibungkus agar ORDER BY memakai geometry hasil kuantisasi, bukan kolom tabel
+            query = f"SELECT * FROM ({query}) AS stable{order_by}"
+        
+        return query
+    
+    def _build_export_query(self, conn: 'psycopg2.extensions.connection', theme: str) -> str:
+        """Query export satu tema: satu baris = satu Feature GeoJSON (properties = semua kolom non-geometry)"""
+        precision = EXPORT_CONFIG['coordinate_precision']
+        # Presisi penuh: 15 desimal (maksimum PostGIS), bukan default 9 yang memotong koordinat
+        max_digits = precision if precision is not None else 15
+        return f"SELECT ST_AsGeoJSON(t.*, 'geometry', {max_digits}) FROM ({self._build_source_query(conn, theme, ordered=True)}) AS t"
+    
+    def _estimate_precision_savings(self, conn: 'psycopg2.extensions.connection', theme: str) -> Optional[Dict[str, Any]]:
+        """
+        Estimasi penghematan ukuran akibat kuantisasi koordinat, dari sampel geometry.
+        
+        Returns:
+            {'text': rasio untuk output teks (GeoJSON), 'binary': rasio untuk output
+            biner terkompresi (Parquet, zip Shapefile/GDB), 'sample': jumlah sampel},
+            atau None jika presisi penuh atau estimasi nonaktif
+            (EXPORT_CONFIG['estimate_precision_savings'])
+        """
+        import zlib
+        
+        precision = EXPORT_CONFIG['coordinate_precision']
+        if precision is None or not EXPORT_CONFIG['estimate_precision_savings']:
+            return None
+        
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT ST_AsBinary(geometry), ST_AsBinary(reduced),
+                   octet_length(ST_AsGeoJSON(geometry)), octet_length(ST_AsGeoJSON(reduced, {precision}))
+            FROM (
+                SELECT geometry, {self._geometry_expr()} AS reduced
+                FROM pmn.{theme}_{self.year}
+                WHERE geometry IS NOT NULL
+                LIMIT %s
+            ) AS sample
+        """, (EXPORT_CONFIG['precision_sample_size'],))
+        rows = cursor.fetchall()
+        cursor.close()
+        
+        if not rows:
+            return None
+        
+        full_text = sum(row[2] for row in rows)
+        reduced_text = sum(row[3] for row in rows)
+        full_binary = len(zlib.compress(b''.join(bytes(row[0]) for row in rows)))
+        reduced_binary = len(zlib.compress(b''.join(bytes(row[1]) for row in rows)))
+        
+        return {
+            'text': 1 - reduced_text / full_text if full_text else 0.0,
+            'binary': 1 - reduced_binary / full_binary if full_binary else 0.0,
+            'sample': len(rows)
+        }
+    
+    def _log_precision_savings(self, theme: str, artifact: str, size: int, kind: str):
+        """Log ukuran artifact (byte) beserta estimasi penghematan dari kuantisasi koordinat"""
+        savings = self._precision_savings.get(theme)
+        if not savings:
+            return
+        
+        ratio = savings[kind]
+        full_size = size / (1 - ratio) if ratio < 1 else size
+        logger.info(f"  Precision {EXPORT_CONFIG['coordinate_precision']} dp, {artifact}: {size:,} bytes, "
+                    f"~{ratio:.1%} smaller than full precision (~{full_size - size:,.0f} bytes saved, "
+                    f"estimated from {savings['sample']} sampled geometries)")
+
+    def _export_geojson_stream(self, conn: 'psycopg2.extensions.connection', theme: str, output_file: str,
+                               sequence: bool = False) -> int:
+        """
+        Export tabel tema ke GeoJSON FeatureCollection secara streaming.
         
+        Feature dibentuk oleh PostGIS (ST_AsGeoJSON) dan dibaca per batch dari
+        server-side cursor, lalu langsung ditulis ke file, sehingga memori tetap
+        konstan berapapun jumlah feature.
+        
+        Jika sequence=True, output berupa GeoJSONSeq (RFC 8142): satu Feature per
+        baris diawali record separator, tanpa FeatureCollection pembungkus. Format
+        ini bisa dibaca paralel oleh tippecanoe (-P).
+        
+        Returns:
+            Jumlah feature yang ditulis
+        """
+        fetch_size = EXPORT_CONFIG['fetch_size']
+        feature_count = 0
+
+        cursor = conn.cursor(name=f'export_{theme}_{self.year}')
+        cursor.itersize = fetch_size
         try:
-            conn = self._get_db_connection()
-            
-            geojson_files = {}
-            
-            # Export existing data
-            logger.info("Exporting existing data...")
-            existing_gdf = gpd.read_postgis(
-                f"SELECT * FROM pmn.existing_{self.year}",
-                conn,
-                geom_col='geometry'
-            )
-            
-            # Log data info
-            logger.info(f"Existing data shape: {existing_gdf.shape}")
-            logger.info(f"Existing columns: {list(existing_gdf.columns)}")
-            logger.info("Existing data types:")
-            for col, dtype in existing_gdf.dtypes.items():
-                if col != 'geometry':
-                    logger.info(f"  {col}: {dtype}")
-            
-            existing_file = os.path.join(self.temp_dir, f'existing_{self.year}.geojson')
-            existing_gdf.to_file(existing_file, driver='GeoJSON')
-            geojson_files['existing'] = existing_file
-            logger.info(f"✓ Exported existing: {len(existing_gdf)} features, {os.path.getsize(existing_file):,} bytes")
-            
-            # Export potensi data
-            logger.info("Exporting potensi data...")
-            potensi_gdf = gpd.read_postgis(
-                f"SELECT * FROM pmn.potensi_{self.year}",
-                conn,
-                geom_col='geometry'
-            )
-            
-            # Log data info
-            logger.info(f"Potensi data shape: {potensi_gdf.shape}")
-            logger.info(f"Potensi columns: {list(potensi_gdf.columns)}")
-            logger.info("Potensi data types:")
-            for col, dtype in potensi_gdf.dtypes.items():
-                if col != 'geometry':
-                    logger.info(f"  {col}: {dtype}")
-            
-            potensi_file = os.path.join(self.temp_dir, f'potensi_{self.year}.geojson')
-            potensi_gdf.to_file(potensi_file, driver='GeoJSON')
-            geojson_files['potensi'] = potensi_file
-            logger.info(f"✓ Exported potensi: {len(potensi_gdf)} features, {os.path.getsize(potensi_file):,} bytes")
-            
-            conn.close()
-            
-            self._update_progress(70)
-            logger.info("Step 7 completed: GeoJSON export finished")
-            
-            return geojson_files
-            
-        except Exception as e:
-            logger.error(f"Step 7 failed: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            raise
+            cursor.execute(self._build_export_query(conn, theme))
+
+            with open(output_file, 'w', encoding='utf-8', buffering=1024 * 1024) as f:
+                if not sequence:
+                    f.write('{"type": "FeatureCollection", "features": [\n')
+                while True:
+                    rows = cursor.fetchmany(fetch_size)
+                    if not rows:
+                        break
+                    if sequence:
+                        f.write(''.join(f'\x1e{row[0]}\n' for row in rows))
+                    else:
+                        if feature_count:
+                            f.write(',\n')
+                        f.write(',\n'.join(row[0] for row in rows))
+                    feature_count += len(rows)
+                if not sequence:
+                    f.write('\n]}\n')
+        finally:
+            cursor.close()
+
+        return feature_count
+
+    def _get_export_columns(self, conn: 'psycopg2.extensions.connection', theme: str,
+                            profiles: tuple = INTERMEDIATE_PROFILES, extra_columns: tuple = ()) -> List[Dict[str, str]]:
+        """
+        Kolom tabel tema yang dibutuhkan profile output (ditambah extra_columns dan geometry),
+        dengan urutan dan tipe dari _get_table_schema
+        """
+        schema = self._get_table_schema(conn, theme)
+        selected = set(_profile_columns([column['name'] for column in schema], *profiles)) | set(extra_columns)
+        return [column for column in schema if column['name'] == 'geometry' or column['name'] in selected]
+    
+    def _get_table_schema(self, conn: 'psycopg2.extensions.connection', theme: str) -> List[Dict[str, str]]:
+        """
+        Kolom tabel pmn.{theme}_{year} beserta tipe PostgreSQL-nya (di-cache per tema).
+        
+        Returns:
+            List of {'name': nama kolom, 'type': data_type dari information_schema}
+        """
+        if theme not in self._table_schema_cache:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT column_name, data_type
+                FROM information_schema.columns
+                WHERE table_schema = 'pmn' AND table_name = %s
+                ORDER BY ordinal_position
+            """, (f'{theme}_{self.year}',))
+            self._table_schema_cache[theme] = [{'name': row[0], 'type': row[1]} for row in cursor.fetchall()]
+            cursor.close()
+        
+        return self._table_schema_cache[theme]
     
-    def step_8_convert_formats(self, geojson_files: Dict[str, str]) -> Dict[str, Dict[str, str]]:
-        """Step 8: Konversi Format (80%)"""
-        logger.info("Step 8: Converting formats...")
+    def _export_parquet_stream(self, conn: 'psycopg2.extensions.connection', theme: str, output_file: str) -> int:
+        """
+        Export tabel tema ke GeoParquet secara streaming.
+        
+        Geometry ditulis sebagai WKB (ST_AsBinary) dan kolom lain memakai tipe Arrow
+        sesuai tipe kolom PostgreSQL. Data dibaca per batch dari server-side cursor
+        dan ditulis per batch ke ParquetWriter, sehingga memori tetap konstan.
+        
+        Returns:
+            Jumlah feature yang ditulis
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        # Tipe PostgreSQL -> (ekspresi SELECT, tipe Arrow). Tipe di luar mapping di-cast ke text.
+        type_map = {
+            'smallint': ('"{col}"', pa.int16()),
+            'integer': ('"{col}"', pa.int32()),
+            'bigint': ('"{col}"', pa.int64()),
+            'real': ('"{col}"', pa.float32()),
+            'double precision': ('"{col}"', pa.float64()),
+            'numeric': ('"{col}"::double precision', pa.float64()),
+            'text': ('"{col}"', pa.string()),
+            'character varying': ('"{col}"', pa.string()),
+            'boolean': ('"{col}"', pa.bool_()),
+            'date': ('"{col}"', pa.date32()),
+            'timestamp without time zone': ('"{col}"', pa.timestamp('us')),
+            'timestamp with time zone': ('"{col}"', pa.timestamp('us', tz='UTC')),
+        }
+        
+        columns = self._get_export_columns(conn, theme)
+        select_exprs = []
+        fields = []
+        for column in columns:
+            if column['name'] == 'geometry':
+                select_exprs.append('ST_AsBinary(geometry)')
+                fields.append(pa.field('geometry', pa.binary()))
+            else:
+                expr, arrow_type = type_map.get(column['type'], ('"{col}"::text', pa.string()))
+                select_exprs.append(expr.format(col=column['name']))
+                fields.append(pa.field(column['name'], arrow_type))
         
+        geo_metadata = {
+            'version': '1.0.0',
+            'primary_column': 'geometry',
+            'columns': {
+                'geometry': {
+                    'encoding': 'WKB',
+                    'geometry_types': ['MultiPolygon']
+                }
+            }
+        }
+        schema = pa.schema(fields, metadata={'geo': json.dumps(geo_metadata)})
+        geometry_idx = schema.get_field_index('geometry')
+        
+        fetch_size = EXPORT_CONFIG['fetch_size']
+        feature_count = 0
+        
+        cursor = conn.cursor(name=f'export_{theme}_{self.year}')
+        cursor.itersize = fetch_size
         try:
-            converted_files = {}
+            cursor.execute(f"SELECT {', '.join(select_exprs)} FROM ({self._build_source_query(conn, theme)}) AS src")
             
-            for theme, geojson_file in geojson_files.items():
-                theme_files = {}
-                
-                # Read GeoJSON
-                gdf = gpd.read_file(geojson_file)
-                logger.info(f"Read {theme} GeoJSON: {len(gdf)} features")
-                logger.info(f"Original columns ({len(gdf.columns)}): {list(gdf.columns)}")
-                logger.info(f"Data types:\n{gdf.dtypes}")
-                
-                # ========== PREPARE FOR SHAPEFILE ==========
-                # Create a copy for Shapefile (needs special handling)
-                gdf_shp = gdf.copy()
-                
-                # 1. Convert datetime columns to string
-                datetime_cols = []
-                for col in gdf_shp.columns:
-                    if col == 'geometry':
-                        continue
-                    
-                    # Check for datetime types
-                    if pd.api.types.is_datetime64_any_dtype(gdf_shp[col]):
-                        datetime_cols.append(col)
-                        logger.info(f"Converting datetime column '{col}' to string")
-                        # Convert to string, handle NaT
-                        gdf_shp[col] = gdf_shp[col].apply(
-                            lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(x) else ''
-                        )
-                
-                logger.info(f"Converted {len(datetime_cols)} datetime columns: {datetime_cols}")
-                
-                # 2. Handle other problematic data types
-                for col in gdf_shp.columns:
-                    if col == 'geometry':
-                        continue
+            with pq.ParquetWriter(output_file, schema, compression='zstd') as writer:
+                while True:
+                    rows = cursor.fetchmany(fetch_size)
+                    if not rows:
+                        break
                     
-                    # Convert object types that might contain datetime
-                    if gdf_shp[col].dtype == 'object':
-                        # Check if it's a datetime string
-                        sample = gdf_shp[col].dropna().head(1)
-                        if len(sample) > 0:
-                            try:
-                                pd.to_datetime(sample.iloc[0])
-                                logger.info(f"Column '{col}' contains datetime strings, keeping as string")
-                                gdf_shp[col] = gdf_shp[col].fillna('').astype(str)
-                            except:
-                                # Not datetime, keep as is but ensure no None values
-                                gdf_shp[col] = gdf_shp[col].fillna('')
-                
-                # 3. Truncate column names to 10 characters (Shapefile limitation)
-                column_mapping = {}
-                used_names = set()
-                
-                for col in gdf_shp.columns:
-                    if col == 'geometry':
-                        continue
-                        
-                    if len(col) > 10:
-                        # Create short name
-                        base_name = col[:10]
-                        new_col = base_name
-                        
-                        # Ensure uniqueness
-                        counter = 1
-                        while new_col in used_names or new_col in gdf_shp.columns:
-                            new_col = col[:8] + f"{counter:02d}"
-                            counter += 1
-                            if counter > 99:  # Safety limit
-                                new_col = col[:7] + f"{counter:03d}"
-                        
-                        column_mapping[col] = new_col
-                        used_names.add(new_col)
-                        logger.info(f"Truncating column: '{col}' -> '{new_col}'")
-                    else:
-                        used_names.add(col)
-                
-                if column_mapping:
-                    gdf_shp = gdf_shp.rename(columns=column_mapping)
-                    logger.info(f"Renamed {len(column_mapping)} columns for Shapefile")
-                
-                # 4. Final data type check
-                logger.info("Final Shapefile data types:")
-                for col in gdf_shp.columns:
-                    if col != 'geometry':
-                        logger.info(f"  {col}: {gdf_shp[col].dtype}")
-                
-                # ========== CREATE SHAPEFILE ==========
-                shp_dir = os.path.join(self.temp_dir, f'{theme}_shp')
-                os.makedirs(shp_dir, exist_ok=True)
-                shp_file = os.path.join(shp_dir, f'AR_25K_PETAMANGROVE_{theme.upper()}_{self.year}.shp')
-                
-                try:
-                    logger.info(f"Creating Shapefile for {theme}...")
-                    gdf_shp.to_file(shp_file, driver='ESRI Shapefile', encoding='utf-8')
-                    logger.info(f"✓ Shapefile created successfully: {shp_file}")
-                except Exception as e:
-                    logger.error(f"Failed to create Shapefile: {e}")
-                    logger.info("Attempting additional data cleaning...")
+                    values = list(zip(*rows))
+                    arrays = []
+                    for idx, field in enumerate(schema):
+                        column_values = values[idx]
+                        if idx == geometry_idx:
+                            column_values = [bytes(v) if v is not None else None for v in column_values]
+                        arrays.append(pa.array(column_values, type=field.type))
                     
-                    # Last resort: convert everything to string except geometry and numeric
-                    for col in gdf_shp.columns:
-                        if col == 'geometry':
-                            continue
-                        
-                        if gdf_shp[col].dtype not in ['int64', 'float64', 'bool', 'Int64', 'Float64']:
-                            logger.info(f"Converting '{col}' to string as fallback")
-                            gdf_shp[col] = gdf_shp[col].astype(str).replace('NaT', '').replace('nan', '').replace('None', '')
-                    
-                    gdf_shp.to_file(shp_file, driver='ESRI Shapefile', encoding='utf-8')
-                    logger.info(f"✓ Shapefile created after additional cleaning")
-                
-                # ========== ZIP SHAPEFILE ==========
-                shp_zip = os.path.join(self.temp_dir, f'AR_25K_PETAMANGROVE_{theme.upper()}_{self.year}.zip')
-                
-                with zipfile.ZipFile(shp_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    extensions = ['.shp', '.shx', '.dbf', '.prj', '.cpg']
-                    for ext in extensions:
-                        file_path = shp_file.replace('.shp', ext)
-                        if os.path.exists(file_path):
-                            zipf.write(file_path, os.path.basename(file_path))
-                            logger.info(f"  Added {ext} to zip")
-                
-                shp_size = os.path.getsize(shp_zip)
-                theme_files['shp_zip'] = shp_zip
-                logger.info(f"✓ Shapefile zip created: {shp_zip} ({shp_size:,} bytes)")
-                
-                # ========== CREATE GDB (using original geojson - supports datetime) ==========
-                gdb_dir = os.path.join(self.temp_dir, f'AR_25K_PETAMANGROVE_{theme.upper()}_{self.year}.gdb')
-                
-                try:
-                    logger.info(f"Creating GDB for {theme}...")
-                    
-                    # Read GeoJSON and remove ogc_fid to avoid duplicate ID issues
-                    gdf_for_gdb = gpd.read_file(geojson_file)
-                    
-                    # Remove ogc_fid or fid columns if they exist
-                    fid_columns = [col for col in gdf_for_gdb.columns if col.lower() in ['ogc_fid', 'fid', 'id', 'objectid']]
-                    if fid_columns:
-                        logger.info(f"Removing FID columns for GDB: {fid_columns}")
-                        gdf_for_gdb = gdf_for_gdb.drop(columns=fid_columns)
-                    
-                    # Convert datetime columns to string for Shapefile compatibility
-                    datetime_cols_gdb = []
-                    for col in gdf_for_gdb.columns:
-                        if col == 'geometry':
-                            continue
-                        if pd.api.types.is_datetime64_any_dtype(gdf_for_gdb[col]):
-                            datetime_cols_gdb.append(col)
-                            logger.info(f"Converting datetime column '{col}' to string for temp Shapefile")
-                            gdf_for_gdb[col] = gdf_for_gdb[col].apply(
-                                lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(x) else ''
-                            )
-                    
-                    # Reset index to ensure clean sequential numbering
-                    gdf_for_gdb = gdf_for_gdb.reset_index(drop=True)
-                    
-                    # Create temporary Shapefile (which doesn't have ID issues) then convert to GDB
-                    temp_shp_dir = os.path.join(self.temp_dir, f'{theme}_temp_for_gdb')
-                    os.makedirs(temp_shp_dir, exist_ok=True)
-                    temp_shp = os.path.join(temp_shp_dir, f'{theme}_temp.shp')
-                    
-                    # Save to Shapefile first (Shapefile will auto-generate sequential FIDs)
-                    gdf_for_gdb.to_file(temp_shp, driver='ESRI Shapefile')
-                    logger.info(f"Created temporary Shapefile for GDB conversion")
-                    
-                    # Convert Shapefile to GDB (this avoids GeoJSON ID issues)
-                    result = subprocess.run([
-                        'ogr2ogr',
-                        '-f', 'OpenFileGDB',
-                        '-dim', 'XY',  # Force 2D
-                        '-nln', f'PETAMANGROVE_{theme.upper()}_{self.year}',  # Layer name
-                        gdb_dir,
-                        temp_shp
-                    ], check=True, capture_output=True, text=True)
-                    
-                    # Clean up temporary shapefile directory
-                    import shutil
-                    if os.path.exists(temp_shp_dir):
-                        shutil.rmtree(temp_shp_dir)
-                    
-                    logger.info(f"✓ GDB created successfully: {gdb_dir}")
-                    
-                except subprocess.CalledProcessError as e:
-                    logger.error(f"ogr2ogr failed for {theme}:")
-                    logger.error(f"  stdout: {e.stdout}")
-                    logger.error(f"  stderr: {e.stderr}")
-                    raise
-                
-                # ========== ZIP GDB ==========
-                gdb_zip = os.path.join(self.temp_dir, f'AR_25K_PETAMANGROVE_{theme.upper()}_{self.year}.gdb.zip')
-                
-                with zipfile.ZipFile(gdb_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for root, dirs, files in os.walk(gdb_dir):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            arcname = os.path.relpath(file_path, os.path.dirname(gdb_dir))
-                            zipf.write(file_path, arcname)
+                    writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                    feature_count += len(rows)
+        finally:
+            cursor.close()
+        
+        return feature_count
+    
+    def _export_flatgeobuf(self, theme: str, output_file: str,
+                           profiles: tuple = INTERMEDIATE_PROFILES, extra_columns: tuple = ()):
+        """
+        Export tabel tema ke FlatGeobuf dengan spatial index (packed Hilbert R-tree) via ogr2ogr.
+        File ini bisa difilter per bbox (-spat) dan atribut (-where) tanpa query ulang ke PostgreSQL.
+        Kolom mengikuti profile output (lihat _build_source_query).
+        """
+        conn = self._get_db_connection(read_only=True)
+        try:
+            # Urutan input menentukan isi file (urutan Hilbert dengan seri bbox), juga PMTiles darinya
+            sql = self._build_source_query(conn, theme, profiles, extra_columns, ordered=True)
+        finally:
+            conn.close()
+        
+        self._run_with_watchdog([
+            'ogr2ogr', '-progress',
+            '-f', 'FlatGeobuf',
+            '-lco', 'SPATIAL_INDEX=YES',
+            '-nln', f'{theme}_{self.year}',
+            '-nlt', 'PROMOTE_TO_MULTI',
+            output_file,
+            self._pg_connection_string(read_only=True),
+            '-sql', sql
+        ], timeout=TIMEOUT_CONFIG['subprocess_seconds']['ogr2ogr'],
+           progress_path=output_file, check=True)
+    
+    def _read_intermediate(self, intermediate_file: str):
+        """
+        Baca file intermediate ke GeoDataFrame dengan dtype hemat memori
+        (category / string[pyarrow] untuk kolom teks, lihat DTYPE_CONFIG)
+        """
+        if intermediate_file.endswith('.parquet'):
+            return self._read_parquet_intermediate(intermediate_file)
+        return _optimize_string_dtypes(_read_vector(intermediate_file))
+    
+    def _read_parquet_intermediate(self, parquet_file: str):
+        """
+        Baca GeoParquet via Arrow. Kolom teks berkardinalitas rendah di-dictionary-encode
+        di Arrow (menjadi category), sisanya menjadi string[pyarrow] tanpa lewat object
+        Python. Geometry WKB di-decode sekali untuk seluruh kolom.
+        """
+        import geopandas as gpd
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+        
+        table = pq.read_table(parquet_file)
+        
+        columns = []
+        for column in table.columns:
+            if pa.types.is_string(column.type) and _use_category(pc.count_distinct(column).as_py(), table.num_rows):
+                column = pc.dictionary_encode(column)
+            columns.append(column)
+        table = pa.table(columns, names=table.column_names)
+        
+        df = table.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+        geometry = gpd.GeoSeries.from_wkb(df.pop('geometry'), crs='EPSG:4326')
+        
+        return gpd.GeoDataFrame(df, geometry=geometry.rename('geometry'))
+
+    def _write_geojsonseq_from_parquet(self, parquet_file: str, output_file: str, profile: str = None) -> int:
+        """
+        Tulis isi GeoParquet sebagai GeoJSONSeq (satu Feature per baris) untuk dibaca paralel
+        oleh tippecanoe (-P). Per batch dan vectorized: geometry via shapely.to_geojson,
+        properties via pandas to_json, digabung per baris dengan Arrow compute. Jika profile
+        diisi, hanya kolom profile tersebut yang dibaca dari Parquet. Saat build reproducible,
+        feature ditulis dalam urutan stabil dari isinya (lihat _stable_order).
+        
+        Returns:
+            Jumlah feature yang ditulis
+        """
+        import numpy as np
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+        import shapely
+        
+        parquet = pq.ParquetFile(parquet_file)
+        columns = None
+        if profile:
+            columns = _profile_columns([name for name in parquet.schema_arrow.names if name != 'geometry'], profile)
+            columns.append('geometry')
+        
+        # Integer/boolean nullable tetap integer/boolean di JSON (bukan float)
+        types_mapper = {pa.int16(): pd.Int64Dtype(), pa.int32(): pd.Int64Dtype(), pa.int64(): pd.Int64Dtype(),
+                        pa.bool_(): pd.BooleanDtype(), pa.string(): pd.StringDtype('pyarrow')}.get
+        
+        batch_size = EXPORT_CONFIG['fetch_size'] * 10
+        if REPRODUCIBLE_CONFIG['enabled']:
+            # Tippecanoe menghasilkan PMTiles identik hanya untuk urutan input yang sama, sedangkan
+            # urutan export mengikuti PostgreSQL: kolom profile dibaca utuh ke memori lalu diurutkan
+            table = parquet.read(columns=columns)
+            order = _stable_order(table.column('geometry').to_numpy(zero_copy_only=False),
+                                  table.drop(['geometry']).to_pandas(types_mapper=types_mapper))
+            batches = table.take(order).to_batches(max_chunksize=batch_size)
+        else:
+            batches = parquet.iter_batches(batch_size=batch_size, columns=columns)
+        
+        feature_count = 0
+        with open(output_file, 'wb') as f:
+            for batch in batches:
+                if not batch.num_rows:
+                    continue
+                geometries = pa.array(shapely.to_geojson(
+                    shapely.from_wkb(batch.column('geometry').to_numpy(zero_copy_only=False))), pa.string())
                 
-                gdb_size = os.path.getsize(gdb_zip)
-                theme_files['gdb_zip'] = gdb_zip
-                theme_files['gdb_dir'] = gdb_dir
-                logger.info(f"✓ GDB zip created: {gdb_zip} ({gdb_size:,} bytes)")
+                properties = pa.Table.from_batches([batch]).drop(['geometry'])
+                for idx, field in enumerate(properties.schema):
+                    # Tanggal/waktu sebagai ISO 8601, sama dengan export GeoJSON
+                    if pa.types.is_date(field.type):
+                        properties = properties.set_column(idx, field.name, properties.column(idx).cast(pa.string()))
+                    elif pa.types.is_timestamp(field.type):
+                        seconds = properties.column(idx).cast(pa.timestamp('s', field.type.tz), safe=False)
+                        properties = properties.set_column(
+                            idx, field.name, pc.strftime(seconds, format='%Y-%m-%dT%H:%M:%S'))
+                if properties.num_columns:
+                    properties_json = properties.to_pandas(types_mapper=types_mapper).to_json(
+                        orient='records', lines=True, force_ascii=False, double_precision=15)
+                    properties_json = pa.array(properties_json.rstrip('\n').split('\n'), pa.string())
+                else:
+                    properties_json = pa.array(['{}'] * batch.num_rows, pa.string())
                 
-                converted_files[theme] = theme_files
-                logger.info(f"✓ Completed conversion for {theme}")
-                logger.info("=" * 60)
-            
-            self._update_progress(80)
-            logger.info("Step 8 completed: Format conversion finished")
-            
-            return converted_files
+                lines = pc.binary_join_element_wise(
+                    '{"type": "Feature", "geometry": ', pc.fill_null(geometries, 'null'),
+                    ', "properties": ', properties_json, '}\n', '')
+                # Isi array string Arrow sudah berurutan dalam satu buffer: ditulis tanpa copy per baris
+                _, offsets, data = lines.buffers()
+                start, end = np.frombuffer(offsets, dtype=np.int32)[[lines.offset, lines.offset + len(lines)]]
+                f.write(data.slice(int(start), int(end - start)))
+                feature_count += batch.num_rows
+        
+        return feature_count
+    
+    def _export_theme(self, theme: str) -> str:
+        """Export satu tema ke file intermediate sesuai EXPORT_CONFIG['intermediate_format']"""
+        intermediate_format = EXPORT_CONFIG['intermediate_format']
+        logger.info(f"Exporting {theme} data...")
+        start_time = time.time()
+        
+        conn = self._get_db_connection(read_only=True, operation='export')
+        try:
+            if intermediate_format == 'parquet':
+                output_file = os.path.join(self.temp_dir, f'{theme}_{self.year}.parquet')
+                feature_count = self._export_parquet_stream(conn, theme, output_file)
+            elif intermediate_format == 'flatgeobuf':
+                output_file = os.path.join(self.temp_dir, f'{theme}_{self.year}.fgb')
+                self._export_flatgeobuf(theme, output_file)
+                # Dari header file: feature yang kosong setelah kuantisasi sudah dibuang query export
+                feature_count = _count_vector_features(output_file)
+            elif intermediate_format == 'geojsonseq':
+                output_file = os.path.join(self.temp_dir, f'{theme}_{self.year}.geojsons')
+                feature_count = self._export_geojson_stream(conn, theme, output_file, sequence=True)
+            else:
+                output_file = os.path.join(self.temp_dir, f'{theme}_{self.year}.geojson')
+                feature_count = self._export_geojson_stream(conn, theme, output_file)
+            conn.commit()
             
+            self._precision_savings[theme] = self._estimate_precision_savings(conn, theme)
+        finally:
+            conn.close()
+        
+        logger.info(f"✓ Exported {theme}: {feature_count} features, "
+                    f"{os.path.getsize(output_file):,} bytes in {time.time() - start_time:.1f}s")
+        self._log_precision_savings(theme, 'intermediate', os.path.getsize(output_file),
+                                    'binary' if intermediate_format in ('parquet', 'flatgeobuf') else 'text')
+
+        return output_file
+    
+    def _process_theme(self, theme: str) -> Dict[str, Any]:
+        """
+        Rantai export -> konversi -> PMTiles untuk satu tema (step 7, 8, 9).
+        Dijalankan di worker process oleh _run_theme_pipelines; progress di-update oleh parent.
+        Jika data dan konfigurasi output tidak berubah, artifact dipublish dari cache.
+        """
+        fingerprint = self._artifact_fingerprint(theme, 'national')
+        cached = self._load_cached_artifacts(fingerprint)
+        if cached is not None:
+            artifacts = self._restore_cached_artifacts(cached['artifacts'])
+            by_kind = {artifact['kind']: artifact for artifact in artifacts}
+            logger.info(f"✓ Theme {theme}: published {len(artifacts)} artifacts from cache {fingerprint[:12]}")
+            return {
+                'intermediate_file': None,  # Step 9B export sendiri jika cache per BPDAS miss
+                'converted_files': {'shp_zip': by_kind['shp'], 'gdb_zip': by_kind['gdb']},
+                'pmtiles_url': by_kind['pmtiles']['map_url'],
+                'artifacts': artifacts
+            }
+        
+        intermediate_file = self._export_theme(theme)
+        theme_files = self._convert_theme(theme, intermediate_file)
+        pmtiles_artifact = self._generate_theme_pmtiles(theme, intermediate_file)
+        # Jumlah feature input tippecanoe sama dengan jumlah feature dataset download
+        pmtiles_artifact['features'] = theme_files['shp_zip']['features']
+        
+        artifacts = [theme_files['shp_zip'], theme_files['gdb_zip'], pmtiles_artifact]
+        self._store_cached_artifacts(fingerprint, artifacts)
+        
+        return {
+            'intermediate_file': intermediate_file,
+            'converted_files': theme_files,
+            'pmtiles_url': pmtiles_artifact['map_url'],
+            'artifacts': artifacts
+        }
+    
+    def _run_theme_pipelines(self) -> tuple:
+        """
+        Step 7-9: Export, konversi dan PMTiles per tema secara paralel (60% -> 90%).
+        
+        Tiap tema (existing, potensi) diproses di process terpisah, dibatasi
+        PIPELINE_CONFIG['max_theme_workers']. Dengan nilai 1, tema diproses berurutan
+        di process ini.
+        
+        Returns:
+            (intermediate_files, converted_files, pmtiles_urls)
+        """
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        
+        themes = ['existing', 'potensi']
+        max_workers = min(PIPELINE_CONFIG['max_theme_workers'], len(themes))
+        logger.info(f"Steps 7-9: Processing {len(themes)} themes with {max_workers} worker(s)...")
+        
+        results = {}
+        try:
+            # Hash data dihitung sekali di sini, dipakai worker (cache step 7-9) dan step 9B
+            for theme in themes:
+                self._data_hash(theme)
+            
+            if max_workers <= 1:
+                for idx, theme in enumerate(themes, start=1):
+                    results[theme] = self._process_theme(theme)
+                    self._update_progress(60 + 30 * idx // len(themes))
+            else:
+                # CPU dibagi antar process tema (thread ZIP dan tippecanoe, lihat _thread_budget)
+                self._theme_processes = max_workers
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {executor.submit(self._process_theme, theme): theme for theme in themes}
+                    for future in as_completed(futures):
+                        theme = futures[future]
+                        results[theme] = future.result()
+                        logger.info(f"✓ Theme {theme} finished (export, convert, PMTiles)")
+                        self._update_progress(60 + 30 * len(results) // len(themes))
+        
         except Exception as e:
-            logger.error(f"Step 8 failed: {e}")
-            import traceback
+            logger.error(f"Steps 7-9 failed: {e}")
             logger.error(traceback.format_exc())
             raise
+        finally:
+            self._theme_processes = 1
+        
+        intermediate_files = {theme: results[theme]['intermediate_file'] for theme in themes}
+        converted_files = {theme: results[theme]['converted_files'] for theme in themes}
+        pmtiles_urls = {theme: results[theme]['pmtiles_url'] for theme in themes}
+        for theme in themes:
+            self._artifacts.extend(results[theme]['artifacts'])
+
+        logger.info("Steps 7-9 completed: Export, format conversion and PMTiles generation finished")
+        
+        return intermediate_files, converted_files, pmtiles_urls
+
+    def _thread_budget(self) -> int:
+        """Jumlah thread CPU untuk satu process tema: CPU dibagi process tema yang berjalan bersamaan"""
+        return max(1, (os.cpu_count() or 1) // self._theme_processes)
     
-    def step_9_generate_pmtiles(self, geojson_files: Dict[str, str]) -> Dict[str, str]:
-        """Step 9: Generate PMTiles (90%)"""
-        logger.info("Step 9: Generating PMTiles...")
+    def _convert_theme(self, theme: str, intermediate_file: str) -> Dict[str, Dict[str, Any]]:
+        """Konversi satu tema dari file intermediate ke Shapefile zip dan GDB zip (langsung di S3)"""
+        # Read intermediate (GeoParquet via Arrow, atau GeoJSON) - satu kali untuk semua sink
+        gdf = self._read_intermediate(intermediate_file)
+        logger.info(f"Read {theme} intermediate: {len(gdf)} features")
+        logger.info(f"Original columns ({len(gdf.columns)}): {list(gdf.columns)}")
+        logger.info(f"Data types:\n{gdf.dtypes}")
         
-        try:
-            pmtiles_urls = {}
+        theme_files = self._build_download_artifacts(gdf, theme, self.year, self.temp_dir)
+        
+        self._log_precision_savings(theme, 'Shapefile zip', theme_files['shp_zip']['size'], 'binary')
+        self._log_precision_savings(theme, 'GDB zip', theme_files['gdb_zip']['size'], 'binary')
+        
+        logger.info(f"✓ Completed conversion for {theme}")
+        logger.info("=" * 60)
+        
+        return theme_files
+    
+    def _build_download_artifacts(self, gdf, theme: str, year: int, output_dir: str,
+                                  validate: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Tulis Shapefile dan GDB dari satu GeoDataFrame yang sudah dibaca, lalu publish ZIP-nya
+        langsung ke S3 (pmn-result/{year}/).
+        
+        Kedua sink menerima shallow copy dari frame yang sama (hanya kolom yang dikonversi
+        yang dibuat baru) dan ditulis paralel di thread terpisah
+        (PIPELINE_CONFIG['artifact_sink_workers']).
+        
+        Args:
+            validate: Validasi dataset lokal (_validate_shapefile / _validate_gdb) sebelum ZIP
+                di-stream ke S3; dataset yang gagal validasi tidak pernah dipublish
+        
+        Returns:
+            {'shp_zip': artifact, 'gdb_zip': artifact}, dengan artifact berisi
+            key, url, size, md5 (ZIP di S3) dan features
+        """
+        # Tipe kolom dari skema pmn.{theme}_{year} jika sudah dibaca saat export (step 7);
+        # data historis memakai dtype hasil baca
+        column_types = None
+        if year == self.year and theme in self._table_schema_cache:
+            column_types = {column['name']: column['type'] for column in self._table_schema_cache[theme]}
+        
+        if REPRODUCIBLE_CONFIG['enabled']:
+            # Urutan feature dari isi baris, bukan urutan export (ogc_fid diisi ulang setiap agregasi)
+            gdf = gdf.iloc[_stable_row_order(gdf)]
+        
+        gdf_shp = self._prepare_shapefile_frame(gdf, column_types)
+        gdf_gdb = self._prepare_gdb_frame(gdf, column_types)
+
+        with ThreadPoolExecutor(max_workers=PIPELINE_CONFIG['artifact_sink_workers']) as executor:
+            shp_future = executor.submit(self._write_shapefile_zip, gdf_shp, theme, year, output_dir, validate)
+            gdb_future = executor.submit(self._write_gdb_zip, gdf_gdb, theme, year, output_dir, validate)
+            return {'shp_zip': shp_future.result(), 'gdb_zip': gdb_future.result()}
+    
+    def _prepare_shapefile_frame(self, gdf, column_types: Optional[Dict[str, str]] = None):
+        """
+        Shallow copy GeoDataFrame untuk Shapefile: kolom profile 'shp', tipe yang didukung
+        DBF (lihat _coercion_plan) dan nama kolom maksimal 10 karakter
+        """
+        # Shallow copy: kolom yang diubah di bawah di-assign ulang, data asli tidak diduplikasi
+        gdf_shp = gdf.copy(deep=False)
+        
+        # Hanya kolom profile 'shp' (OUTPUT_COLUMN_PROFILES)
+        attribute_cols = [col for col in gdf.columns if col != 'geometry']
+        for col in set(attribute_cols) - set(_profile_columns(attribute_cols, 'shp')):
+            del gdf_shp[col]
+        
+        # 1-2. Tipe target tiap kolom ditentukan sekali, lalu dikonversi secara vectorized
+        plan = _coercion_plan(gdf_shp, column_types)
+        datetime_cols = [col for col, kind in plan.items() if kind in ('datetime', 'date')]
+        _coerce_attribute_types(gdf_shp, plan)
+        logger.info(f"Converted {len(datetime_cols)} datetime columns to string: {datetime_cols}")
+
+        # 3. Truncate column names to 10 characters (Shapefile limitation)
+        column_mapping = {}
+        used_names = set()
+        
+        for col in gdf_shp.columns:
+            if col == 'geometry':
+                continue
             
-            for theme, geojson_file in geojson_files.items():
-                # Generate PMTiles using tippecanoe
-                pmtiles_file = os.path.join(self.temp_dir, f'{theme.upper()}{self.year}.pmtiles')
-                
-                subprocess.run([
-                    'tippecanoe',
-                    '-o', pmtiles_file,
-                    '--force',
-                    '--maximum-zoom=14',
-                    '--minimum-zoom=0',
-                    geojson_file
-                ], check=True)
-                
-                # Upload to S3 - dengan ekstensi .pmtiles
-                s3_path_with_ext = f"{S3_CONFIG['s3_prefix']}/layers/{theme.upper()}{self.year}.pmtiles"
-                self.s3_client.upload_file(
-                    pmtiles_file,
-                    S3_CONFIG['bucket'],
-                    s3_path_with_ext
-                )
-                logger.info(f"  ✅ Uploaded: {s3_path_with_ext}")
-                
-                # Upload to S3 - tanpa ekstensi (untuk legacy/geoportal compatibility)
-                s3_path_no_ext = f"{S3_CONFIG['s3_prefix']}/layers/{theme.upper()}{self.year}"
-                self.s3_client.upload_file(
-                    pmtiles_file,
-                    S3_CONFIG['bucket'],
-                    s3_path_no_ext
-                )
-                logger.info(f"  ✅ Uploaded: {s3_path_no_ext}")
+            if len(col) > 10:
+                # Create short name
+                base_name = col[:10]
+                new_col = base_name
                 
-                # URL tanpa ekstensi untuk geoportal.layers
-                pmtiles_url = f"{S3_CONFIG['public_host']}/{s3_path_no_ext}"
-                pmtiles_urls[theme] = pmtiles_url
+                # Ensure uniqueness
+                counter = 1
+                while new_col in used_names or new_col in gdf_shp.columns:
+                    new_col = col[:8] + f"{counter:02d}"
+                    counter += 1
+                    if counter > 99:  # Safety limit
+                        new_col = col[:7] + f"{counter:03d}"
                 
-                logger.info(f"Generated and uploaded PMTiles for {theme}: {pmtiles_url}")
-            
-            self._update_progress(90)
-            logger.info("Step 9 completed: PMTiles generation finished")
-            
-            return pmtiles_urls
+                column_mapping[col] = new_col
+                used_names.add(new_col)
+                logger.info(f"Truncating column: '{col}' -> '{new_col}'")
+            else:
+                used_names.add(col)
+        
+        if column_mapping:
+            gdf_shp = gdf_shp.rename(columns=column_mapping, copy=False)
+            logger.info(f"Renamed {len(column_mapping)} columns for Shapefile")
+        
+        # 4. Final data type check
+        logger.info("Final Shapefile data types:")
+        for col in gdf_shp.columns:
+            if col != 'geometry':
+                logger.info(f"  {col}: {gdf_shp[col].dtype}")
+        
+        return gdf_shp
+    
+    def _prepare_gdb_frame(self, gdf, column_types: Optional[Dict[str, str]] = None):
+        """
+        Shallow copy GeoDataFrame untuk GDB: kolom profile 'gdb', tanpa kolom FID, geometry 2D.
+        Nama kolom dan tanggal/waktu dipertahankan apa adanya (tanpa batasan Shapefile).
+        """
+        import pandas as pd
+        import shapely
+
+        # Shallow copy dari data yang sudah dibaca (tanpa baca ulang intermediate)
+        gdf_for_gdb = gdf.copy(deep=False)
+        
+        # Hanya kolom profile 'gdb' (OUTPUT_COLUMN_PROFILES)
+        attribute_cols = [col for col in gdf.columns if col != 'geometry']
+        for col in set(attribute_cols) - set(_profile_columns(attribute_cols, 'gdb')):
+            del gdf_for_gdb[col]
+        
+        # Remove ogc_fid or fid columns if they exist (to avoid duplicate ID issues)
+        fid_columns = [col for col in gdf_for_gdb.columns if col.lower() in ['ogc_fid', 'fid', 'id', 'objectid']]
+        if fid_columns:
+            logger.info(f"Removing FID columns for GDB: {fid_columns}")
+            for col in fid_columns:
+                del gdf_for_gdb[col]
+        
+        # Konversi tipe (vectorized); datetime tetap bertipe datetime dan null tetap null di GDB
+        _coerce_attribute_types(gdf_for_gdb, _coercion_plan(gdf_for_gdb, column_types), datetime_format=None,
+                                fill_missing=False)
+        
+        # Force 2D
+        if gdf_for_gdb.geometry.has_z.any():
+            gdf_for_gdb['geometry'] = shapely.force_2d(gdf_for_gdb.geometry.to_numpy())
+
+        # Reset index to ensure clean sequential numbering (tanpa menyalin data)
+        gdf_for_gdb.index = pd.RangeIndex(len(gdf_for_gdb))
+        
+        return gdf_for_gdb
+    
+    def _write_shapefile_zip(self, gdf_shp, theme: str, year: int, output_dir: str,
+                             validate: bool = True) -> Dict[str, Any]:
+        """Tulis Shapefile lalu stream ZIP-nya ke S3; return artifact (lihat _publish_zip)"""
+        shp_dir = os.path.join(output_dir, f'{theme}_shp')
+        os.makedirs(shp_dir, exist_ok=True)
+        shp_file = os.path.join(shp_dir, f'AR_25K_PETAMANGROVE_{theme.upper()}_{year}.shp')
+        
+        # Lebar field DBF dari isi kolom, sekali untuk semua part (skema part sama)
+        dbf_fields = plan_dbf_fields(gdf_shp)
+        
+        # Ukuran diperkirakan sebelum menulis: dipecah ke beberapa part jika melewati batas 2 GB
+        parts = _plan_shapefile_parts(gdf_shp, SHAPEFILE_CONFIG['max_file_bytes'],
+                                      dbf_record_size(dbf_fields), SHAPEFILE_CONFIG['split_column'])
+        if len(parts) == 1:
+            part_files = [(shp_file, None)]
+        else:
+            logger.info(f"Shapefile for {theme} exceeds {SHAPEFILE_CONFIG['max_file_bytes']:,} bytes per file, "
+                        f"splitting into {len(parts)} parts")
+            part_files = [(shp_file.replace('.shp', f'_part{idx:02d}.shp'), positions)
+                          for idx, positions in enumerate(parts, start=1)]
+        
+        # Tipe kolom sudah dikonversi oleh _prepare_shapefile_frame, cukup satu kali tulis per part
+        logger.info(f"Creating Shapefile for {theme}...")
+        feature_count = 0
+        for part_file, positions in part_files:
+            part = gdf_shp if positions is None else gdf_shp.iloc[positions]
+            # Geometry (.shp/.shx/.prj) ditulis GDAL; .dbf ditimpa dengan field selebar isinya
+            _write_vector(part[[part.geometry.name]], part_file, driver='ESRI Shapefile', encoding='utf-8')
+            write_dbf(part_file.replace('.shp', '.dbf'), part, dbf_fields, last_update=_build_timestamp(year))
+            feature_count += _count_vector_features(part_file)
+            logger.info(f"✓ Shapefile created successfully: {part_file} ({len(part)} features)")
+        
+        if validate and not self._validate_shapefile([part_file for part_file, _ in part_files], len(gdf_shp)):
+            raise Exception(f"Shapefile validation failed: {shp_file}")
+        
+        # ========== ZIP SHAPEFILE -> S3 ==========
+        members = []
+        for part_file, _ in part_files:
+            for ext in ['.shp', '.shx', '.dbf', '.prj', '.cpg']:
+                file_path = part_file.replace('.shp', ext)
+                if os.path.exists(file_path):
+                    members.append((file_path, os.path.basename(file_path)))
+        
+        artifact = self._publish_zip(members, self._download_s3_key(theme, year, '.zip'),
+                                     date_time=_build_timestamp(year),
+                                     kind='shp', theme=theme, year=year, features=feature_count)
+        logger.info(f"✓ Shapefile zip published: {artifact['key']} ({artifact['size']:,} bytes, {feature_count} features)")
+        
+        # Dataset lokal tidak diperlukan lagi
+        import shutil
+        shutil.rmtree(shp_dir, ignore_errors=True)
+        
+        return artifact
+    
+    def _write_gdb_zip(self, gdf_gdb, theme: str, year: int, output_dir: str,
+                       validate: bool = True) -> Dict[str, Any]:
+        """Tulis File Geodatabase lalu stream ZIP-nya ke S3; return artifact (lihat _publish_zip)"""
+        gdb_dir = os.path.join(output_dir, f'AR_25K_PETAMANGROVE_{theme.upper()}_{year}.gdb')
+        
+        logger.info(f"Creating GDB for {theme}...")
+        
+        # Driver OpenFileGDB tidak bisa menimpa .gdb yang sudah ada
+        if os.path.exists(gdb_dir):
+            import shutil
+            shutil.rmtree(gdb_dir)
+        
+        # Tulis langsung dari memori via GDAL OpenFileGDB; OBJECTID dibuat ulang oleh driver
+        _write_vector(gdf_gdb, gdb_dir, driver='OpenFileGDB',
+                      layer=f'PETAMANGROVE_{theme.upper()}_{year}')
+        
+        if REPRODUCIBLE_CONFIG['enabled']:
+            _normalize_gdb_uuids(gdb_dir)
+        
+        logger.info(f"✓ GDB created successfully: {gdb_dir}")
+        
+        layers = _list_vector_layers(gdb_dir)
+        feature_count = _count_vector_features(gdb_dir, layer=layers[0]) if layers else 0
+        if validate and not self._validate_gdb(gdb_dir, len(gdf_gdb)):
+            raise Exception(f"GDB validation failed: {gdb_dir}")
+        
+        # ========== ZIP GDB -> S3 ==========
+        # Urutan member stabil (urutan os.walk bergantung filesystem)
+        members = []
+        for root, dirs, files in os.walk(gdb_dir):
+            dirs.sort()
+            for file in sorted(files):
+                file_path = os.path.join(root, file)
+                members.append((file_path, os.path.relpath(file_path, os.path.dirname(gdb_dir))))
+        
+        artifact = self._publish_zip(members, self._download_s3_key(theme, year, '.gdb.zip'),
+                                     date_time=_build_timestamp(year),
+                                     kind='gdb', theme=theme, year=year, features=feature_count)
+        logger.info(f"✓ GDB zip published: {artifact['key']} ({artifact['size']:,} bytes, {feature_count} features)")
+        
+        # Dataset lokal tidak diperlukan lagi
+        import shutil
+        shutil.rmtree(gdb_dir, ignore_errors=True)
+        
+        return artifact
+    
+    def _download_s3_key(self, theme: str, year: int, suffix: str) -> str:
+        """Key S3 file download (Shapefile .zip / GDB .gdb.zip) satu tema"""
+        return f"{S3_CONFIG['s3_prefix']}/pmn-result/{year}/AR_25K_PETAMANGROVE_{theme.upper()}_{year}{suffix}"
+    
+    def _publish_zip(self, members: List[tuple], s3_key: str, date_time: Optional[datetime] = None,
+                     **details) -> Dict[str, Any]:
+        """
+        Kompres file ke ZIP yang langsung di-stream ke S3 sebagai multipart upload
+        (S3MultipartWriter), tanpa file ZIP lokal. Member dikompres paralel
+        (ParallelZipWriter, lihat PUBLISH_CONFIG). Jika gagal, upload dibatalkan.
+        
+        Args:
+            members: List of (path lokal, nama di dalam ZIP)
+            s3_key: Key tujuan
+            date_time: Timestamp tetap semua member (build reproducible); None = mtime file
+            **details: Keterangan tambahan artifact (kind, theme, year, features)
+        
+        Returns:
+            Artifact (lihat _artifact_record)
+        """
+        with S3MultipartWriter(self.s3_client, S3_CONFIG['bucket'], s3_key,
+                               part_size=PUBLISH_CONFIG['part_size'], content_type='application/zip') as stream:
+            with ParallelZipWriter(stream, compress_level=PUBLISH_CONFIG['zip_compress_level'],
+                                   max_workers=PUBLISH_CONFIG['zip_workers'] or self._thread_budget(),
+                                   date_time=date_time.timetuple()[:6] if date_time else None) as zipf:
+                for file_path, arcname in members:
+                    zipf.add(file_path, arcname)
+        
+        return self._artifact_record(stream, s3_key, **details)
+    
+    def _publish_file(self, local_path: str, s3_key: str, **details) -> Dict[str, Any]:
+        """Upload file lokal ke S3 dan hapus; checksum dihitung sambil upload (file dibaca sekali)"""
+        stream = s3_upload_file(self.s3_client, local_path, S3_CONFIG['bucket'], s3_key,
+                                part_size=PUBLISH_CONFIG['part_size'])
+        os.remove(local_path)
+        return self._artifact_record(stream, s3_key, **details)
+    
+    def _artifact_record(self, stream: S3MultipartWriter, s3_key: str, **details) -> Dict[str, Any]:
+        """
+        Catatan artifact yang sudah di S3, untuk metadata dan manifest.
+        
+        Returns:
+            {'key', 'url', 'size', 'md5', 'sha256'} + details
+        """
+        record = {
+            'key': s3_key,
+            'url': f"{S3_CONFIG['public_host']}/{s3_key}",
+            'size': stream.size,
+            'md5': stream.md5,
+            'sha256': stream.sha256
+        }
+        record.update(details)
+        return record
+    
+    def _write_manifest(self, year: int, artifacts: List[Dict[str, Any]]) -> str:
+        """
+        Tulis manifest run (ukuran, MD5, SHA-256 dan jumlah feature tiap artifact) ke
+        pmn-result/{year}/manifest.json. Checksum berasal dari proses upload, tanpa membaca
+        ulang artifact.
+        
+        Returns:
+            URL publik manifest
+        """
+        manifest = {
+            'year': year,
+            'process_id': self.process_id,
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'artifacts': sorted(artifacts, key=lambda artifact: artifact['key'])
+        }
+        s3_key = f"{S3_CONFIG['s3_prefix']}/pmn-result/{year}/manifest.json"
+        self.s3_client.put_object(
+            Bucket=S3_CONFIG['bucket'],
+            Key=s3_key,
+            Body=json.dumps(manifest, indent=2, ensure_ascii=False).encode('utf-8'),
+            ContentType='application/json'
+        )
+        logger.info(f"✓ Manifest written: {s3_key} ({len(artifacts)} artifacts)")
+        return f"{S3_CONFIG['public_host']}/{s3_key}"
+    
+    def _compute_source_signature(self, bpdas_list: List[str]) -> Optional[str]:
+        """
+        Signature murah sumber agregasi (step 4), dihitung sebelum agregasi: per BPDAS, untuk tabel
+        {theme}_{year} dan tabel QC-nya, jumlah baris serta maksimum dan jumlah xmin (berubah pada
+        setiap INSERT/UPDATE, DELETE mengubah jumlah baris) beserta kolomnya, ditambah skema tabel
+        pmn. Satu scan per tabel sumber di database BPDAS, tanpa transfer baris.
+        
+        Returns:
+            SHA-256 hex, atau None jika ada BPDAS yang tidak bisa dibaca
+        """
+        start_time = time.time()
+        sources = {}
+        for bpdas_db in bpdas_list:
+            try:
+                conn = self._get_db_connection(bpdas_db, operation='aggregate')
+                try:
+                    cursor = conn.cursor()
+                    for table in [f'{theme}_{self.year}{suffix}' for theme in ('existing', 'potensi')
+                                  for suffix in ('', '_qc')]:
+                        cursor.execute("""
+                            SELECT column_name, data_type
+                            FROM information_schema.columns
+                            WHERE table_schema = 'public' AND table_name = %s
+                            ORDER BY ordinal_position
+                        """, (table,))
+                        columns = cursor.fetchall()
+                        if not columns:
+                            continue
+                        cursor.execute(f"""
+                            SELECT COUNT(*), MAX(xmin::text::bigint), SUM(xmin::text::bigint)
+                            FROM public."{table}"
+                        """)
+                        count, max_xmin, sum_xmin = cursor.fetchone()
+                        sources[f'{bpdas_db}/{table}'] = [columns, count, max_xmin, str(sum_xmin)]
+                    cursor.close()
+                finally:
+                    conn.close()
+            except Exception as e:
+                logger.warning(f"Source signature unavailable, aggregating: {bpdas_db}: {e}")
+                return None
+        
+        conn = self._get_db_connection()
+        try:
+            targets = {theme: self._get_table_schema(conn, theme) for theme in ('existing', 'potensi')}
+        finally:
+            conn.close()
+        
+        content = json.dumps({'version': ARTIFACT_CACHE_CONFIG['version'], 'year': self.year,
+                              'sources': sources, 'targets': targets}, sort_keys=True, default=str)
+        signature = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        logger.info(f"Source signature {signature[:12]} ({len(sources)} tables, "
+                    f"{len(bpdas_list)} BPDAS) in {time.time() - start_time:.1f}s")
+        return signature
+    
+    def _aggregated_table_state(self) -> Dict[str, list]:
+        """Jumlah baris dan ogc_fid maksimum pmn.{theme}_{year} (ogc_fid baru setiap agregasi ulang)"""
+        conn = self._get_db_connection()
+        try:
+            cursor = conn.cursor()
+            state = {}
+            for theme in ('existing', 'potensi'):
+                cursor.execute(f"SELECT COUNT(*), MAX(ogc_fid) FROM pmn.{theme}_{self.year}")
+                state[theme] = list(cursor.fetchone())
+            cursor.close()
+        finally:
+            conn.close()
+        return state
+    
+    def _restore_aggregation(self) -> bool:
+        """
+        Cek cache agregasi sebelum step 2: jika signature sumber BPDAS sama dengan agregasi
+        yang tercatat dan pmn.* masih berisi hasil agregasi tersebut (jumlah baris dan ogc_fid
+        maksimum sama), hash data tema diambil dari cache.
+        
+        Returns:
+            True jika agregasi (step 2, 4) boleh dilewati
+        """
+        if not ARTIFACT_CACHE_CONFIG['enabled']:
+            return False
+        
+        bpdas_list = self._accessible_bpdas_list()
+        signature = self._compute_source_signature(bpdas_list)
+        self._source_signature = (signature, bpdas_list)
+        if signature is None:
+            return False
+        
+        entry = self._get_cache_json('sources', f'{signature}.json')
+        if entry is None:
+            return False
+        if entry['tables'] != self._aggregated_table_state():
+            logger.info(f"Source signature {signature[:12]} cached, but pmn tables changed since: aggregating")
+            return False
+        
+        self._data_hashes.update(entry['data_hashes'])
+        logger.info(f"✓ BPDAS sources unchanged ({signature[:12]}): skipping aggregation (steps 2, 4)")
+        return True
+    
+    def _store_aggregation(self, bpdas_list: List[str]):
+        """
+        Catat hasil agregasi untuk signature sumber (_restore_aggregation). Hanya jika semua
+        BPDAS berhasil diagregasi dan daftar BPDAS sama dengan saat signature dihitung.
+        """
+        signature, signed_bpdas = self._source_signature
+        if signature is None or bpdas_list != signed_bpdas:
+            return
+        if self._aggregation_failures:
+            logger.info(f"Aggregation not cached, failed BPDAS: {sorted(self._aggregation_failures)}")
+            return
+        
+        self._put_cache_json('sources', f'{signature}.json', {
+            'data_hashes': {theme: self._data_hash(theme) for theme in ('existing', 'potensi')},
+            'tables': self._aggregated_table_state()
+        })
+    
+    def _data_hash(self, theme: str) -> str:
+        """
+        Hash isi tabel pmn.{theme}_{year} (di-cache per tema). Tidak bergantung urutan baris
+        dan ogc_fid: md5 tiap baris dijumlahkan, sehingga hasil agregasi yang sama dari run
+        lain menghasilkan hash yang sama.
+        """
+        if theme not in self._data_hashes:
+            conn = self._get_db_connection(read_only=True, operation='export')
+            try:
+                schema = [column for column in self._get_table_schema(conn, theme) if column['name'] != 'ogc_fid']
+                row_expr = ', '.join('ST_AsEWKB(geometry)' if column['name'] == 'geometry' else f'"{column["name"]}"'
+                                     for column in schema)
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    SELECT COUNT(*),
+                           COALESCE(SUM(('x' || substr(h, 1, 16))::bit(64)::bigint::numeric), 0),
+                           COALESCE(SUM(('x' || substr(h, 17, 16))::bit(64)::bigint::numeric), 0)
+                    FROM (SELECT md5(ROW({row_expr})::text) AS h FROM pmn.{theme}_{self.year}) AS rows
+                """)
+                count, high, low = cursor.fetchone()
+                cursor.close()
+            finally:
+                conn.close()
             
-        except Exception as e:
-            logger.error(f"Step 9 failed: {e}")
-            raise
+            content = json.dumps({'rows': count, 'high': str(high), 'low': str(low), 'schema': schema}, sort_keys=True)
+            self._data_hashes[theme] = hashlib.sha256(content.encode('utf-8')).hexdigest()
+            logger.info(f"Data hash {theme}_{self.year}: {self._data_hashes[theme][:12]} ({count} rows)")
+        
+        return self._data_hashes[theme]
+    
+    def _artifact_fingerprint(self, theme: str, stage: str) -> str:
+        """
+        Key cache artifact: hash data tema + semua konfigurasi yang menentukan byte output.
+        
+        Konfigurasi yang hanya memengaruhi kecepatan (fetch_size, jumlah worker, chunk_rows)
+        tidak disertakan.
+        
+        Args:
+            stage: 'national' (Shapefile, GDB, PMTiles nasional) atau 'bpdas' (PMTiles per BPDAS)
+        """
+        if stage == 'national':
+            config = {
+                'profiles': {name: OUTPUT_COLUMN_PROFILES[name] for name in ('shp', 'gdb', 'tiles_national')},
+                'shapefile': SHAPEFILE_CONFIG,
+                'dbf': {key: DBF_WRITER_CONFIG[key] for key in ('max_char_width', 'max_numeric_width', 'max_decimals')},
+                'zip': {
+                    'compress_level': PUBLISH_CONFIG['zip_compress_level'],
+                    'chunk_size': ZIP_BUILDER_CONFIG['chunk_size'],  # Batas blok deflate per chunk
+                    'stored_extensions': ZIP_BUILDER_CONFIG['stored_extensions']
+                }
+            }
+        else:
+            config = {
+                'profiles': {'tiles_bpdas': OUTPUT_COLUMN_PROFILES['tiles_bpdas']},
+                'pmtiles_bpdas': PMTILES_BPDAS_CONFIG
+            }
+        config['export'] = {key: EXPORT_CONFIG[key] for key in ('intermediate_format', 'coordinate_precision')}
+        config['io'] = IO_CONFIG
+        config['dtype'] = DTYPE_CONFIG
+        config['reproducible'] = REPRODUCIBLE_CONFIG
+        
+        content = json.dumps({
+            'version': ARTIFACT_CACHE_CONFIG['version'],
+            'stage': stage,
+            'theme': theme,
+            'year': self.year,
+            'data': self._data_hash(theme),
+            'config': config
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    
+    def _cache_key(self, fingerprint: str, name: str) -> str:
+        """Key S3 di dalam entry cache"""
+        return f"{S3_CONFIG['s3_prefix']}/{ARTIFACT_CACHE_CONFIG['prefix']}/{fingerprint}/{name}"
+    
+    def _get_cache_json(self, fingerprint: str, name: str) -> Optional[Any]:
+        """Isi objek JSON di cache, atau None jika cache nonaktif / objek belum ada"""
+        from botocore.exceptions import ClientError
+        
+        if not ARTIFACT_CACHE_CONFIG['enabled']:
+            return None
+        
+        try:
+            response = self.s3_client.get_object(Bucket=S3_CONFIG['bucket'], Key=self._cache_key(fingerprint, name))
+            return json.loads(response['Body'].read())
+        except ClientError as e:
+            if e.response['Error']['Code'] not in ('NoSuchKey', '404'):
+                logger.warning(f"Artifact cache lookup failed, rebuilding: {e}")
+            return None
+    
+    def _put_cache_json(self, fingerprint: str, name: str, content: Any) -> bool:
+        """Tulis objek JSON ke cache; kegagalan hanya dicatat (cache tidak boleh menggagalkan run)"""
+        from botocore.exceptions import ClientError
+        
+        try:
+            self.s3_client.put_object(
+                Bucket=S3_CONFIG['bucket'],
+                Key=self._cache_key(fingerprint, name),
+                Body=json.dumps(content, indent=2, ensure_ascii=False).encode('utf-8'),
+                ContentType='application/json'
+            )
+            return True
+        except ClientError as e:
+            logger.warning(f"Failed to store {name} in cache {fingerprint[:12]}: {e}")
+            return False
+    
+    def _load_cached_artifacts(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Entry cache {'artifacts': [...], 'pending': [BPDAS yang belum ada artifact-nya]},
+        atau None jika cache nonaktif / entry belum ada
+        """
+        return self._get_cache_json(fingerprint, 'artifacts.json')
+    
+    def _restore_cached_artifacts(self, cached: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Publish artifact dari cache ke key tujuannya (server-side copy)"""
+        for artifact in cached:
+            cache_key = artifact['cache_key']
+            self._copy_s3_object(cache_key, artifact['key'])
+            if artifact['kind'] in ('pmtiles', 'pmtiles_bpdas'):
+                # Salinan tanpa ekstensi (untuk geoportal compatibility)
+                self._copy_s3_object(cache_key, artifact['key'].replace('.pmtiles', ''))
+            logger.info(f"  ✅ From cache: {artifact['key']}")
+        return cached
+    
+    def _store_cached_artifacts(self, fingerprint: str, artifacts: List[Dict[str, Any]],
+                                pending: List[str] = ()):
+        """
+        Simpan artifact yang baru dipublish ke entry cache (server-side copy). artifacts.json
+        ditulis terakhir, sehingga entry yang setengah jadi tidak pernah terbaca sebagai hit.
+        pending: BPDAS yang gagal di run ini, diproses ulang oleh run berikutnya.
+        Kegagalan hanya dicatat: cache tidak boleh menggagalkan run.
+        """
+        from botocore.exceptions import ClientError
+        
+        if not ARTIFACT_CACHE_CONFIG['enabled'] or not artifacts:
+            return
+        
+        try:
+            cached = []
+            for artifact in artifacts:
+                cache_key = self._cache_key(fingerprint, os.path.basename(artifact['key']))
+                # Artifact yang dipublish dari entry ini sudah ada di cache
+                if artifact.get('cache_key') != cache_key:
+                    self._copy_s3_object(artifact['key'], cache_key)
+                cached.append({**artifact, 'cache_key': cache_key})
+        except ClientError as e:
+            logger.warning(f"Failed to store artifacts in cache {fingerprint[:12]}: {e}")
+            return
+        
+        if self._put_cache_json(fingerprint, 'artifacts.json', {'artifacts': cached, 'pending': sorted(pending)}):
+            logger.info(f"✓ Cached {len(cached)} artifacts: {fingerprint[:12]}"
+                        + (f" ({len(pending)} BPDAS pending)" if pending else ""))
+    
+    def _copy_s3_object(self, source_key: str, target_key: str):
+        """Salin objek di bucket yang sama secara server-side (tanpa download/upload ulang)"""
+        self.s3_client.copy({'Bucket': S3_CONFIG['bucket'], 'Key': source_key}, S3_CONFIG['bucket'], target_key)
+    
+    def _gdal_s3_env(self) -> Dict[str, str]:
+        """Environment untuk proses GDAL yang menulis ke /vsis3/ (kredensial dari S3_CONFIG)"""
+        env = os.environ.copy()
+        if S3_CONFIG['access_key']:
+            env['AWS_ACCESS_KEY_ID'] = S3_CONFIG['access_key']
+            env['AWS_SECRET_ACCESS_KEY'] = S3_CONFIG['secret_key']
+        env['AWS_REGION'] = S3_CONFIG['region']
+        env['AWS_S3_ENDPOINT'] = S3_CONFIG['endpoint_url'].split('://', 1)[-1]
+        # Driver yang butuh random write tetap bisa menulis ke /vsis3/ via file sementara
+        env['CPL_VSIL_USE_TEMP_FILE_FOR_RANDOM_WRITE'] = 'YES'
+        return env
+    
+    def _generate_theme_pmtiles(self, theme: str, intermediate_file: str) -> Dict[str, Any]:
+        """
+        Generate PMTiles nasional satu tema dengan tippecanoe dan upload ke S3.
+        
+        Returns:
+            Artifact (lihat _artifact_record) dengan tambahan 'map_url': URL tanpa ekstensi
+        """
+        # Generate PMTiles using tippecanoe
+        pmtiles_file = os.path.join(self.temp_dir, f'{theme.upper()}{self.year}.pmtiles')
+        
+        # Tippecanoe dijalankan di temp_dir dengan path relatif: command line tercatat di metadata
+        # PMTiles (generator_options), path temp yang berbeda tiap run akan mengubah isi file
+        cmd = [
+            'tippecanoe',
+            '-o', os.path.basename(pmtiles_file),
+            '--force',
+            '--maximum-zoom=14',
+            '--minimum-zoom=0',
+            '--layer', f'{theme}_{self.year}'  # Sama dengan nama layer dari nama file GeoJSON
+        ]
+        tile_input = intermediate_file
+        if intermediate_file.endswith('.parquet'):
+            # Tippecanoe tidak membaca Parquet: ditulis dulu ke GeoJSONSeq sementara (hanya kolom
+            # profile tiles_national) agar tippecanoe bisa membaca input secara paralel
+            tile_input = os.path.join(self.temp_dir, f'{theme}_{self.year}.tiles.geojsons')
+            self._write_geojsonseq_from_parquet(intermediate_file, tile_input, profile='tiles_national')
+        else:
+            # Atribut di luar profile tiles_national dibuang tippecanoe saat membaca input
+            cmd += _tippecanoe_attribute_args('tiles_national')
+        
+        if tile_input.endswith('.geojsons'):
+            # Satu Feature per baris: input dibaca paralel oleh beberapa thread
+            cmd += ['--read-parallel', os.path.relpath(tile_input, self.temp_dir)]
+        else:
+            cmd.append(os.path.relpath(tile_input, self.temp_dir))
+        
+        # Tippecanoe menulis progress ke stderr, dipakai watchdog sebagai tanda progres;
+        # jumlah thread-nya dibatasi bagian CPU process tema ini
+        self._run_with_watchdog(cmd, timeout=TIMEOUT_CONFIG['subprocess_seconds']['tippecanoe'],
+                                progress_path=pmtiles_file, check=True, cwd=self.temp_dir,
+                                env=dict(os.environ, TIPPECANOE_MAX_THREADS=str(self._thread_budget())))
+        if tile_input != intermediate_file:
+            os.remove(tile_input)
+        
+        # Upload to S3 - dengan ekstensi .pmtiles (checksum dihitung sambil upload)
+        s3_path_with_ext = f"{S3_CONFIG['s3_prefix']}/layers/{theme.upper()}{self.year}.pmtiles"
+        artifact = self._publish_file(pmtiles_file, s3_path_with_ext, kind='pmtiles', theme=theme, year=self.year)
+        logger.info(f"  ✅ Uploaded: {s3_path_with_ext} ({artifact['size']:,} bytes)")
+        
+        # Salinan tanpa ekstensi (untuk legacy/geoportal compatibility), server-side copy
+        s3_path_no_ext = f"{S3_CONFIG['s3_prefix']}/layers/{theme.upper()}{self.year}"
+        self._copy_s3_object(s3_path_with_ext, s3_path_no_ext)
+        logger.info(f"  ✅ Copied: {s3_path_no_ext}")
+        
+        os.remove(pmtiles_file)
 
+        # URL tanpa ekstensi untuk geoportal.layers
+        artifact['map_url'] = f"{S3_CONFIG['public_host']}/{s3_path_no_ext}"
+        logger.info(f"Generated and uploaded PMTiles for {theme}: {artifact['map_url']}")
+        
+        return artifact
+    
     def _slugify(self, value: str) -> str:
         """
         Normalisasi & 'slugify' nama -> lowercase, underscore, alfanumerik.
         Digunakan untuk membuat nama file yang aman.
         """
-        value = str(value)
-        value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii")
-        value = value.lower().strip()
-        value = re.sub(r"\s+", "_", value)               # spasi -> underscore
-        value = re.sub(r"[^a-z0-9_]+", "", value)        # hanya a-z0-9_
-        value = re.sub(r"_+", "_", value).strip("_")     # rapikan underscore
-        return value or "unknown"
+        return slugify(value)
 
     def _escape_sql_literal(self, val: str) -> str:
         """
@@ -1397,26 +2690,40 @@ class PMNCompiler:
         """
         return str(val).replace("'", "''")
 
-    def _build_ogr2ogr_pmtiles_cmd(self, output_file: str, layer_name: str, 
-                                    schema: str, table: str, bpdas_column: str, 
-                                    bpdas_value: str) -> list:
+    def _build_ogr2ogr_pmtiles_cmd(self, output_file: str, layer_name: str,
+                                    source_query: str, bpdas_column: str,
+                                    bpdas_value: str, source_file: str = None,
+                                    bbox: tuple = None, columns: List[str] = None) -> list:
         """
         Build ogr2ogr command untuk generate PMTiles dengan filter BPDAS.
         
         Args:
             output_file: Path ke file output PMTiles
             layer_name: Nama layer dalam PMTiles
-            schema: Schema database (pmn)
-            table: Nama tabel (existing_{year} atau potensi_{year})
+            source_query: Query sumber tema (_build_source_query, geometry sudah dikuantisasi),
+                dipakai jika source_file tidak ada
             bpdas_column: Nama kolom BPDAS
             bpdas_value: Nilai BPDAS untuk filter
+            source_file: FlatGeobuf lokal; jika diisi, data dibaca dari file ini
+                (bukan dari PostgreSQL)
+            bbox: (xmin, ymin, xmax, ymax) BPDAS, untuk memakai spatial index source_file
+            columns: Atribut yang ditulis ke PMTiles (profile tiles_bpdas); None = semua kolom
         """
-        # SQL query dengan filter BPDAS
         val_sql = self._escape_sql_literal(bpdas_value)
-        sql = f'SELECT * FROM {schema}.{table} WHERE "{bpdas_column}" = \'{val_sql}\''
         
-        # Connection string ke PostgreSQL
-        pg_conn = f"PG:host={DB_CONFIG['host']} port={DB_CONFIG['port']} dbname=postgres user={DB_CONFIG['user']} password={DB_CONFIG['password']}"
+        if source_file:
+            # Subset dari file lokal: bbox lewat spatial index, lalu filter atribut
+            source = [source_file, "-where", f'"{bpdas_column}" = \'{val_sql}\'']
+            if bbox:
+                source += ["-spat"] + [repr(float(v)) for v in bbox]
+            if columns is not None:
+                source += ["-select", ','.join(columns)]
+        else:
+            # SQL query dengan filter BPDAS ke PostgreSQL (read replica jika tersedia)
+            projection = ', '.join([f'"{col}"' for col in columns] + ['geometry']) if columns is not None else '*'
+            sql = f'SELECT {projection} FROM ({source_query}) AS src WHERE "{bpdas_column}" = \'{val_sql}\''
+            sql += _stable_order_by(columns or [])
+            source = [self._pg_connection_string(read_only=True), "-sql", sql]
         
         # Susun command ogr2ogr
         cmd = [
@@ -1426,28 +2733,35 @@ class PMNCompiler:
             "-f", "PMTiles",
             "-overwrite",
             output_file,
-            pg_conn,
-            "-sql", sql,
+            *source,
             "-nln", layer_name,
             "-nlt", "PROMOTE_TO_MULTI"
         ]
         return cmd
 
-    def step_9b_generate_pmtiles_per_bpdas(self) -> Dict[str, List[str]]:
+    def step_9b_generate_pmtiles_per_bpdas(self, intermediate_files: Dict[str, str] = None) -> Dict[str, List[str]]:
         """
         Step 9B: Generate PMTiles per BPDAS (92%)
         
         Menghasilkan file PMTiles terpisah untuk setiap BPDAS yang ada di data.
         Output di-upload ke S3 path: static/layer/{theme}/{year}/bpdas/{bpdas_slug}_{year}.pmtiles
         
+        Subset per BPDAS dibaca dari FlatGeobuf lokal (intermediate step 7, atau di-export
+        sekali per tema) dengan filter bbox + atribut, bukan satu query per BPDAS ke database.
+        
+        Args:
+            intermediate_files: Output step 7 (dipakai langsung jika berformat FlatGeobuf)
+        
         Returns:
             Dict dengan key 'existing' dan 'potensi', masing-masing berisi list URL PMTiles
         """
+        from botocore.exceptions import ClientError
+
         logger.info("Step 9B: Generating PMTiles per BPDAS...")
         logger.info("=" * 60)
         
         try:
-            conn = self._get_db_connection()
+            conn = self._get_db_connection(read_only=True, operation='export')
             cursor = conn.cursor()
             
             pmtiles_urls = {'existing': [], 'potensi': []}
@@ -1460,15 +2774,40 @@ class PMNCompiler:
             for theme in ['existing', 'potensi']:
                 table_name = f'{theme}_{self.year}'
                 
-                # Get distinct BPDAS values dari tabel
+                # Data dan konfigurasi tidak berubah: publish PMTiles per BPDAS dari cache
+                theme_artifacts_start = len(self._artifacts)
+                fingerprint = self._artifact_fingerprint(theme, 'bpdas')
+                cached = self._load_cached_artifacts(fingerprint)
+                cached_bpdas = set()
+                if cached is not None:
+                    for artifact in self._restore_cached_artifacts(cached['artifacts']):
+                        pmtiles_urls[theme].append(artifact['url'])
+                        self._artifacts.append(artifact)
+                        cached_bpdas.add(artifact['bpdas'])
+                        total_generated += 1
+                    logger.info(f"\n📦 {theme.upper()}: published {len(cached['artifacts'])} BPDAS PMTiles "
+                                f"from cache {fingerprint[:12]}")
+                    if not cached['pending']:
+                        continue
+                    # BPDAS yang gagal di run yang mengisi cache diproses ulang
+                    logger.info(f"Retrying {len(cached['pending'])} BPDAS not in cache: {cached['pending']}")
+                
+                # Get distinct BPDAS values beserta bbox-nya dari tabel
                 cursor.execute(f"""
-                    SELECT DISTINCT bpdas 
-                    FROM pmn.{table_name} 
-                    WHERE bpdas IS NOT NULL AND bpdas != ''
+                    SELECT bpdas, ST_XMin(extent), ST_YMin(extent), ST_XMax(extent), ST_YMax(extent), features
+                    FROM (
+                        SELECT bpdas, ST_Extent(geometry) AS extent, COUNT(*) AS features
+                        FROM pmn.{table_name}
+                        WHERE bpdas IS NOT NULL AND bpdas != ''
+                        GROUP BY bpdas
+                    ) AS bpdas_extent
                     ORDER BY bpdas
                 """)
                 
-                bpdas_list = [row[0] for row in cursor.fetchall()]
+                rows = cursor.fetchall()
+                bpdas_bboxes = {row[0]: row[1:5] if row[1] is not None else None for row in rows}
+                bpdas_features = {row[0]: row[5] for row in rows}
+                bpdas_list = [bpdas for bpdas in bpdas_bboxes if bpdas not in cached_bpdas]
                 
                 if not bpdas_list:
                     logger.warning(f"No BPDAS found in pmn.{table_name}")
@@ -1476,10 +2815,32 @@ class PMNCompiler:
                 
                 logger.info(f"\n📊 {theme.upper()}: Found {len(bpdas_list)} unique BPDAS")
                 
+                # Atribut PMTiles per BPDAS (profile tiles_bpdas)
+                tile_columns = _profile_columns(
+                    [column['name'] for column in self._get_table_schema(conn, theme) if column['name'] != 'geometry'],
+                    'tiles_bpdas')
+                # Fallback per BPDAS ke PostgreSQL: kolom dan kuantisasi sama dengan export FlatGeobuf
+                source_query = self._build_source_query(conn, theme, profiles=('tiles_bpdas',),
+                                                        extra_columns=('bpdas',))
+                
+                # Sumber lokal ber-spatial index untuk semua BPDAS tema ini; untuk sisa BPDAS
+                # dari cache, query langsung per BPDAS lebih murah daripada export satu tema
+                source_file = (intermediate_files or {}).get(theme)
+                if source_file and not source_file.endswith('.fgb'):
+                    source_file = None
+                if not source_file and not cached_bpdas:
+                    source_file = os.path.join(pmtiles_local_dir, f'{table_name}.fgb')
+                    try:
+                        # Hanya kolom tiles_bpdas, plus bpdas untuk filter -where
+                        self._export_flatgeobuf(theme, source_file, profiles=('tiles_bpdas',), extra_columns=('bpdas',))
+                        logger.info(f"Exported {table_name} to FlatGeobuf: {os.path.getsize(source_file):,} bytes")
+                    except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+                        logger.warning(f"FlatGeobuf export failed, querying database per BPDAS: {e}")
+                        source_file = None
+                
                 for idx, bpdas_name in enumerate(bpdas_list, start=1):
-                    # Gunakan BPDAS_SLUG_MAP jika tersedia, fallback ke slugify
-                    bpdas_key = bpdas_name.lower().replace(' ', '').replace('_', '').replace('-', '')
-                    bpdas_slug = BPDAS_SLUG_MAP.get(bpdas_key, self._slugify(bpdas_name))
+                    # Slug dari BPDAS registry (BPDAS_SLUG_MAP), fallback ke slugify
+                    bpdas_slug = self.bpdas_registry.get_slug(bpdas_name)
                     
                     layer_name = f"{theme}_{bpdas_slug}_{self.year}"
                     local_file = os.path.join(pmtiles_local_dir, f"{bpdas_slug}_{self.year}.pmtiles")
@@ -1489,17 +2850,34 @@ class PMNCompiler:
                     logger.info(f"  [{idx}/{len(bpdas_list)}] Processing: {bpdas_name} -> {bpdas_slug}")
                     
                     try:
+                        # Output langsung ke S3 (/vsis3/) atau ke file lokal lalu di-upload
+                        output_file = f"/vsis3/{S3_CONFIG['bucket']}/{s3_path}" if PUBLISH_CONFIG['gdal_vsis3'] else local_file
+                        
                         # Build dan jalankan ogr2ogr command
                         cmd = self._build_ogr2ogr_pmtiles_cmd(
-                            output_file=local_file,
+                            output_file=output_file,
                             layer_name=layer_name,
-                            schema='pmn',
-                            table=table_name,
+                            source_query=source_query,
                             bpdas_column='bpdas',
-                            bpdas_value=bpdas_name
+                            bpdas_value=bpdas_name,
+                            source_file=source_file,
+                            bbox=bpdas_bboxes[bpdas_name],
+                            columns=tile_columns
                         )
                         
-                        result = subprocess.run(cmd, capture_output=True, text=True)
+                        # ogr2ogr -progress menulis progres ke stdout; BPDAS yang hang di-skip
+                        if PUBLISH_CONFIG['gdal_vsis3']:
+                            result = self._run_with_watchdog(
+                                cmd,
+                                timeout=TIMEOUT_CONFIG['subprocess_seconds']['ogr2ogr_bpdas'],
+                                env=self._gdal_s3_env()
+                            )
+                        else:
+                            result = self._run_with_watchdog(
+                                cmd,
+                                timeout=TIMEOUT_CONFIG['subprocess_seconds']['ogr2ogr_bpdas'],
+                                progress_path=local_file
+                            )
                         
                         if result.returncode != 0:
                             logger.error(f"    ❌ ogr2ogr failed: {result.stderr}")
@@ -1507,49 +2885,71 @@ class PMNCompiler:
                             continue
                         
                         # Check if file was created and has content
-                        if not os.path.exists(local_file) or os.path.getsize(local_file) == 0:
+                        if PUBLISH_CONFIG['gdal_vsis3']:
+                            try:
+                                file_size = self.s3_client.head_object(Bucket=S3_CONFIG['bucket'], Key=s3_path)['ContentLength']
+                            except ClientError:
+                                file_size = 0
+                        else:
+                            file_size = os.path.getsize(local_file) if os.path.exists(local_file) else 0
+                        
+                        if file_size == 0:
                             logger.warning(f"    ⚠️  PMTiles file empty or not created")
                             total_failed += 1
                             continue
                         
-                        # Upload ke S3 - dengan ekstensi .pmtiles
-                        self.s3_client.upload_file(
-                            local_file,
-                            S3_CONFIG['bucket'],
-                            s3_path
-                        )
+                        artifact_details = {'kind': 'pmtiles_bpdas', 'theme': theme, 'year': self.year,
+                                            'bpdas': bpdas_name, 'features': bpdas_features[bpdas_name]}
+                        if PUBLISH_CONFIG['gdal_vsis3']:
+                            # Ditulis GDAL langsung ke S3: checksum tidak tersedia tanpa membaca ulang
+                            artifact = {'key': s3_path, 'url': f"{S3_CONFIG['public_host']}/{s3_path}",
+                                        'size': file_size, 'md5': None, 'sha256': None, **artifact_details}
+                        else:
+                            # Upload ke S3 - dengan ekstensi .pmtiles, checksum dihitung sambil upload;
+                            # local file dihapus setelahnya to save space
+                            artifact = self._publish_file(local_file, s3_path, **artifact_details)
+                        self._artifacts.append(artifact)
                         
-                        # Upload ke S3 - tanpa ekstensi (untuk geoportal compatibility)
+                        # Salinan tanpa ekstensi (untuk geoportal compatibility), server-side copy
                         s3_path_no_ext = s3_path.replace('.pmtiles', '')
-                        self.s3_client.upload_file(
-                            local_file,
-                            S3_CONFIG['bucket'],
-                            s3_path_no_ext
-                        )
+                        self._copy_s3_object(s3_path, s3_path_no_ext)
                         
                         pmtiles_url = f"{S3_CONFIG['public_host']}/{s3_path}"
                         pmtiles_urls[theme].append(pmtiles_url)
                         
-                        file_size_mb = os.path.getsize(local_file) / (1024 * 1024)
-                        logger.info(f"    ✅ Uploaded: {s3_path} ({file_size_mb:.2f} MB)")
-                        logger.info(f"    ✅ Uploaded: {s3_path_no_ext} (no ext)")
+                        file_size_mb = file_size / (1024 * 1024)
+                        logger.info(f"    ✅ Published: {s3_path} ({file_size_mb:.2f} MB)")
+                        logger.info(f"    ✅ Copied: {s3_path_no_ext} (no ext)")
                         total_generated += 1
                         
-                        # Cleanup local file to save space
-                        os.remove(local_file)
-                        
                     except FileNotFoundError:
                         logger.error("    ❌ ogr2ogr not found! Please install GDAL with PMTiles driver.")
                         total_failed += 1
                     except subprocess.CalledProcessError as e:
                         logger.error(f"    ❌ Failed: {e}")
                         total_failed += 1
+                    except subprocess.TimeoutExpired as e:
+                        logger.error(f"    ❌ Skipped, ogr2ogr timed out or stalled: {e}")
+                        if os.path.exists(local_file):
+                            os.remove(local_file)
+                        total_failed += 1
                     except ClientError as e:
                         logger.error(f"    ❌ S3 upload failed: {e}")
                         total_failed += 1
                     except Exception as e:
                         logger.error(f"    ❌ Unexpected error: {e}")
                         total_failed += 1
+                
+                # Hapus FlatGeobuf yang dibuat khusus untuk step ini
+                if source_file and source_file.startswith(pmtiles_local_dir) and os.path.exists(source_file):
+                    os.remove(source_file)
+                
+                # BPDAS yang berhasil masuk cache; yang gagal dicatat pending dan diproses ulang
+                # run berikutnya, tanpa membuat ulang BPDAS lain
+                theme_artifacts = self._artifacts[theme_artifacts_start:]
+                published = {artifact['bpdas'] for artifact in theme_artifacts}
+                pending = [bpdas for bpdas in bpdas_list if bpdas not in published]
+                self._store_cached_artifacts(fingerprint, theme_artifacts, pending=pending)
             
             cursor.close()
             conn.close()
@@ -1677,7 +3077,7 @@ class PMNCompiler:
             logger.error(traceback.format_exc())
             raise
 
-    def step_10_update_metadata(self, converted_files: Dict[str, Dict[str, str]], pmtiles_urls: Dict[str, str]):
+    def step_10_update_metadata(self, converted_files: Dict[str, Dict[str, Dict[str, Any]]], pmtiles_urls: Dict[str, str]):
         """Step 10: Update Metadata (95%)"""
         logger.info("Step 10: Updating metadata...")
         
@@ -1690,44 +3090,26 @@ class PMNCompiler:
                 cursor.execute(f"SELECT COUNT(*) FROM pmn.{theme}_{self.year}")
                 row_count = cursor.fetchone()[0]
                 
-                # Calculate MD5 hash of GDB file
-                gdb_file = converted_files[theme]['gdb_zip']
-                with open(gdb_file, 'rb') as f:
-                    md5_hash = hashlib.md5(f.read()).hexdigest()
-                
-                # Get file size
-                file_size = os.path.getsize(gdb_file)
-                
-                # Upload files to S3
-                gdb_s3_path = f"{S3_CONFIG['s3_prefix']}/pmn-result/{self.year}/AR_25K_PETAMANGROVE_{theme.upper()}_{self.year}.gdb.zip"
-                shp_s3_path = f"{S3_CONFIG['s3_prefix']}/pmn-result/{self.year}/AR_25K_PETAMANGROVE_{theme.upper()}_{self.year}.zip"
-                
-                self.s3_client.upload_file(
-                    converted_files[theme]['gdb_zip'],
-                    S3_CONFIG['bucket'],
-                    gdb_s3_path
-                )
-                
-                self.s3_client.upload_file(
-                    converted_files[theme]['shp_zip'],
-                    S3_CONFIG['bucket'],
-                    shp_s3_path
-                )
-                
-                # Construct URLs
-                gdb_url = f"{S3_CONFIG['public_host']}/{gdb_s3_path}"
-                shp_url = f"{S3_CONFIG['public_host']}/{shp_s3_path}"
-                
-                # Update metadata
+                # MD5, ukuran, dan URL GDB/Shapefile zip sudah dihitung saat di-stream ke S3 (step 8);
+                # SHA-256 dan detail lain ada di manifest run
+                gdb_artifact = converted_files[theme]['gdb_zip']
+                md5_hash = gdb_artifact['md5']
+                file_size = gdb_artifact['size']
+                gdb_url = gdb_artifact['url']
+                shp_url = converted_files[theme]['shp_zip']['url']
+
+
+                # Update metadata; date_created hanya berubah jika isi GDB zip (MD5) berubah
                 title = f"Peta {'Eksisting' if theme == 'existing' else 'Potensi'} Mangrove {self.year}"
                 
                 cursor.execute("""
                     UPDATE pmn.compiler_datasets 
-                    SET rows = %s, md5 = %s, date_created = %s, size = %s,
-                        gdb_url = %s, shp_url = %s, map_url = %s, process = %s
+                    SET rows = %s, md5 = %s,
+                        date_created = CASE WHEN md5 IS NOT DISTINCT FROM %s THEN date_created ELSE %s END,
+                        size = %s, gdb_url = %s, shp_url = %s, map_url = %s, process = %s
                     WHERE title = %s
                 """, (
-                    row_count, md5_hash, datetime.now(), file_size,
+                    row_count, md5_hash, md5_hash, datetime.now(), file_size,
                     gdb_url, shp_url, pmtiles_urls[theme], False, title
                 ))
                 
@@ -1737,6 +3119,8 @@ class PMNCompiler:
             cursor.close()
             conn.close()
             
+            self._write_manifest(self.year, self._artifacts)
+            
             self._update_progress(95)
             logger.info("Step 10 completed: Metadata updated")
             
@@ -1768,175 +3152,99 @@ class PMNCompiler:
 
     def _check_file_exists_in_s3(self, object_path: str) -> bool:
         """Check if file exists in S3"""
-        try:
-            self.s3_client.head_object(Bucket=S3_CONFIG['bucket'], Key=object_path)
-            return True
-        except ClientError:
-            return False
+        return _s3_object_exists(self.s3_client, object_path)
 
     def _check_year_files_exist(self, year: int) -> Dict[str, bool]:
         """Check which files exist for a specific year"""
-        files_status = {}
-        
-        # Check PMTiles
-        pmtiles_existing = f"{S3_CONFIG['s3_prefix']}/layers/EXISTING{year}.pmtiles"
-        pmtiles_potensi = f"{S3_CONFIG['s3_prefix']}/layers/POTENSI{year}.pmtiles"
-        files_status['pmtiles_existing'] = self._check_file_exists_in_s3(pmtiles_existing)
-        files_status['pmtiles_potensi'] = self._check_file_exists_in_s3(pmtiles_potensi)
-        
-        # Check Shapefile
-        shp_existing = f"{S3_CONFIG['s3_prefix']}/pmn-result/{year}/AR_25K_PETAMANGROVE_EXISTING_{year}.zip"
-        shp_potensi = f"{S3_CONFIG['s3_prefix']}/pmn-result/{year}/AR_25K_PETAMANGROVE_POTENSI_{year}.zip"
-        files_status['shp_existing'] = self._check_file_exists_in_s3(shp_existing)
-        files_status['shp_potensi'] = self._check_file_exists_in_s3(shp_potensi)
-        
-        # Check GDB
-        gdb_existing = f"{S3_CONFIG['s3_prefix']}/pmn-result/{year}/AR_25K_PETAMANGROVE_EXISTING_{year}.gdb.zip"
-        gdb_potensi = f"{S3_CONFIG['s3_prefix']}/pmn-result/{year}/AR_25K_PETAMANGROVE_POTENSI_{year}.gdb.zip"
-        files_status['gdb_existing'] = self._check_file_exists_in_s3(gdb_existing)
-        files_status['gdb_potensi'] = self._check_file_exists_in_s3(gdb_potensi)
-        
-        return files_status
+        return _check_year_files_in_s3(self.s3_client, year)
 
     def _validate_geojson_file(self, geojson_file: str) -> bool:
-        """Validate if a GeoJSON file is valid and contains features"""
+        """
+        Validate if a GeoJSON file is valid and contains features.
+        Dibaca secara streaming (geojson_stream): hanya struktur dan N feature pertama yang diperiksa.
+        """
         try:
-            import json
-            with open(geojson_file, 'r') as f:
-                data = json.load(f)
-            
-            if data.get('type') != 'FeatureCollection':
-                logger.warning(f"GeoJSON file is not a FeatureCollection")
-                return False
-            
-            features = data.get('features', [])
-            if not features or len(features) == 0:
-                logger.warning(f"GeoJSON file contains no features")
-                return False
-            
-            logger.info(f"GeoJSON validation passed: {len(features)} features found")
+            info = validate_feature_collection(geojson_file)
+            logger.info(f"GeoJSON validation passed: {describe_feature_count(info)} found")
             return True
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"GeoJSON file contains invalid JSON: {e}")
+        
+        except GeoJSONStreamError as e:
+            logger.warning(f"GeoJSON file is not valid: {e}")
             return False
         except Exception as e:
             logger.error(f"Error validating GeoJSON file: {e}")
             return False
 
-    def _validate_shapefile(self, shp_zip: str) -> bool:
-        """Validate if a Shapefile ZIP contains valid data"""
+    def _validate_shapefile(self, shp_files: List[str], expected_features: int = None) -> bool:
+        """
+        Validasi Shapefile lokal (semua part) sebelum di-zip dan di-stream ke S3: file wajib
+        lengkap, jumlah feature sama dengan expected_features, dan feature pertama/terakhir
+        tiap part bisa dibaca ulang (geometry + atribut DBF)
+        """
         try:
-            import zipfile
-            import tempfile
+            feature_count = 0
+            for shp_file in shp_files:
+                # File wajib tiap part
+                missing = [ext for ext in ['.shp', '.shx', '.dbf']
+                           if not os.path.exists(shp_file.replace('.shp', ext))]
+                if missing:
+                    logger.warning(f"Shapefile {os.path.basename(shp_file)} missing required files: {missing}")
+                    return False
+                
+                part_features = _count_vector_features(shp_file)
+                if part_features and not _read_back_features(shp_file, part_features):
+                    logger.warning(f"Shapefile {os.path.basename(shp_file)} features could not be read back")
+                    return False
+                feature_count += part_features
             
-            # Check if ZIP file exists and has reasonable size
-            if not os.path.exists(shp_zip) or os.path.getsize(shp_zip) < 1000:  # At least 1KB
-                logger.warning(f"Shapefile ZIP is missing or too small: {shp_zip}")
+            if feature_count == 0:
+                logger.warning(f"Shapefile contains no features")
                 return False
             
-            # Check ZIP contents
-            with zipfile.ZipFile(shp_zip, 'r') as zip_ref:
-                files = zip_ref.namelist()
-                required_extensions = ['.shp', '.shx', '.dbf']
-                
-                has_required = all(any(f.endswith(ext) for f in files) for ext in required_extensions)
-                if not has_required:
-                    logger.warning(f"Shapefile ZIP missing required files (.shp, .shx, .dbf)")
-                    return False
+            if expected_features is not None and feature_count != expected_features:
+                logger.warning(f"Shapefile has {feature_count} features, expected {expected_features}")
+                return False
             
-            # Try to read with geopandas
-            import geopandas as gpd
-            temp_dir = tempfile.mkdtemp()
-            try:
-                with zipfile.ZipFile(shp_zip, 'r') as zip_ref:
-                    zip_ref.extractall(temp_dir)
-                
-                shp_file = None
-                for file in os.listdir(temp_dir):
-                    if file.endswith('.shp'):
-                        shp_file = os.path.join(temp_dir, file)
-                        break
-                
-                if shp_file:
-                    gdf = gpd.read_file(shp_file)
-                    if len(gdf) == 0:
-                        logger.warning(f"Shapefile contains no features")
-                        return False
-                    logger.info(f"Shapefile validation passed: {len(gdf)} features")
-                    return True
-                else:
-                    logger.warning(f"No .shp file found in ZIP")
-                    return False
-                    
-            finally:
-                import shutil
-                shutil.rmtree(temp_dir, ignore_errors=True)
-                
+            logger.info(f"Shapefile validation passed: {feature_count} features in {len(shp_files)} part(s)")
+            return True
+
         except Exception as e:
             logger.error(f"Error validating Shapefile: {e}")
             return False
 
-    def _validate_gdb(self, gdb_zip: str) -> bool:
-        """Validate if a GDB ZIP contains valid data"""
+    def _validate_gdb(self, gdb_dir: str, expected_features: int = None) -> bool:
+        """
+        Validasi File Geodatabase lokal sebelum di-zip dan di-stream ke S3: layer ada, jumlah
+        feature sama dengan expected_features, dan feature pertama/terakhir bisa dibaca ulang
+        """
         try:
-            import zipfile
-            import tempfile
+            if not os.path.isdir(gdb_dir):
+                logger.warning(f"GDB directory is missing: {gdb_dir}")
+                return False
             
-            # Check if ZIP file exists and has reasonable size
-            if not os.path.exists(gdb_zip) or os.path.getsize(gdb_zip) < 1000:  # At least 1KB
-                logger.warning(f"GDB ZIP is missing or too small: {gdb_zip}")
+            # List layers in GDB
+            layers = _list_vector_layers(gdb_dir)
+            if not layers:
+                logger.warning(f"GDB contains no layers")
                 return False
             
-            # Check ZIP contents for GDB structure
-            with zipfile.ZipFile(gdb_zip, 'r') as zip_ref:
-                files = zip_ref.namelist()
-                
-                # Look for GDB files
-                has_gdb_files = any(f.endswith('.gdb/') or '.gdb/' in f for f in files)
-                if not has_gdb_files:
-                    logger.warning(f"GDB ZIP does not contain .gdb structure")
-                    return False
+            # Feature count of first layer to validate
+            feature_count = _count_vector_features(gdb_dir, layer=layers[0])
+            if feature_count == 0:
+                logger.warning(f"GDB layer contains no features")
+                return False
             
-            # Try to read with geopandas
-            import geopandas as gpd
-            temp_dir = tempfile.mkdtemp()
-            try:
-                with zipfile.ZipFile(gdb_zip, 'r') as zip_ref:
-                    zip_ref.extractall(temp_dir)
-                
-                # Find GDB directory
-                gdb_dir = None
-                for item in os.listdir(temp_dir):
-                    item_path = os.path.join(temp_dir, item)
-                    if os.path.isdir(item_path) and item.endswith('.gdb'):
-                        gdb_dir = item_path
-                        break
-                
-                if gdb_dir:
-                    # List layers in GDB
-                    import fiona
-                    layers = fiona.listlayers(gdb_dir)
-                    if not layers:
-                        logger.warning(f"GDB contains no layers")
-                        return False
-                    
-                    # Read first layer to validate
-                    gdf = gpd.read_file(gdb_dir, layer=layers[0])
-                    if len(gdf) == 0:
-                        logger.warning(f"GDB layer contains no features")
-                        return False
-                    
-                    logger.info(f"GDB validation passed: {len(layers)} layers, {len(gdf)} features in first layer")
-                    return True
-                else:
-                    logger.warning(f"No .gdb directory found in ZIP")
-                    return False
-                    
-            finally:
-                import shutil
-                shutil.rmtree(temp_dir, ignore_errors=True)
-                
+            if expected_features is not None and feature_count != expected_features:
+                logger.warning(f"GDB has {feature_count} features, expected {expected_features}")
+                return False
+            
+            if not _read_back_features(gdb_dir, feature_count, layer=layers[0]):
+                logger.warning(f"GDB features could not be read back")
+                return False
+            
+            logger.info(f"GDB validation passed: {len(layers)} layers, {feature_count} features in first layer")
+            return True
+
         except Exception as e:
             logger.error(f"Error validating GDB: {e}")
             return False
@@ -1962,6 +3270,7 @@ class PMNCompiler:
         temp_pmtiles_dir = os.path.join(self.temp_dir, f'pmtiles_{year}')
         os.makedirs(temp_pmtiles_dir, exist_ok=True)
         
+        artifacts = []
         try:
             # Prepare download list
             pmtiles_to_process = []
@@ -2051,33 +3360,31 @@ class PMNCompiler:
                             logger.info(f"PMTiles metadata retrieved successfully")
                             
                             # Try to extract tiles at zoom level 0 (lowest zoom with all data)
-                            result = subprocess.run([
-                                'tippecanoe-decode', '-z', '0', pmtiles_file
-                            ], capture_output=True, text=True, timeout=300)
+                            # Output langsung ditulis ke file, tidak ditampung di memori
+                            with open(geojson_file, 'w') as f:
+                                result = subprocess.run([
+                                    'tippecanoe-decode', '-z', '0', pmtiles_file
+                                ], stdout=f, stderr=subprocess.PIPE, text=True, timeout=300)
                             
                             # Check if we got valid GeoJSON output
-                            if result.stdout and len(result.stdout) > 100:
-                                # Validate the output is proper GeoJSON
+                            if os.path.getsize(geojson_file) > 100:
+                                # Validate the output is proper GeoJSON (streaming, N feature pertama)
                                 try:
-                                    import json
-                                    json_data = json.loads(result.stdout)
-                                    if json_data.get('type') == 'FeatureCollection':
-                                        with open(geojson_file, 'w') as f:
-                                            f.write(result.stdout)
-                                        
-                                        if os.path.exists(geojson_file) and os.path.getsize(geojson_file) > 0:
-                                            logger.info(f"✅ tippecanoe-decode tile extraction successful (exit code: {result.returncode})")
-                                            if result.returncode != 0:
-                                                logger.warning(f"tippecanoe-decode warnings: {result.stderr}")
-                                            conversion_success = True
-                                        else:
-                                            logger.error(f"tippecanoe-decode produced empty file")
+                                    info = inspect_feature_collection(geojson_file)
+                                    if info['type'] == 'FeatureCollection':
+                                        logger.info(f"✅ tippecanoe-decode tile extraction successful (exit code: {result.returncode})")
+                                        if result.returncode != 0:
+                                            logger.warning(f"tippecanoe-decode warnings: {result.stderr}")
+                                        conversion_success = True
                                     else:
                                         logger.error(f"tippecanoe-decode output is not valid GeoJSON FeatureCollection")
-                                except json.JSONDecodeError as e:
+                                except GeoJSONStreamError as e:
                                     logger.error(f"tippecanoe-decode output is not valid JSON: {e}")
                             else:
                                 logger.error(f"tippecanoe-decode produced no usable output")
+                            
+                            if not conversion_success and os.path.exists(geojson_file):
+                                os.remove(geojson_file)
                         else:
                             logger.warning(f"Failed to get PMTiles metadata: {metadata_result.stderr}")
                             
@@ -2119,17 +3426,18 @@ class PMNCompiler:
                                 "data"
                             ]
                         
-                        result = None
                         successful_layer = None
                         
                         for layer_name in layer_names:
                             try:
                                 logger.debug(f"Trying layer name: {layer_name}")
-                                result = subprocess.run([
-                                    'tippecanoe-decode', '-l', layer_name, pmtiles_file
-                                ], capture_output=True, text=True, timeout=60)
+                                # Output langsung ditulis ke file, tidak ditampung di memori
+                                with open(geojson_file, 'w') as f:
+                                    subprocess.run([
+                                        'tippecanoe-decode', '-l', layer_name, pmtiles_file
+                                    ], stdout=f, stderr=subprocess.PIPE, text=True, timeout=60)
                                 
-                                if result.stdout and len(result.stdout) > 100:
+                                if os.path.getsize(geojson_file) > 100:
                                     successful_layer = layer_name
                                     break
                             except Exception as e:
@@ -2138,39 +3446,30 @@ class PMNCompiler:
                         
                         if successful_layer:
                             logger.info(f"Found working layer name: {successful_layer}")
-                        
-                        if result.stdout and len(result.stdout) > 100:
                             try:
-                                import json
-                                json_data = json.loads(result.stdout)
-                                if json_data.get('type') == 'FeatureCollection':
-                                    features = json_data.get('features', [])
-                                    logger.info(f"tippecanoe-decode layer extraction found {len(features)} features")
+                                # Streaming: hanya struktur dan 10 feature pertama yang diperiksa
+                                info = inspect_feature_collection(geojson_file, sample_features=10)
+                                if info['type'] == 'FeatureCollection':
+                                    logger.info(f"tippecanoe-decode layer extraction found {describe_feature_count(info)}")
                                     
                                     # Check if features have valid geometries
-                                    valid_features = 0
-                                    for feature in features[:10]:  # Check first 10 features
-                                        geom = feature.get('geometry')
-                                        if geom and geom.get('type') and geom.get('coordinates'):
-                                            valid_features += 1
+                                    valid_features = info['valid_geometries']
+                                    logger.info(f"Sample check: {valid_features}/{info['sampled']} features have valid geometries")
                                     
-                                    logger.info(f"Sample check: {valid_features}/10 features have valid geometries")
-                                    
-                                    if len(features) > 0 and valid_features > 0:
-                                        with open(geojson_file, 'w') as f:
-                                            f.write(result.stdout)
-                                        
-                                        if os.path.exists(geojson_file) and os.path.getsize(geojson_file) > 0:
-                                            logger.info(f"✅ tippecanoe-decode layer extraction successful")
-                                            conversion_success = True
+                                    if info['features'] > 0 and valid_features > 0:
+                                        logger.info(f"✅ tippecanoe-decode layer extraction successful")
+                                        conversion_success = True
                                     else:
-                                        logger.error(f"Layer extraction produced {len(features)} features but no valid geometries")
+                                        logger.error(f"Layer extraction produced {info['features']} features but no valid geometries")
                                 else:
                                     logger.error(f"Layer extraction output is not valid GeoJSON FeatureCollection")
-                            except json.JSONDecodeError:
+                            except GeoJSONStreamError:
                                 logger.error(f"Layer extraction output is not valid JSON")
                         else:
                             logger.warning(f"Layer extraction produced no output")
+                        
+                        if not conversion_success and os.path.exists(geojson_file):
+                            os.remove(geojson_file)
                             
                     except Exception as e:
                         logger.error(f"tippecanoe-decode layer extraction error: {e}")
@@ -2288,46 +3587,41 @@ class PMNCompiler:
                             stats_lines = result.stdout.strip().split('\n')
                             logger.info(f"PMTiles stats: {stats_lines[:3]}...")  # Show first few lines
                             
-                            # Try extracting with no layer filter
-                            result = subprocess.run([
-                                'tippecanoe-decode', '--no-feature-limit', pmtiles_file
-                            ], capture_output=True, text=True, timeout=300)
+                            # Try extracting with no layer filter, output langsung ke file
+                            raw_file = f"{geojson_file}.decode"
+                            with open(raw_file, 'w') as f:
+                                subprocess.run([
+                                    'tippecanoe-decode', '--no-feature-limit', pmtiles_file
+                                ], stdout=f, stderr=subprocess.PIPE, text=True, timeout=300)
                             
-                            if result.stdout and len(result.stdout) > 100:
-                                # Check if output contains valid features
-                                if '"type":"Feature"' in result.stdout or '"type": "Feature"' in result.stdout:
-                                    # Try to extract just the features part
-                                    lines = result.stdout.split('\n')
-                                    geojson_lines = []
-                                    in_features = False
-                                    
-                                    for line in lines:
+                            if os.path.getsize(raw_file) > 100:
+                                # Try to extract just the features part, baris per baris
+                                has_features = False
+                                in_features = False
+                                with open(raw_file, 'r') as src, open(geojson_file, 'w') as dst:
+                                    for line in src:
                                         if '"type": "Feature"' in line or '"type":"Feature"' in line:
-                                            if not geojson_lines:
-                                                geojson_lines.append('{"type": "FeatureCollection", "features": [')
-                                            else:
-                                                geojson_lines.append(',')
-                                            geojson_lines.append(line.strip())
+                                            dst.write('\n,' if has_features else '{"type": "FeatureCollection", "features": [\n')
+                                            dst.write(line.strip())
+                                            has_features = True
                                             in_features = True
                                         elif in_features and (line.strip().startswith('{') or line.strip().startswith('"')):
-                                            geojson_lines.append(line.strip())
-                                    
-                                    if geojson_lines:
-                                        geojson_lines.append(']}')
-                                        geojson_content = '\n'.join(geojson_lines)
-                                        
-                                        try:
-                                            import json
-                                            json.loads(geojson_content)  # Validate JSON
-                                            
-                                            with open(geojson_file, 'w') as f:
-                                                f.write(geojson_content)
-                                            
-                                            if os.path.exists(geojson_file) and os.path.getsize(geojson_file) > 0:
-                                                logger.info(f"✅ Tile-proxy method successful")
-                                                conversion_success = True
-                                        except json.JSONDecodeError:
-                                            logger.warning(f"Could not create valid GeoJSON from tile-proxy method")
+                                            dst.write('\n' + line.strip())
+                                    if has_features:
+                                        dst.write('\n]}')
+                                
+                                if has_features:
+                                    try:
+                                        validate_feature_collection(geojson_file)  # Validate JSON (streaming)
+                                        logger.info(f"✅ Tile-proxy method successful")
+                                        conversion_success = True
+                                    except GeoJSONStreamError:
+                                        logger.warning(f"Could not create valid GeoJSON from tile-proxy method")
+                                
+                                if not conversion_success and os.path.exists(geojson_file):
+                                    os.remove(geojson_file)
+                            
+                            os.remove(raw_file)
                         
                     except Exception as e:
                         logger.error(f"Tile-proxy method error: {e}")
@@ -2391,19 +3685,16 @@ class PMNCompiler:
                 
                 logger.info(f"✓ Successfully converted PMTiles to GeoJSON: {geojson_file} ({file_size:,} bytes)")
                 
-                # Validate GeoJSON structure
+                # Validate GeoJSON structure (streaming, tanpa memuat seluruh file)
                 try:
-                    import json
-                    with open(geojson_file, 'r') as f:
-                        geojson_data = json.load(f)
+                    info = inspect_feature_collection(geojson_file)
                     
-                    if geojson_data.get('type') != 'FeatureCollection':
+                    if info['type'] != 'FeatureCollection':
                         logger.warning(f"GeoJSON is not a FeatureCollection for {theme}")
                     else:
-                        features_count = len(geojson_data.get('features', []))
-                        logger.info(f"GeoJSON validation: {features_count} features for {theme}")
-                        
-                except json.JSONDecodeError as e:
+                        logger.info(f"GeoJSON validation: {describe_feature_count(info)} for {theme}")
+                
+                except GeoJSONStreamError as e:
                     logger.error(f"Invalid JSON produced for {theme}: {e}")
                     raise Exception(f"Invalid GeoJSON output produced for {theme}")
                 except Exception as e:
@@ -2412,8 +3703,11 @@ class PMNCompiler:
                 logger.info(f"✓ Converted PMTiles to GeoJSON: {geojson_file}")
                 
                 # Now convert GeoJSON to Shapefile and GDB
-                self._convert_geojson_to_formats(geojson_file, theme, year)
-                
+                artifacts.extend(self._convert_geojson_to_formats(geojson_file, theme, year))
+            
+            if artifacts:
+                self._write_manifest(year, artifacts)
+        
         except Exception as e:
             logger.error(f"Failed to convert PMTiles for year {year}: {e}")
             raise
@@ -2423,12 +3717,17 @@ class PMNCompiler:
                 import shutil
                 shutil.rmtree(temp_pmtiles_dir)
 
-    def _convert_geojson_to_formats(self, geojson_file: str, theme: str, year: int):
-        """Convert GeoJSON to Shapefile and GDB formats"""
+    def _convert_geojson_to_formats(self, geojson_file: str, theme: str, year: int) -> List[Dict[str, Any]]:
+        """Convert GeoJSON to Shapefile and GDB formats; return artifact Shapefile dan GDB zip"""
+        import geopandas as gpd
+        import pandas as pd
+        from shapely.geometry import MultiPolygon
+        from shapely.ops import unary_union, polygonize
+
         logger.info(f"Converting {theme} GeoJSON to Shapefile and GDB for year {year}")
         
         # Read GeoJSON
-        gdf = gpd.read_file(geojson_file)
+        gdf = _read_vector(geojson_file)
         logger.info(f"Read {theme} GeoJSON: {len(gdf)} features for year {year}")
         
         # Debug: Check overall geometry state
@@ -2606,134 +3905,25 @@ class PMNCompiler:
         os.makedirs(year_temp_dir, exist_ok=True)
         
         try:
-            # ========== CREATE SHAPEFILE ==========
-            # Prepare data for Shapefile (same logic as main process)
-            gdf_shp = gdf.copy()
-            
-            # Convert datetime columns to string
-            for col in gdf_shp.columns:
-                if col == 'geometry':
-                    continue
-                if pd.api.types.is_datetime64_any_dtype(gdf_shp[col]):
-                    gdf_shp[col] = gdf_shp[col].apply(
-                        lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(x) else ''
-                    )
-            
-            # Truncate column names for Shapefile
-            column_mapping = {}
-            used_names = set()
-            for col in gdf_shp.columns:
-                if col == 'geometry':
-                    continue
-                if len(col) > 10:
-                    base_name = col[:10]
-                    new_col = base_name
-                    counter = 1
-                    while new_col in used_names or new_col in gdf_shp.columns:
-                        new_col = col[:8] + f"{counter:02d}"
-                        counter += 1
-                        if counter > 99:
-                            new_col = col[:7] + f"{counter:03d}"
-                    column_mapping[col] = new_col
-                    used_names.add(new_col)
-                else:
-                    used_names.add(col)
-            
-            if column_mapping:
-                gdf_shp = gdf_shp.rename(columns=column_mapping)
-            
-            # Create Shapefile
-            shp_dir = os.path.join(year_temp_dir, f'{theme}_shp')
-            os.makedirs(shp_dir, exist_ok=True)
-            shp_file = os.path.join(shp_dir, f'AR_25K_PETAMANGROVE_{theme.upper()}_{year}.shp')
-            
-            gdf_shp.to_file(shp_file, driver='ESRI Shapefile', encoding='utf-8')
-            
-            # ZIP Shapefile
-            shp_zip = os.path.join(year_temp_dir, f'AR_25K_PETAMANGROVE_{theme.upper()}_{year}.zip')
-            with zipfile.ZipFile(shp_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                extensions = ['.shp', '.shx', '.dbf', '.prj', '.cpg']
-                for ext in extensions:
-                    file_path = shp_file.replace('.shp', ext)
-                    if os.path.exists(file_path):
-                        zipf.write(file_path, os.path.basename(file_path))
-            
-            # Validate and upload Shapefile to S3
-            shp_s3_path = f"{S3_CONFIG['s3_prefix']}/pmn-result/{year}/AR_25K_PETAMANGROVE_{theme.upper()}_{year}.zip"
-            
-            if self._validate_shapefile(shp_zip):
-                shp_size = os.path.getsize(shp_zip)
-                logger.info(f"✓ Shapefile validation passed: {shp_size:,} bytes")
-                
-                self.s3_client.upload_file(shp_zip, S3_CONFIG['bucket'], shp_s3_path)
-                logger.info(f"✓ Uploaded Shapefile: {shp_s3_path} ({shp_size:,} bytes)")
-            else:
-                raise Exception(f"Shapefile validation failed: {shp_zip}")
-            
-            # ========== CREATE GDB ==========
-            # Prepare data for GDB (remove FID columns)
-            gdf_gdb = gdf.copy()
-            fid_columns = [col for col in gdf_gdb.columns if col.lower() in ['ogc_fid', 'fid', 'id', 'objectid']]
-            if fid_columns:
-                gdf_gdb = gdf_gdb.drop(columns=fid_columns)
-            
-            # Convert datetime to string for temp Shapefile
-            for col in gdf_gdb.columns:
-                if col == 'geometry':
-                    continue
-                if pd.api.types.is_datetime64_any_dtype(gdf_gdb[col]):
-                    gdf_gdb[col] = gdf_gdb[col].apply(
-                        lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(x) else ''
-                    )
+            # ========== CREATE SHAPEFILE & GDB ==========
+            # Satu frame untuk kedua sink (same logic as main process). Dataset divalidasi
+            # (jumlah feature) sebelum ZIP-nya di-stream ke S3
+            artifacts = self._build_download_artifacts(gdf, theme, year, year_temp_dir)
+            shp_artifact = artifacts['shp_zip']
+            gdb_artifact = artifacts['gdb_zip']
             
-            gdf_gdb = gdf_gdb.reset_index(drop=True)
-            
-            # Create temp Shapefile for GDB conversion
-            temp_shp_dir = os.path.join(year_temp_dir, f'{theme}_temp_for_gdb')
-            os.makedirs(temp_shp_dir, exist_ok=True)
-            temp_shp = os.path.join(temp_shp_dir, f'{theme}_temp.shp')
-            
-            gdf_gdb.to_file(temp_shp, driver='ESRI Shapefile')
-            
-            # Convert to GDB
-            gdb_dir = os.path.join(year_temp_dir, f'AR_25K_PETAMANGROVE_{theme.upper()}_{year}.gdb')
-            result = subprocess.run([
-                'ogr2ogr',
-                '-f', 'OpenFileGDB',
-                '-dim', 'XY',
-                '-nln', f'PETAMANGROVE_{theme.upper()}_{year}',
-                gdb_dir,
-                temp_shp
-            ], check=True, capture_output=True, text=True)
-            
-            # ZIP GDB
-            gdb_zip = os.path.join(year_temp_dir, f'AR_25K_PETAMANGROVE_{theme.upper()}_{year}.gdb.zip')
-            with zipfile.ZipFile(gdb_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for root, dirs, files in os.walk(gdb_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, os.path.dirname(gdb_dir))
-                        zipf.write(file_path, arcname)
-            
-            # Validate and upload GDB to S3
-            gdb_s3_path = f"{S3_CONFIG['s3_prefix']}/pmn-result/{year}/AR_25K_PETAMANGROVE_{theme.upper()}_{year}.gdb.zip"
-            
-            if self._validate_gdb(gdb_zip):
-                gdb_size = os.path.getsize(gdb_zip)
-                logger.info(f"✓ GDB validation passed: {gdb_size:,} bytes")
-                
-                self.s3_client.upload_file(gdb_zip, S3_CONFIG['bucket'], gdb_s3_path)
-                logger.info(f"✓ Uploaded GDB: {gdb_s3_path} ({gdb_size:,} bytes)")
-            else:
-                raise Exception(f"GDB validation failed: {gdb_zip}")
+            logger.info(f"✓ Published Shapefile: {shp_artifact['key']} ({shp_artifact['size']:,} bytes)")
+            logger.info(f"✓ Published GDB: {gdb_artifact['key']} ({gdb_artifact['size']:,} bytes)")
             
             # Update metadata in compiler_datasets
             pmtiles_path = f"{S3_CONFIG['s3_prefix']}/layers/{theme.upper()}{year}.pmtiles"
             pmtiles_url = f"{S3_CONFIG['public_host']}/{pmtiles_path}"
-            self._update_historical_metadata(year, theme, shp_zip, gdb_zip, pmtiles_url)
+            self._update_historical_metadata(year, theme, shp_artifact, gdb_artifact, pmtiles_url)
             
             logger.info(f"✅ Successfully completed conversion and metadata update for {theme} {year}")
             
+            return [shp_artifact, gdb_artifact]
+
         except Exception as e:
             logger.error(f"Failed to convert {theme} for year {year}: {e}")
             raise
@@ -2743,50 +3933,25 @@ class PMNCompiler:
                 import shutil
                 shutil.rmtree(year_temp_dir)
     
-    def _update_historical_metadata(self, year: int, theme: str, shp_zip: str, gdb_zip: str, pmtiles_url: str):
-        """Update metadata in compiler_datasets for historical year"""
+    def _update_historical_metadata(self, year: int, theme: str, shp_artifact: Dict[str, Any],
+                                    gdb_artifact: Dict[str, Any], pmtiles_url: str):
+        """Update metadata in compiler_datasets for historical year (artifact dari _build_download_artifacts)"""
         try:
             logger.info(f"Updating metadata for {theme} {year}...")
             
             conn = self._get_db_connection()
             cursor = conn.cursor()
             
-            # Calculate MD5 hash of GDB file
-            with open(gdb_zip, 'rb') as f:
-                md5_hash = hashlib.md5(f.read()).hexdigest()
-            
-            # Get file size
-            file_size = os.path.getsize(gdb_zip)
+            # MD5 dan ukuran GDB zip dihitung saat di-stream ke S3
+            md5_hash = gdb_artifact['md5']
+            file_size = gdb_artifact['size']
             
-            # Construct URLs
-            gdb_s3_path = f"{S3_CONFIG['s3_prefix']}/pmn-result/{year}/AR_25K_PETAMANGROVE_{theme.upper()}_{year}.gdb.zip"
-            shp_s3_path = f"{S3_CONFIG['s3_prefix']}/pmn-result/{year}/AR_25K_PETAMANGROVE_{theme.upper()}_{year}.zip"
-            
-            gdb_url = f"{S3_CONFIG['public_host']}/{gdb_s3_path}"
-            shp_url = f"{S3_CONFIG['public_host']}/{shp_s3_path}"
-            
-            # Get row count from shapefile
-            try:
-                import tempfile
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    with zipfile.ZipFile(shp_zip, 'r') as zip_ref:
-                        zip_ref.extractall(temp_dir)
-                    
-                    shp_file = None
-                    for file in os.listdir(temp_dir):
-                        if file.endswith('.shp'):
-                            shp_file = os.path.join(temp_dir, file)
-                            break
-                    
-                    if shp_file:
-                        gdf = gpd.read_file(shp_file)
-                        row_count = len(gdf)
-                    else:
-                        row_count = 0
-            except Exception as e:
-                logger.warning(f"Could not get row count from shapefile: {e}")
-                row_count = 0
+            gdb_url = gdb_artifact['url']
+            shp_url = shp_artifact['url']
             
+            # Row count dari metadata Shapefile (dihitung sebelum di-zip)
+            row_count = shp_artifact['features']
+
             # Update or insert metadata
             title = f"Peta {'Eksisting' if theme == 'existing' else 'Potensi'} Mangrove {year}"
             
@@ -2795,14 +3960,15 @@ class PMNCompiler:
             existing_record = cursor.fetchone()
             
             if existing_record:
-                # Update existing record
+                # Update existing record (date_created tetap jika MD5 sama)
                 cursor.execute("""
                     UPDATE pmn.compiler_datasets 
-                    SET rows = %s, md5 = %s, date_created = %s, size = %s,
-                        gdb_url = %s, shp_url = %s, map_url = %s, process = %s
+                    SET rows = %s, md5 = %s,
+                        date_created = CASE WHEN md5 IS NOT DISTINCT FROM %s THEN date_created ELSE %s END,
+                        size = %s, gdb_url = %s, shp_url = %s, map_url = %s, process = %s
                     WHERE title = %s
                 """, (
-                    row_count, md5_hash, datetime.now(), file_size,
+                    row_count, md5_hash, md5_hash, datetime.now(), file_size,
                     gdb_url, shp_url, pmtiles_url, False, title
                 ))
                 logger.info(f"✓ Updated metadata for {theme} {year}: {row_count} rows, {file_size} bytes")
@@ -2888,20 +4054,24 @@ class PMNCompiler:
             # Step 1: Validate tables
             self.step_1_validate_tables()
             
+            # Sumber BPDAS tidak berubah sejak agregasi yang tercatat di cache: pmn.* masih berisi
+            # hasilnya, pembersihan dan agregasi ulang (step 2, 4) serta hash isi tabel dilewati
+            aggregation_cached = self._restore_aggregation()
+            
             # Step 2: Clean data
-            self.step_2_clean_data()
+            if not aggregation_cached:
+                self.step_2_clean_data()
             
-            # Step 3: Get BPDAS list
-            bpdas_list = ['agamkuantan', 'akemalamo', 'asahanbarumun', 
-            'barito', 'batanghari', 'baturusacerucuk', 'benainnoelmina', 
-            'bonelimboto', 'brantassampean', 'cimanukcitanduy', 'citarumciliwung', 
-            'dodokanmoyosari', 'indragirirokan', 'jeneberangsaddang', 'kahayan', 'kapuas', 
-            'karama', 'ketahun', 'konaweha', 'kruengaceh', 'mahakamberau', 'memberamo', 'musi', 
-            'paluposo', 'pemalijratun', 'remuransiki', 'seijangduriangkang', 'serayuopakprogo', 
-            'solo', 'tondano', 'undaanyar', 'waehapubatumerah', 'wampuseiular', 'wayseputihwaysekampung']
+            # Step 3: Get BPDAS list (hanya BPDAS yang lolos preflight)
+            bpdas_list = self.step_3_get_bpdas_list()
             
-            # Step 4: Aggregate data
-            self.step_4_aggregate_data(bpdas_list)
+            if not aggregation_cached:
+                # Step 4: Aggregate data
+                self.step_4_aggregate_data(bpdas_list)
+                
+                # Tunggu read replica mengejar hasil agregasi sebelum stage read-only
+                self._sync_read_replica()
+                self._store_aggregation(bpdas_list)
             
             # Step 5: Clean S3 files
             self.step_5_clean_s3_files()
@@ -2909,17 +4079,11 @@ class PMNCompiler:
             # Step 6: Delete old PMTiles
             self.step_6_delete_old_pmtiles()
             
-            # Step 7: Export to GeoJSON
-            geojson_files = self.step_7_export_geojson()
-            
-            # Step 8: Convert formats
-            converted_files = self.step_8_convert_formats(geojson_files)
-            
-            # Step 9: Generate PMTiles (Nasional)
-            pmtiles_urls = self.step_9_generate_pmtiles(geojson_files)
-            
+            # Step 7-9: Export, convert formats, generate PMTiles (Nasional) - paralel per tema
+            intermediate_files, converted_files, pmtiles_urls = self._run_theme_pipelines()
+
             # Step 9B: Generate PMTiles per BPDAS
-            pmtiles_bpdas_urls = self.step_9b_generate_pmtiles_per_bpdas()
+            pmtiles_bpdas_urls = self.step_9b_generate_pmtiles_per_bpdas(intermediate_files)
             
             # Step 9C: Register layers to geoportal.layers
             self.step_9c_register_geoportal_layers(pmtiles_urls, pmtiles_bpdas_urls)
@@ -2941,12 +4105,460 @@ class PMNCompiler:
             self._update_progress(0, 'FAILED')
             raise
 
+def _has_pyogrio() -> bool:
+    """True jika engine pyogrio dipakai dan terpasang"""
+    if IO_CONFIG['engine'] != 'pyogrio':
+        return False
+    try:
+        import pyogrio  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _read_vector(path: str, **kwargs):
+    """Baca file vektor ke GeoDataFrame dengan engine dari IO_CONFIG"""
+    import geopandas as gpd
+    
+    if _has_pyogrio():
+        return gpd.read_file(path, engine='pyogrio', use_arrow=IO_CONFIG['use_arrow'], **kwargs)
+    return gpd.read_file(path, **kwargs)
+
+
+def _read_back_features(path: str, feature_count: int, layer: str = None) -> bool:
+    """Baca ulang feature pertama dan terakhir dataset (geometry + atribut), tanpa membaca semuanya"""
+    kwargs = {'layer': layer} if layer else {}
+    first = _read_vector(path, rows=slice(0, 1), **kwargs)
+    last = _read_vector(path, rows=slice(feature_count - 1, feature_count), **kwargs)
+    return len(first) == 1 and len(last) == 1
+
+
+def _profile_columns(columns: List[str], *profiles: str) -> List[str]:
+    """
+    Kolom (urutan dari columns) yang dibutuhkan minimal satu profile di OUTPUT_COLUMN_PROFILES.
+    Tanpa profile, semua kolom dikembalikan.
+    """
+    if not profiles:
+        return list(columns)
+    
+    selected = set()
+    for name in profiles:
+        profile = OUTPUT_COLUMN_PROFILES[name]
+        if 'include' in profile:
+            selected.update(col for col in columns if col in profile['include'])
+        else:
+            selected.update(col for col in columns if col not in profile.get('exclude', []))
+    
+    return [col for col in columns if col in selected]
+
+
+def _tippecanoe_attribute_args(profile: str) -> List[str]:
+    """Argumen tippecanoe (-y / -x) untuk membatasi atribut sesuai profile output"""
+    spec = OUTPUT_COLUMN_PROFILES[profile]
+    if 'include' in spec:
+        return [arg for col in spec['include'] for arg in ('-y', col)]
+    return [arg for col in spec.get('exclude', []) for arg in ('-x', col)]
+
+
+def _stable_row_order(gdf) -> 'np.ndarray':
+    """Posisi baris GeoDataFrame dalam urutan stabil dari isinya (lihat _stable_order)"""
+    import shapely
+    
+    return _stable_order(shapely.to_wkb(gdf.geometry.to_numpy()), gdf.drop(columns=gdf.geometry.name))
+
+
+def _stable_order(geometry_wkb, attributes) -> 'np.ndarray':
+    """
+    Posisi baris diurutkan menurut hash WKB geometry, lalu hash atribut (DataFrame) sebagai
+    pemecah seri (geometry identik). Hash vectorized pandas (key tetap) sehingga urutan sama
+    antar run dan process tanpa sort di PostgreSQL.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    geometry_hash = pd.util.hash_array(geometry_wkb, categorize=False)
+    if len(attributes.columns):
+        attribute_hash = pd.util.hash_pandas_object(attributes, index=False).to_numpy()
+    else:
+        attribute_hash = np.zeros(len(geometry_hash), dtype='uint64')
+    return np.lexsort((attribute_hash, geometry_hash))
+
+
+def _stable_order_by(columns: List[str]) -> str:
+    """
+    Klausa ORDER BY SQL dengan urutan stabil dari isi baris (hash WKB geometry, lalu atribut),
+    atau '' jika build tidak reproducible
+    """
+    if not REPRODUCIBLE_CONFIG['enabled']:
+        return ''
+    keys = ['md5(ST_AsBinary(geometry))'] + [f'"{col}"' for col in columns if col != 'geometry']
+    return ' ORDER BY ' + ', '.join(keys)
+
+
+def _build_timestamp(year: int) -> Optional[datetime]:
+    """Timestamp tetap metadata artifact (member ZIP, header DBF), atau None jika build tidak reproducible"""
+    if not REPRODUCIBLE_CONFIG['enabled']:
+        return None
+    return REPRODUCIBLE_CONFIG['build_date'] or datetime(year, 1, 1)
+
+
+def _use_category(n_unique: int, n_rows: int) -> bool:
+    """True jika kolom teks sebaiknya disimpan sebagai category (lihat DTYPE_CONFIG)"""
+    return (n_unique <= DTYPE_CONFIG['category_max_unique'] and
+            n_unique <= n_rows * DTYPE_CONFIG['category_max_ratio'])
+
+
+def _optimize_string_dtypes(gdf):
+    """Ubah kolom teks object menjadi category atau string[pyarrow] sesuai kardinalitasnya"""
+    import pandas as pd
+    
+    for col in gdf.columns:
+        if col == gdf.geometry.name or gdf[col].dtype != 'object':
+            continue
+        if pd.api.types.infer_dtype(gdf[col], skipna=True) != 'string':
+            continue
+        
+        if _use_category(gdf[col].nunique(dropna=True), len(gdf)):
+            gdf[col] = gdf[col].astype('category')
+        else:
+            gdf[col] = gdf[col].astype('string[pyarrow]')
+    
+    return gdf
+
+
+def _fill_missing_strings(series):
+    """Isi nilai kosong kolom category / string dengan string kosong"""
+    import pandas as pd
+    
+    if isinstance(series.dtype, pd.CategoricalDtype) and '' not in series.cat.categories:
+        series = series.cat.add_categories([''])
+    return series.fillna('')
+
+
+def _coercion_plan(gdf, column_types: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Kelas tipe target tiap kolom atribut: 'datetime', 'date', 'integer', 'float', 'boolean'
+    atau 'text'. Diambil dari tipe kolom PostgreSQL (column_types: nama -> data_type) jika
+    diketahui, selain itu dari dtype pandas (mis. data historis hasil decode PMTiles).
+    """
+    import pandas as pd
+    
+    pg_classes = {
+        'timestamp without time zone': 'datetime',
+        'timestamp with time zone': 'datetime',
+        'date': 'date',
+        'smallint': 'integer',
+        'integer': 'integer',
+        'bigint': 'integer',
+        'real': 'float',
+        'double precision': 'float',
+        'numeric': 'float',
+        'boolean': 'boolean'
+    }
+    
+    plan = {}
+    for col in gdf.columns:
+        if col == gdf.geometry.name:
+            continue
+        
+        dtype = gdf[col].dtype
+        if column_types and col in column_types:
+            plan[col] = pg_classes.get(column_types[col], 'text')
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            plan[col] = 'datetime'
+        elif pd.api.types.is_bool_dtype(dtype):
+            plan[col] = 'boolean'
+        elif pd.api.types.is_integer_dtype(dtype):
+            plan[col] = 'integer'
+        elif pd.api.types.is_float_dtype(dtype):
+            plan[col] = 'float'
+        else:
+            plan[col] = 'text'
+    
+    return plan
+
+
+def _coerce_attribute_types(gdf, plan: Dict[str, str], datetime_format: Optional[str] = '%Y-%m-%d %H:%M:%S',
+                            fill_missing: bool = True):
+    """
+    Konversi kolom gdf sesuai plan (_coercion_plan) secara vectorized, kolom di-assign ulang.
+    Tanggal/waktu menjadi teks, atau tetap datetime64 jika datetime_format None. Kolom
+    integer menjadi integer nullable (Int32, atau Int64 jika nilainya melewati batas 32-bit),
+    termasuk yang terbaca sebagai float karena ada null; kolom float bertipe object di-parse
+    dengan pd.to_numeric.
+    
+    Args:
+        fill_missing: Null teks/tanggal diganti string kosong (Shapefile, DBF tidak punya null);
+            False untuk format yang mendukung null (GDB)
+    """
+    import numpy as np
+    import pandas as pd
+    
+    for col, kind in plan.items():
+        series = gdf[col]
+        
+        if kind in ('datetime', 'date'):
+            if not pd.api.types.is_datetime64_any_dtype(series.dtype):
+                series = pd.to_datetime(series, errors='coerce', format='mixed')
+            if datetime_format is None:
+                gdf[col] = series
+            else:
+                series = series.dt.strftime('%Y-%m-%d' if kind == 'date' else datetime_format)
+                gdf[col] = series.fillna('') if fill_missing else series
+        
+        elif kind == 'text':
+            if not isinstance(series.dtype, (pd.CategoricalDtype, pd.StringDtype)):
+                series = series.astype('string[pyarrow]')
+            gdf[col] = _fill_missing_strings(series) if fill_missing else series
+        
+        elif kind == 'integer':
+            if not pd.api.types.is_integer_dtype(series.dtype):
+                series = pd.to_numeric(series, errors='coerce')
+            values = series.dropna()
+            int32 = np.iinfo(np.int32)
+            fits_int32 = values.empty or (values.min() >= int32.min and values.max() <= int32.max)
+            gdf[col] = series.astype('Int32' if fits_int32 else 'Int64')
+        
+        elif kind == 'float' and series.dtype == 'object':
+            gdf[col] = pd.to_numeric(series, errors='coerce')
+    
+    return gdf
+
+
+def _shapefile_record_sizes(gdf):
+    """
+    Perkiraan ukuran record .shp (byte) per feature, dihitung vectorized dari jumlah titik
+    dan part (ring) tiap geometry, sesuai layout record Shapefile.
+    """
+    import numpy as np
+    import shapely
+    
+    geoms = gdf.geometry.to_numpy()
+    n_points = shapely.get_num_coordinates(geoms)
+    
+    # Polygon: satu part Shapefile per ring; geometry lain: satu part per komponen
+    parts, index = shapely.get_parts(geoms, return_index=True)
+    part_rings = np.where(shapely.get_type_id(parts) == 3, shapely.get_num_interior_rings(parts) + 1, 1)
+    n_parts = np.bincount(index, weights=part_rings, minlength=len(geoms))
+    
+    # Header record (8) + shape type, bbox, jumlah part/titik (44) + index part + XY
+    sizes = 52 + 4 * n_parts + 16 * n_points
+    if gdf.geometry.has_z.any():
+        # Range + array Z dan M
+        sizes += 2 * (16 + 8 * n_points)
+    
+    # Geometry kosong ditulis sebagai Null shape
+    sizes[n_points == 0] = 12
+    return sizes.astype(np.int64)
+
+
+def _plan_shapefile_parts(gdf, max_bytes: int, dbf_size: int, split_column: Optional[str] = None) -> List['np.ndarray']:
+    """
+    Bagi baris gdf menjadi part Shapefile yang .shp dan .dbf-nya masing-masing di bawah
+    max_bytes (estimasi _shapefile_record_sizes dan panjang record DBF dbf_size, tanpa
+    menulis file).
+    
+    Baris dikelompokkan per nilai split_column (mis. BPDAS) dan kelompok utuh diisikan ke
+    part secara berurutan; kelompok yang sendirian melebihi batas dipecah per rentang feature.
+    
+    Returns:
+        List posisi baris (np.ndarray) per part; satu elemen jika tidak perlu dipecah
+    """
+    import numpy as np
+    import pandas as pd
+    
+    n_rows = len(gdf)
+    shp_sizes = _shapefile_record_sizes(gdf)
+
+    # Budget setelah header file (.shp 100 byte, .dbf 32 byte per field + 33)
+    shp_budget = max_bytes - 100
+    max_rows = max(1, (max_bytes - 32 * len(gdf.columns) - 33) // dbf_size)
+    
+    logger.info(f"Estimated Shapefile size: .shp {int(shp_sizes.sum()) + 100:,} bytes, "
+                f".dbf {n_rows * dbf_size:,} bytes ({n_rows} records x {dbf_size} bytes)")
+    
+    if shp_sizes.sum() <= shp_budget and n_rows <= max_rows:
+        return [np.arange(n_rows)]
+    
+    # Kelompok baris per nilai split_column (urut nama; nilai kosong di akhir)
+    if split_column and split_column in gdf.columns:
+        codes, _ = pd.factorize(gdf[split_column], sort=True)
+        codes = np.where(codes < 0, codes.max() + 1, codes)
+        order = np.argsort(codes, kind='stable')
+        groups = np.split(order, np.cumsum(np.bincount(codes))[:-1])
+    else:
+        groups = [np.arange(n_rows)]
+    
+    parts = []
+    current, current_bytes, current_rows = [], 0, 0
+    for group in groups:
+        group_bytes = int(shp_sizes[group].sum())
+        
+        if current and (current_bytes + group_bytes > shp_budget or current_rows + len(group) > max_rows):
+            parts.append(np.concatenate(current))
+            current, current_bytes, current_rows = [], 0, 0
+        
+        if group_bytes <= shp_budget and len(group) <= max_rows:
+            current.append(group)
+            current_bytes += group_bytes
+            current_rows += len(group)
+            continue
+        
+        # Satu kelompok melebihi batas: pecah per rentang feature
+        cumulative = np.cumsum(shp_sizes[group])
+        start = 0
+        while start < len(group):
+            consumed = cumulative[start - 1] if start else 0
+            end = min(int(np.searchsorted(cumulative, consumed + shp_budget, side='right')), start + max_rows)
+            end = max(end, start + 1)
+            parts.append(group[start:end])
+            start = end
+    
+    if current:
+        parts.append(np.concatenate(current))
+    
+    return parts
+
+
+def _materialize_for_sink(gdf):
+    """
+    Shallow copy GeoDataFrame dengan kolom category / string[pyarrow] diubah ke object,
+    karena writer (pyogrio/fiona) hanya menerima array numpy biasa. Hanya dipakai tepat
+    sebelum menulis file.
+    """
+    import pandas as pd
+    
+    extension_cols = [col for col in gdf.columns
+                      if isinstance(gdf[col].dtype, (pd.CategoricalDtype, pd.StringDtype))]
+    if not extension_cols:
+        return gdf
+    
+    gdf = gdf.copy(deep=False)
+    for col in extension_cols:
+        gdf[col] = gdf[col].to_numpy(dtype=object, na_value=None)
+    return gdf
+
+
+def _write_vector(gdf, path: str, **kwargs):
+    """Tulis GeoDataFrame ke file vektor dengan engine dari IO_CONFIG"""
+    gdf = _materialize_for_sink(gdf)
+    if _has_pyogrio():
+        gdf.to_file(path, engine='pyogrio', **kwargs)
+    else:
+        gdf.to_file(path, **kwargs)
+
+
+def _list_vector_layers(path: str) -> List[str]:
+    """Daftar layer dalam datasource (mendukung path /vsizip/)"""
+    if _has_pyogrio():
+        import pyogrio
+        return [str(name) for name in pyogrio.list_layers(path)[:, 0]]
+    
+    import fiona
+    return fiona.listlayers(path)
+
+
+def _count_vector_features(path: str, layer: str = None) -> int:
+    """Jumlah feature dari metadata datasource, tanpa membaca geometry/atribut"""
+    if _has_pyogrio():
+        import pyogrio
+        return pyogrio.read_info(path, layer=layer, force_feature_count=True)['features']
+    
+    import fiona
+    with fiona.open(path, layer=layer) as src:
+        return len(src)
+
+
+def _normalize_gdb_uuids(gdb_dir: str):
+    """
+    Ganti UUID acak item katalog File Geodatabase (GDB_Items, GDB_ItemRelationships) dengan
+    UUID deterministik (uuid5 dari nama .gdb dan path item), agar GDB dari data yang sama
+    identik per byte. Driver OpenFileGDB membuat UUID baru setiap dataset dibuat
+    (OPENFILEGDB_REPRODUCIBLE_UUID hanya ada di GDAL >= 3.9 dan bergantung urutan penulisan
+    dalam satu process). UUID tersimpan sebagai GUID 16 byte di tabel sistem, sehingga
+    diganti di tempat tanpa mengubah ukuran atau struktur file.
+    """
+    import glob
+    import uuid
+    
+    items = _read_vector(gdb_dir, layer='GDB_Items', ignore_geometry=True)
+    relationships = _read_vector(gdb_dir, layer='GDB_ItemRelationships', ignore_geometry=True)
+    
+    namespace = uuid.uuid5(uuid.NAMESPACE_URL, os.path.basename(os.path.normpath(gdb_dir)))
+    paths = dict(zip(items['UUID'], items['Path']))
+    replacements = {item_uuid: uuid.uuid5(namespace, f'item:{path}') for item_uuid, path in paths.items()}
+    for rel_uuid, origin, dest in zip(relationships['UUID'], relationships['OriginID'], relationships['DestID']):
+        replacements[rel_uuid] = uuid.uuid5(namespace, f'relationship:{paths.get(origin)}:{paths.get(dest)}')
+    
+    # GUID disimpan little-endian (format Microsoft)
+    replacements = {uuid.UUID(old).bytes_le: new.bytes_le for old, new in replacements.items()}
+    for table_file in sorted(glob.glob(os.path.join(gdb_dir, '*.gdbtable'))):
+        with open(table_file, 'rb') as f:
+            content = f.read()
+        updated = content
+        for old, new in replacements.items():
+            updated = updated.replace(old, new)
+        if updated != content:
+            with open(table_file, 'wb') as f:
+                f.write(updated)
+
+
+def _create_s3_client():
+    """Create AWS S3 client"""
+    import boto3
+
+    try:
+        s3_client = boto3.client(
+            's3',
+            aws_access_key_id=S3_CONFIG['access_key'],
+            aws_secret_access_key=S3_CONFIG['secret_key'],
+            region_name=S3_CONFIG['region']
+        )
+        logger.info("AWS S3 client initialized successfully")
+        return s3_client
+    except Exception as e:
+        logger.error(f"Failed to initialize S3 client: {e}")
+        raise
+
+def _s3_object_exists(s3_client, object_path: str) -> bool:
+    """Check if file exists in S3"""
+    from botocore.exceptions import ClientError
+
+    try:
+        s3_client.head_object(Bucket=S3_CONFIG['bucket'], Key=object_path)
+        return True
+    except ClientError:
+        return False
+
+def _year_file_paths(year: int) -> Dict[str, str]:
+    """S3 object path untuk setiap file hasil kompilasi tahun tertentu"""
+    return {
+        # PMTiles
+        'pmtiles_existing': f"{S3_CONFIG['s3_prefix']}/layers/EXISTING{year}.pmtiles",
+        'pmtiles_potensi': f"{S3_CONFIG['s3_prefix']}/layers/POTENSI{year}.pmtiles",
+        # Shapefile
+        'shp_existing': f"{S3_CONFIG['s3_prefix']}/pmn-result/{year}/AR_25K_PETAMANGROVE_EXISTING_{year}.zip",
+        'shp_potensi': f"{S3_CONFIG['s3_prefix']}/pmn-result/{year}/AR_25K_PETAMANGROVE_POTENSI_{year}.zip",
+        # GDB
+        'gdb_existing': f"{S3_CONFIG['s3_prefix']}/pmn-result/{year}/AR_25K_PETAMANGROVE_EXISTING_{year}.gdb.zip",
+        'gdb_potensi': f"{S3_CONFIG['s3_prefix']}/pmn-result/{year}/AR_25K_PETAMANGROVE_POTENSI_{year}.gdb.zip",
+    }
+
+def _check_year_files_in_s3(s3_client, year: int) -> Dict[str, bool]:
+    """Check which files exist for a specific year (head_object dijalankan paralel)"""
+    file_paths = _year_file_paths(year)
+
+    with ThreadPoolExecutor(max_workers=len(file_paths)) as executor:
+        results = executor.map(lambda path: _s3_object_exists(s3_client, path), file_paths.values())
+        return dict(zip(file_paths.keys(), results))
+
 def check_year_files(year: int) -> Dict[str, bool]:
-    """Standalone function to check which files exist for a specific year"""
+    """
+    Standalone function to check which files exist for a specific year.
+    Hanya membuat S3 client (tanpa PMNCompiler / temp directory / geopandas).
+    """
     try:
-        # Initialize temporary compiler instance just for file checking
-        temp_compiler = PMNCompiler("temp_check", datetime.now().year)
-        return temp_compiler._check_year_files_exist(year)
+        return _check_year_files_in_s3(_create_s3_client(), year)
     except Exception as e:
         logger.error(f"Failed to check files for year {year}: {e}")
         return {}
@@ -0,0 +1,6 @@
+"""
+Konfigurasi pytest. Test ada di tests/; test_citarumciliwung.py adalah script manual
+yang butuh koneksi database, bukan bagian dari test suite.
+"""
+
+collect_ignore = ['test_citarumciliwung.py']
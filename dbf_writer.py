@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+DBF Writer
+Tulis tabel atribut Shapefile (.dbf, dBASE III) dengan lebar field sesuai isi kolom.
+
+Driver GDAL membuat field teks minimal 80 karakter (254 untuk kolom VARCHAR(255)/TEXT
+yang disalin dari PostgreSQL) dan field numerik selebar 24 (Real) / 18 (Integer64),
+sehingga sebagian besar isi .dbf berupa spasi. Di sini lebar tiap field dihitung dari
+nilai sebenarnya dalam satu pass vectorized (panjang byte UTF-8 via Arrow, jumlah digit
+dan desimal via numpy), lalu record ditulis sebagai array numpy fixed-width per chunk.
+
+Dipakai compile_pmn setelah geometry (.shp/.shx/.prj) ditulis GDAL; .dbf hasil GDAL
+ditimpa dan .cpg ditulis sebagai UTF-8.
+"""
+
+import struct
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+# Konfigurasi DBF
+DBF_WRITER_CONFIG = {
+    'chunk_rows': 100000,       # Jumlah record yang di-encode per chunk
+    'max_char_width': 254,      # Lebar maksimal field teks (batas driver GDAL/ArcGIS)
+    'max_numeric_width': 24,    # Lebar maksimal field numerik (sama dengan default GDAL)
+    'max_decimals': 15          # Desimal maksimal field float
+}
+
+
+def _text_bytes(series):
+    """
+    Nilai teks kolom sebagai array Arrow binary UTF-8 (null -> b'') dan panjang byte-nya.
+    Kolom category di-encode per kategori lalu diambil per kode.
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = pa.array(series.cat.categories.astype('string[pyarrow]').array)
+        codes = pa.array(series.cat.codes.to_numpy(), mask=series.cat.codes.to_numpy() < 0)
+        values = pc.take(categories, codes)
+    else:
+        values = pa.array(series.astype('string[pyarrow]').array)
+
+    values = pc.fill_null(values, '')
+    return values.cast(pa.large_binary()), pc.binary_length(values)
+
+
+def _float_layout(values) -> tuple:
+    """(width, decimals) minimal untuk menulis semua nilai float tanpa kehilangan presisi"""
+    import numpy as np
+
+    finite = values[np.isfinite(values)]
+    if len(finite) == 0:
+        return 1, 0
+
+    max_decimals = DBF_WRITER_CONFIG['max_decimals']
+    decimals = next((d for d in range(max_decimals + 1) if np.array_equal(np.round(finite, d), finite)),
+                    max_decimals)
+
+    # Lebar dari string hasil format (setelah pembulatan, mis. 9.995 dengan 2 desimal -> '10.00').
+    # Panjang string naik monoton dengan |nilai|, jadi cukup memformat nilai minimum dan maksimum
+    extremes = (float(finite.min()), float(finite.max()))
+
+    def _width(decimals: int) -> int:
+        return max(len(f'{value:.{decimals}f}') for value in extremes)
+
+    width = _width(decimals)
+
+    # Terlalu lebar: kurangi desimal (seperti default GDAL Real 24.15)
+    max_width = DBF_WRITER_CONFIG['max_numeric_width']
+    if width > max_width:
+        decimals = max(0, decimals - (width - max_width))
+        width = min(_width(decimals), 255)
+
+    return width, decimals
+
+
+def plan_fields(df, columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Tentukan field DBF dari isi kolom.
+
+    Args:
+        df: DataFrame (kolom geometry diabaikan jika columns tidak diberikan)
+        columns: Kolom atribut yang ditulis, sesuai urutan field
+
+    Returns:
+        List of {'name', 'type' (C/N/L/D), 'width', 'decimals'}
+    """
+    import numpy as np
+    import pandas as pd
+    import pyarrow.compute as pc
+
+    if columns is None:
+        geometry = getattr(df, '_geometry_column_name', None)
+        columns = [col for col in df.columns if col != geometry]
+
+    fields = []
+    for col in columns:
+        series = df[col]
+        dtype = series.dtype
+
+        if pd.api.types.is_bool_dtype(dtype) or (
+                dtype == 'object' and pd.api.types.infer_dtype(series, skipna=True) == 'boolean'):
+            fields.append({'name': col, 'type': 'L', 'width': 1, 'decimals': 0})
+
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            fields.append({'name': col, 'type': 'D', 'width': 8, 'decimals': 0})
+
+        elif pd.api.types.is_integer_dtype(dtype):
+            values = series.dropna().to_numpy(dtype=np.int64)
+            width = max(len(str(values.min())), len(str(values.max()))) if len(values) else 1
+            fields.append({'name': col, 'type': 'N', 'width': width, 'decimals': 0})
+
+        elif pd.api.types.is_float_dtype(dtype):
+            width, decimals = _float_layout(series.to_numpy(dtype=np.float64, na_value=np.nan))
+            fields.append({'name': col, 'type': 'N', 'width': width, 'decimals': decimals})
+
+        else:
+            _, lengths = _text_bytes(series)
+            max_length = pc.max(lengths).as_py() or 0
+            width = max(1, min(max_length, DBF_WRITER_CONFIG['max_char_width']))
+            fields.append({'name': col, 'type': 'C', 'width': width, 'decimals': 0})
+
+    return fields
+
+
+def record_size(fields: List[Dict[str, Any]]) -> int:
+    """Panjang satu record (byte), termasuk penanda deleted"""
+    return 1 + sum(field['width'] for field in fields)
+
+
+def _truncate_utf8(value: bytes, width: int) -> bytes:
+    """Potong teks ke width byte tanpa memotong karakter multi-byte"""
+    return value[:width].decode('utf-8', 'ignore').encode('utf-8')
+
+
+def _encode_field(series, field: Dict[str, Any]):
+    """Nilai satu field sebagai array numpy fixed-width S{width} (padding NUL, diganti spasi saat ditulis)"""
+    import numpy as np
+    import pandas as pd
+
+    width = field['width']
+    kind = field['type']
+
+    if kind == 'C':
+        values, lengths = _text_bytes(series)
+        encoded = np.asarray(values.to_numpy(zero_copy_only=False), dtype=f'S{width}')
+        too_long = np.flatnonzero(lengths.to_numpy(zero_copy_only=False) > width)
+        for idx in too_long:
+            encoded[idx] = _truncate_utf8(values[int(idx)].as_py(), width)
+        return encoded
+
+    if kind == 'L':
+        values = series.astype('boolean')
+        return np.where(values.isna(), b'?', np.where(values.fillna(False), b'T', b'F')).astype('S1')
+
+    if kind == 'D':
+        return np.asarray(series.dt.strftime('%Y%m%d').fillna('').to_numpy(dtype=object), dtype=f'S{width}')
+
+    # Numerik: rata kanan, null = spasi
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    missing = ~np.isfinite(values)
+    result = np.full(len(values), b' ' * width, dtype=f'S{width}')
+    if pd.api.types.is_integer_dtype(series.dtype):
+        present = series.dropna().to_numpy(dtype=np.int64)
+        result[~missing] = np.char.mod(f'%{width}d', present).astype(f'S{width}')
+    elif (~missing).any():
+        result[~missing] = np.char.mod(f"%{width}.{field['decimals']}f", values[~missing]).astype(f'S{width}')
+    return result
+
+
+def _header(n_records: int, fields: List[Dict[str, Any]], last_update: date) -> bytes:
+    """Header dBASE III + deskriptor field + terminator"""
+    header_length = 32 + 32 * len(fields) + 1
+    header = struct.pack('<BBBBIHH20x', 0x03, last_update.year - 1900, last_update.month, last_update.day,
+                         n_records, header_length, record_size(fields))
+
+    for field in fields:
+        name = field['name'].encode('utf-8')[:10]
+        header += struct.pack('<11sc4xBB14x', name, field['type'].encode('ascii'),
+                              field['width'], field['decimals'])
+
+    return header + b'\r'
+
+
+def write_dbf(path: str, df, fields: List[Dict[str, Any]], last_update: Optional[date] = None):
+    """
+    Tulis df ke file .dbf dengan field hasil plan_fields, plus .cpg (UTF-8).
+
+    Record di-encode per chunk (DBF_WRITER_CONFIG['chunk_rows']) menjadi array numpy
+    terstruktur, sehingga memori sebanding dengan satu chunk.
+    """
+    import numpy as np
+
+    dtype = np.dtype([('deleted', 'S1')] + [(f'f{idx}', f"S{field['width']}") for idx, field in enumerate(fields)])
+    chunk_rows = DBF_WRITER_CONFIG['chunk_rows']
+
+    with open(path, 'wb') as f:
+        f.write(_header(len(df), fields, last_update or date.today()))
+
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            records = np.empty(len(chunk), dtype=dtype)
+            records['deleted'] = b' '
+            for idx, field in enumerate(fields):
+                records[f'f{idx}'] = _encode_field(chunk[field['name']], field)
+
+            # Field numpy S{n} di-pad NUL; DBF memakai spasi
+            buffer = records.view(np.uint8)
+            buffer[buffer == 0] = 0x20
+            f.write(buffer.tobytes())
+
+        f.write(b'\x1a')
+
+    with open(path[:-4] + '.cpg', 'w') as f:
+        f.write('UTF-8')
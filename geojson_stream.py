@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+GeoJSON Stream Validator
+Validasi struktur GeoJSON FeatureCollection secara incremental: file dibaca per chunk
+dan di-parse dengan json.JSONDecoder.raw_decode, berhenti setelah `type` dan N feature
+pertama terverifikasi. Memori yang dipakai sebanding dengan ukuran satu feature, bukan
+ukuran file, sehingga aman untuk file skala nasional.
+
+Dipakai oleh compile_pmn untuk hasil konversi PMTiles historis (tippecanoe-decode,
+pmtiles extract, ogr2ogr).
+"""
+
+import json
+from typing import Dict, Any, Optional, TextIO
+
+# Konfigurasi validasi streaming
+GEOJSON_STREAM_CONFIG = {
+    'sample_features': 100,       # Jumlah feature pertama yang diperiksa
+    'chunk_size': 1024 * 1024,    # Ukuran chunk baca (karakter)
+    'max_value_size': 256 * 1024 * 1024  # Batas ukuran satu nilai JSON (mis. satu feature) di buffer
+}
+
+_WHITESPACE = ' \t\n\r'
+
+
+class GeoJSONStreamError(ValueError):
+    """Struktur GeoJSON tidak valid (JSON rusak, bukan object, atau array features tidak lengkap)"""
+
+
+class _StreamReader:
+    """Buffer teks di atas file yang diisi ulang per chunk saat parser membutuhkan data"""
+
+    def __init__(self, fp: TextIO, chunk_size: int):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Tambah satu chunk ke buffer; buang bagian yang sudah di-parse. False jika EOF"""
+        if self._eof:
+            return False
+        chunk = self._fp.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Karakter non-whitespace berikutnya (tanpa dikonsumsi); '' jika EOF"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars: str) -> str:
+        """Konsumsi satu karakter struktural yang harus salah satu dari chars"""
+        char = self.peek()
+        if not char or char not in chars:
+            raise GeoJSONStreamError(f"Expected one of {chars!r}, found {char or 'end of file'!r}")
+        self._pos += 1
+        return char
+
+    def value(self) -> Any:
+        """
+        Decode satu nilai JSON lengkap. Jika nilai terpotong di akhir buffer, buffer diisi
+        ulang dan decode diulang.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                # JSON rusak di tengah file tidak boleh membuat seluruh sisa file masuk buffer
+                if len(self._buffer) - self._pos <= GEOJSON_STREAM_CONFIG['max_value_size'] and self._fill():
+                    continue
+                raise GeoJSONStreamError(f"Invalid JSON: {e}") from e
+
+            # Angka / literal di ujung buffer bisa saja belum lengkap
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def _has_geometry(feature: Any) -> bool:
+    """True jika feature punya geometry dengan type dan coordinates (atau feature bersarang)"""
+    if not isinstance(feature, dict):
+        return False
+    if feature.get('type') == 'FeatureCollection':
+        # tippecanoe-decode membungkus feature per tile / layer dalam FeatureCollection
+        return any(_has_geometry(child) for child in feature.get('features') or [])
+    geometry = feature.get('geometry')
+    return bool(isinstance(geometry, dict) and geometry.get('type') and
+                (geometry.get('coordinates') or geometry.get('geometries')))
+
+
+def inspect_feature_collection(path: str, sample_features: Optional[int] = None,
+                               chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Periksa struktur GeoJSON tanpa memuat seluruh file.
+
+    Key top-level dibaca berurutan; nilai selain `features` di-decode utuh (biasanya kecil).
+    Di dalam array `features` hanya `sample_features` feature pertama yang diperiksa, lalu
+    pembacaan berhenti. Jika `type` baru muncul setelah `features`, sisa feature dibaca
+    satu per satu (memori tetap sebesar satu feature) dan ikut dihitung.
+
+    Returns:
+        {'type': nilai key type, 'features': jumlah feature yang terbaca,
+         'sampled': jumlah feature sampel yang diperiksa geometry-nya,
+         'valid_geometries': feature sampel yang punya geometry,
+         'complete': True jika seluruh array features sudah terbaca ('features' = jumlah pasti)}
+
+    Raises:
+        GeoJSONStreamError: jika JSON rusak sebelum pemeriksaan selesai
+    """
+    sample_features = sample_features or GEOJSON_STREAM_CONFIG['sample_features']
+    chunk_size = chunk_size or GEOJSON_STREAM_CONFIG['chunk_size']
+
+    result = {'type': None, 'features': 0, 'sampled': 0, 'valid_geometries': 0, 'complete': False}
+    seen_features = False
+
+    with open(path, 'r', encoding='utf-8') as fp:
+        reader = _StreamReader(fp, chunk_size)
+        reader.expect('{')
+        if reader.peek() == '}':
+            return result
+
+        while True:
+            key = reader.value()
+            reader.expect(':')
+
+            if key == 'features' and reader.peek() == '[':
+                seen_features = True
+                reader.expect('[')
+                if reader.peek() == ']':
+                    reader.expect(']')
+                    result['complete'] = True
+                else:
+                    while True:
+                        feature = reader.value()
+                        result['features'] += 1
+                        if result['sampled'] < sample_features:
+                            result['sampled'] += 1
+                            result['valid_geometries'] += _has_geometry(feature)
+                        if reader.expect(',]') == ']':
+                            result['complete'] = True
+                            break
+                        if result['sampled'] >= sample_features and result['type'] is not None:
+                            # Struktur dan sampel sudah terverifikasi: berhenti tanpa membaca sisa file
+                            return result
+            else:
+                value = reader.value()
+                if key == 'type':
+                    result['type'] = value
+                    if seen_features and result['sampled'] >= sample_features:
+                        return result
+
+            if reader.expect(',}') == '}':
+                return result
+
+
+def validate_feature_collection(path: str, sample_features: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Validasi file sebagai FeatureCollection yang berisi minimal satu feature.
+
+    Returns:
+        Hasil inspect_feature_collection
+
+    Raises:
+        GeoJSONStreamError: jika bukan FeatureCollection, tidak ada feature, atau JSON rusak
+    """
+    info = inspect_feature_collection(path, sample_features)
+    if info['type'] != 'FeatureCollection':
+        raise GeoJSONStreamError(f"GeoJSON is not a FeatureCollection (type: {info['type']!r})")
+    if info['features'] == 0:
+        raise GeoJSONStreamError("GeoJSON contains no features")
+    return info
+
+
+def describe_feature_count(info: Dict[str, Any]) -> str:
+    """Teks jumlah feature untuk log: pasti jika array terbaca habis, selain itu batas bawah"""
+    if info['complete']:
+        return f"{info['features']} features"
+    return f"at least {info['features']} features (first {info['sampled']} checked)"
@@ -14,6 +14,7 @@ import json
 import traceback
 from datetime import datetime
 from typing import List, Dict, Any, Optional
+from bpdas_registry import BPDASRegistry
 
 # Konfigurasi Database
 DB_CONFIG = {
@@ -146,15 +147,7 @@ class PemutakhiranBaseline:
                 self.bpdas_list = ['bpdastesting']
                 logger.info("TEST MODE: Only processing bpdastesting")
             else:
-                self.bpdas_list = [
-                    'agamkuantan', 'akemalamo', 'asahanbarumun', 
-                    'barito', 'batanghari', 'baturusacerucuk', 'benainnoelmina', 
-                    'bonelimboto', 'brantassampean', 'cimanukcitanduy', 'citarumciliwung', 
-                    'dodokanmoyosari', 'indragirirokan', 'jeneberangsaddang', 'kahayan', 'kapuas', 
-                    'karama', 'ketahun', 'konaweha', 'kruengaceh', 'mahakamberau', 'memberamo', 'musi', 
-                    'paluposo', 'pemalijratun', 'remuransiki', 'seijangduriangkang', 'serayuopakprogo', 
-                    'solo', 'tondano', 'undaanyar', 'waehapubatumerah', 'wampuseiular', 'wayseputihwaysekampung'
-                ]
+                self.bpdas_list = BPDASRegistry().get_bpdas_list()
             
             self.total_bpdas = len(self.bpdas_list)
             logger.info(f"Total BPDAS to process: {self.total_bpdas}")
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+S3 Stream Writer
+Objek file-like (write-only) yang meng-upload data ke S3 sebagai multipart upload
+selagi data ditulis. Dipakai compile_pmn untuk menulis ZIP Shapefile/GDB langsung ke
+key tujuan (zipfile mendukung output yang tidak bisa di-seek), sehingga ZIP tidak pernah
+ditulis utuh ke disk lokal dan tidak ada fase upload terpisah.
+
+Memori yang dipakai maksimal satu part (S3_STREAM_CONFIG['part_size']). Objek yang lebih
+kecil dari satu part di-upload dengan satu put_object. MD5 dan SHA-256 dihitung dari byte
+yang lewat, sehingga objek tidak perlu dibaca ulang untuk checksum.
+"""
+
+import hashlib
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Konfigurasi multipart upload
+S3_STREAM_CONFIG = {
+    'part_size': 64 * 1024 * 1024  # Ukuran part (minimal 5 MB kecuali part terakhir)
+}
+
+
+class S3MultipartWriter:
+    """
+    Tulis objek S3 secara streaming.
+
+    Dipakai sebagai context manager: upload diselesaikan (complete) saat keluar normal,
+    dan dibatalkan (abort) jika terjadi exception, sehingga tidak ada objek setengah jadi.
+    Ukuran, MD5 dan SHA-256 objek dihitung selagi data ditulis.
+    """
+
+    def __init__(self, s3_client, bucket: str, key: str, part_size: Optional[int] = None,
+                 content_type: str = 'application/octet-stream'):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size or S3_STREAM_CONFIG['part_size']
+        self.content_type = content_type
+
+        self._buffer = bytearray()
+        self._upload_id = None
+        self._parts = []
+        self._md5 = hashlib.md5()
+        self._sha256 = hashlib.sha256()
+        self._size = 0
+        self._closed = False
+
+    # ---- file-like interface (cukup untuk zipfile.ZipFile) ----
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        return self._size
+
+    def flush(self):
+        pass
+
+    def write(self, data) -> int:
+        if self._closed:
+            raise ValueError(f"Write to closed S3 stream: s3://{self.bucket}/{self.key}")
+
+        data = memoryview(data).cast('B')
+        self._buffer += data
+        self._md5.update(data)
+        self._sha256.update(data)
+        self._size += len(data)
+
+        while len(self._buffer) >= self.part_size:
+            self._upload_part(bytes(self._buffer[:self.part_size]))
+            del self._buffer[:self.part_size]
+
+        return len(data)
+
+    # ---- hasil ----
+
+    @property
+    def size(self) -> int:
+        """Jumlah byte yang sudah ditulis"""
+        return self._size
+
+    @property
+    def md5(self) -> str:
+        """MD5 (hex) seluruh isi objek"""
+        return self._md5.hexdigest()
+
+    @property
+    def sha256(self) -> str:
+        """SHA-256 (hex) seluruh isi objek"""
+        return self._sha256.hexdigest()
+
+    # ---- multipart ----
+
+    def _upload_part(self, body: bytes):
+        if self._upload_id is None:
+            response = self.s3_client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, ContentType=self.content_type)
+            self._upload_id = response['UploadId']
+
+        part_number = len(self._parts) + 1
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self._upload_id,
+            PartNumber=part_number, Body=body)
+        self._parts.append({'PartNumber': part_number, 'ETag': response['ETag']})
+
+    def close(self):
+        """Upload sisa buffer dan selesaikan objek"""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._upload_id is None:
+            # Objek kecil: satu request
+            self.s3_client.put_object(Bucket=self.bucket, Key=self.key,
+                                      Body=bytes(self._buffer), ContentType=self.content_type)
+        else:
+            if self._buffer:
+                self._upload_part(bytes(self._buffer))
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id,
+                MultipartUpload={'Parts': self._parts})
+        self._buffer = bytearray()
+
+    def abort(self):
+        """Batalkan upload; part yang sudah terkirim dihapus dari S3"""
+        if self._closed:
+            return
+        self._closed = True
+        self._buffer = bytearray()
+
+        if self._upload_id is not None:
+            try:
+                self.s3_client.abort_multipart_upload(
+                    Bucket=self.bucket, Key=self.key, UploadId=self._upload_id)
+            except Exception as e:
+                logger.warning(f"Failed to abort multipart upload s3://{self.bucket}/{self.key}: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def upload_file(s3_client, path: str, bucket: str, key: str, part_size: Optional[int] = None,
+                content_type: str = 'application/octet-stream') -> S3MultipartWriter:
+    """
+    Upload file lokal lewat S3MultipartWriter: file dibaca sekali per part, checksum
+    dihitung sambil upload.
+
+    Returns:
+        Writer yang sudah ditutup (size, md5, sha256)
+    """
+    with S3MultipartWriter(s3_client, bucket, key, part_size=part_size, content_type=content_type) as stream:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(stream.part_size), b''):
+                stream.write(chunk)
+    return stream
@@ -0,0 +1,57 @@
+"""Test konversi tipe atribut Shapefile/GDB (_coercion_plan, _coerce_attribute_types di compile_pmn.py)"""
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyogrio
+import pytest
+from shapely.geometry import Point
+
+from compile_pmn import _coerce_attribute_types, _coercion_plan, _materialize_for_sink
+
+COLUMN_TYPES = {'srs_id': 'integer', 'kode': 'bigint', 'luas': 'double precision',
+                'nama': 'character varying', 'tanggal': 'date'}
+
+
+@pytest.fixture
+def frame():
+    # Seperti hasil baca GeoParquet: integer dengan null menjadi float64
+    return gpd.GeoDataFrame({
+        'srs_id': [4326.0, np.nan],
+        'kode': [2 ** 40, np.nan],
+        'luas': ['1.5', None],
+        'nama': pd.array(['Bakau', None], dtype='string[pyarrow]'),
+        'tanggal': pd.to_datetime(['2025-01-31', None]),
+    }, geometry=[Point(106.8, -6.2), Point(110.4, -7.0)], crs='EPSG:4326')
+
+
+def test_integer_columns_use_nullable_integer(frame):
+    gdf = _coerce_attribute_types(frame.copy(), _coercion_plan(frame, COLUMN_TYPES))
+
+    assert gdf['srs_id'].dtype == 'Int32'
+    assert gdf['kode'].dtype == 'Int64'
+    assert gdf['srs_id'].isna().tolist() == [False, True]
+    assert gdf['luas'].tolist()[0] == 1.5
+
+
+def test_shapefile_fills_missing_gdb_keeps_null(frame):
+    plan = _coercion_plan(frame, COLUMN_TYPES)
+    shp = _coerce_attribute_types(frame.copy(), plan)
+    gdb = _coerce_attribute_types(frame.copy(), plan, datetime_format=None, fill_missing=False)
+
+    assert shp['nama'].tolist() == ['Bakau', ''] and shp['tanggal'].tolist() == ['2025-01-31', '']
+    assert gdb['nama'].isna().tolist() == [False, True]
+    assert gdb['tanggal'].isna().tolist() == [False, True]
+
+
+def test_gdb_round_trip_keeps_integer_type_and_nulls(frame, tmp_path):
+    gdb = _coerce_attribute_types(frame.copy(), _coercion_plan(frame, COLUMN_TYPES),
+                                  datetime_format=None, fill_missing=False)
+    path = str(tmp_path / 'test.gdb')
+    _materialize_for_sink(gdb).to_file(path, driver='OpenFileGDB', engine='pyogrio')
+
+    info = pyogrio.read_info(path)
+    assert dict(zip(info['fields'], info['dtypes']))['srs_id'] == 'int32'
+    result = pyogrio.read_dataframe(path)
+    assert result['srs_id'].iloc[0] == 4326 and pd.isna(result['srs_id'].iloc[1])
+    assert result['nama'].tolist() == ['Bakau', None]
@@ -0,0 +1,113 @@
+"""Test DBF writer (dbf_writer.py): lebar/desimal field dan round trip lewat GDAL"""
+
+import struct
+from datetime import date
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from shapely.geometry import Point
+
+from dbf_writer import plan_fields, record_size, write_dbf
+
+
+@pytest.fixture
+def frame():
+    return gpd.GeoDataFrame({
+        'kode': pd.array([1, -2345, None], dtype='Int64'),
+        'luas': [0.5, 1234.125, np.nan],
+        'bulat': [1.0, 20.0, 300.0],
+        'nama': ['Bakau', 'Hutan Mangrove Lebat Sekali', None],
+        'wilayah': pd.Categorical(['Sumatera', 'Jawa', 'Sumatera']),
+        'unicode': ['ñ', 'Ångström', ''],
+        'aktif': [True, False, True],
+        'tanggal': pd.to_datetime(['2025-01-31', None, '2024-12-01']),
+    }, geometry=[Point(106.8, -6.2), Point(110.4, -7.0), Point(98.7, 3.6)], crs='EPSG:4326')
+
+
+def _read_descriptors(path):
+    with open(path, 'rb') as f:
+        header = f.read(32)
+        n_records, header_length, size = struct.unpack('<IHH', header[4:12])
+        fields = []
+        while True:
+            descriptor = f.read(32)
+            if descriptor[0] == 0x0D:
+                break
+            name, kind, width, decimals = struct.unpack('<11sc4xBB14x', descriptor)
+            fields.append((name.rstrip(b'\x00').decode(), kind.decode(), width, decimals))
+    return header, n_records, header_length, size, fields
+
+
+def test_plan_fields_widths(frame):
+    fields = {field['name']: (field['type'], field['width'], field['decimals']) for field in plan_fields(frame)}
+
+    assert fields == {
+        'kode': ('N', 5, 0),            # '-2345'
+        'luas': ('N', 8, 3),            # '1234.125'
+        'bulat': ('N', 3, 0),           # tanpa desimal
+        'nama': ('C', 27, 0),
+        'wilayah': ('C', 8, 0),
+        'unicode': ('C', 10, 0),        # panjang byte UTF-8, bukan jumlah karakter
+        'aktif': ('L', 1, 0),
+        'tanggal': ('D', 8, 0),
+    }
+
+
+def test_write_dbf_round_trip(frame, tmp_path):
+    import pyogrio
+
+    path = str(tmp_path / 'test.shp')
+    frame[[frame.geometry.name]].to_file(path, driver='ESRI Shapefile', engine='pyogrio')
+    fields = plan_fields(frame)
+    write_dbf(path.replace('.shp', '.dbf'), frame, fields, last_update=date(2025, 1, 1))
+
+    header, n_records, header_length, size, descriptors = _read_descriptors(path.replace('.shp', '.dbf'))
+    assert header[1:4] == bytes([125, 1, 1])
+    assert n_records == len(frame)
+    assert size == record_size(fields)
+    assert header_length == 32 + 32 * len(fields) + 1
+    assert descriptors == [(f['name'], f['type'], f['width'], f['decimals']) for f in fields]
+    assert (tmp_path / 'test.cpg').read_text() == 'UTF-8'
+
+    result = pyogrio.read_dataframe(path)
+    assert len(result) == len(frame)
+    assert result['kode'].tolist()[:2] == [1, -2345] and pd.isna(result['kode'].iloc[2])
+    assert result['luas'].tolist()[:2] == [0.5, 1234.125] and pd.isna(result['luas'].iloc[2])
+    assert result['bulat'].tolist() == [1, 20, 300]
+    assert result['nama'].tolist()[:2] == ['Bakau', 'Hutan Mangrove Lebat Sekali']
+    assert result['wilayah'].tolist() == ['Sumatera', 'Jawa', 'Sumatera']
+    assert result['unicode'].tolist()[:2] == ['ñ', 'Ångström']
+    assert result['aktif'].tolist() == ['T', 'F', 'T']  # GDAL membaca field L sebagai teks
+    assert pd.to_datetime(result['tanggal']).dt.strftime('%Y-%m-%d').tolist()[::2] == ['2025-01-31', '2024-12-01']
+    assert result.geometry.equals(frame.geometry)
+
+
+def test_write_dbf_truncates_text_without_splitting_characters(tmp_path):
+    frame = pd.DataFrame({'nama': ['ñññ']})
+    fields = [{'name': 'nama', 'type': 'C', 'width': 5, 'decimals': 0}]
+    path = tmp_path / 'test.dbf'
+    write_dbf(str(path), frame, fields)
+
+    data = path.read_bytes()
+    _, _, header_length, _, _ = _read_descriptors(str(path))
+    # 'ñ' = 2 byte: 5 byte muat 'ññ' + padding spasi, bukan setengah karakter ketiga
+    assert data[header_length + 1:header_length + 6] == 'ññ '.encode('utf-8')
+
+
+def test_float_width_includes_rounding_carry(monkeypatch, tmp_path):
+    import pyogrio
+
+    from dbf_writer import DBF_WRITER_CONFIG
+
+    # 9.996 dengan 2 desimal diformat '10.00': satu karakter lebih lebar dari digit nilai aslinya
+    monkeypatch.setitem(DBF_WRITER_CONFIG, 'max_decimals', 2)
+    frame = gpd.GeoDataFrame({'nilai': [9.996, 0.5]}, geometry=[Point(0, 0), Point(1, 1)], crs='EPSG:4326')
+    fields = plan_fields(frame)
+    assert fields[0]['type'] == 'N' and (fields[0]['width'], fields[0]['decimals']) == (5, 2)
+
+    path = str(tmp_path / 'carry.shp')
+    frame[[frame.geometry.name]].to_file(path, driver='ESRI Shapefile', engine='pyogrio')
+    write_dbf(path.replace('.shp', '.dbf'), frame, fields)
+    assert pyogrio.read_dataframe(path)['nilai'].tolist() == [10.0, 0.5]
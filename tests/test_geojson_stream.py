@@ -0,0 +1,67 @@
+"""Test validasi GeoJSON streaming (geojson_stream.py)"""
+
+import json
+
+import pytest
+
+from geojson_stream import (GeoJSONStreamError, describe_feature_count, inspect_feature_collection,
+                            validate_feature_collection)
+
+
+def _feature(idx):
+    return {'type': 'Feature', 'properties': {'id': idx},
+            'geometry': {'type': 'Point', 'coordinates': [idx, idx]}}
+
+
+def _write(path, collection):
+    path.write_text(json.dumps(collection), encoding='utf-8')
+    return str(path)
+
+
+def test_stops_after_sample_when_type_comes_first(tmp_path):
+    path = _write(tmp_path / 'fc.geojson', {'type': 'FeatureCollection',
+                                           'features': [_feature(i) for i in range(50)]})
+
+    info = inspect_feature_collection(path, sample_features=10, chunk_size=64)
+
+    assert info['type'] == 'FeatureCollection'
+    assert info['sampled'] == 10
+    assert info['valid_geometries'] == 10
+    assert not info['complete']
+    assert describe_feature_count(info) == 'at least 10 features (first 10 checked)'
+
+
+def test_counts_every_feature_when_type_comes_after_features(tmp_path):
+    path = _write(tmp_path / 'fc.geojson', {'features': [_feature(i) for i in range(50)],
+                                           'type': 'FeatureCollection'})
+
+    info = inspect_feature_collection(path, sample_features=10, chunk_size=64)
+
+    assert info['type'] == 'FeatureCollection'
+    assert info['complete']
+    assert info['features'] == 50
+    assert info['sampled'] == 10
+    assert info['valid_geometries'] == 10
+    assert describe_feature_count(info) == '50 features'
+
+
+def test_small_collection_is_complete(tmp_path):
+    path = _write(tmp_path / 'fc.geojson', {'type': 'FeatureCollection',
+                                           'features': [_feature(i) for i in range(3)]})
+
+    info = validate_feature_collection(path, sample_features=10)
+
+    assert info['complete']
+    assert info['features'] == 3
+
+
+def test_rejects_empty_and_truncated_collections(tmp_path):
+    empty = _write(tmp_path / 'empty.geojson', {'type': 'FeatureCollection', 'features': []})
+    with pytest.raises(GeoJSONStreamError):
+        validate_feature_collection(empty)
+
+    truncated = tmp_path / 'truncated.geojson'
+    truncated.write_text(json.dumps({'type': 'FeatureCollection',
+                                     'features': [_feature(0), _feature(1)]})[:-20], encoding='utf-8')
+    with pytest.raises(GeoJSONStreamError):
+        validate_feature_collection(str(truncated))
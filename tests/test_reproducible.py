@@ -0,0 +1,46 @@
+"""Test urutan feature reproducible Shapefile/GDB dan PMTiles (_stable_row_order, _stable_order_by di compile_pmn.py)"""
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from shapely.geometry import box
+
+from compile_pmn import REPRODUCIBLE_CONFIG, PMNCompiler, _stable_row_order
+
+
+def _ordered(gdf):
+    return gdf.iloc[_stable_row_order(gdf)].reset_index(drop=True)
+
+
+def test_order_independent_of_input_order():
+    rng = np.random.default_rng(0)
+    n = 500
+    gdf = gpd.GeoDataFrame({
+        'bpdas': pd.Categorical(rng.choice(['Citarum', 'Asahan', 'Brantas'], n)),
+        'luas': np.round(rng.random(n) * 100, 2),
+        'nama': rng.choice(['Bakau', None], n),
+    }, geometry=[box(x, y, x + 0.01, y + 0.01) for x, y in rng.random((n, 2))], crs='EPSG:4326')
+    # Geometry kembar dengan atribut berbeda: diurutkan menurut hash atribut
+    gdf = pd.concat([gdf, gdf.iloc[:10].assign(luas=-1.0)], ignore_index=True)
+
+    expected = _ordered(gdf)
+    shuffled = gdf.iloc[rng.permutation(len(gdf))].reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(_ordered(shuffled), expected)
+
+
+def test_bpdas_pmtiles_fallback_query_is_ordered(monkeypatch):
+    compiler = PMNCompiler.__new__(PMNCompiler)
+    monkeypatch.setattr(compiler, '_pg_connection_string', lambda read_only=False: 'PG:dbname=pmn', raising=False)
+
+    def fallback_sql():
+        cmd = compiler._build_ogr2ogr_pmtiles_cmd('out.pmtiles', 'existing_citarum_2025', 'SELECT * FROM src_query',
+                                                  'bpdas', "Citarum's", columns=['bpdas', 'luas'])
+        return cmd[cmd.index('-sql') + 1]
+
+    monkeypatch.setitem(REPRODUCIBLE_CONFIG, 'enabled', True)
+    assert fallback_sql() == ('SELECT "bpdas", "luas", geometry FROM (SELECT * FROM src_query) AS src '
+                              'WHERE "bpdas" = \'Citarum\'\'s\' ORDER BY md5(ST_AsBinary(geometry)), "bpdas", "luas"')
+
+    monkeypatch.setitem(REPRODUCIBLE_CONFIG, 'enabled', False)
+    assert 'ORDER BY' not in fallback_sql()
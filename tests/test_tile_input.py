@@ -0,0 +1,69 @@
+"""Test input tippecanoe dari GeoParquet (_write_geojsonseq_from_parquet di compile_pmn.py)"""
+
+import datetime
+import json
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import shapely
+
+from compile_pmn import REPRODUCIBLE_CONFIG, PMNCompiler
+
+
+def test_geojsonseq_from_parquet(tmp_path):
+    table = pa.table({
+        'bpdas': ['Citarum', None],
+        'prov': ['Jawa Barat', 'Ñ "quoted"'],
+        'tahun': pa.array([2025, None], pa.int32()),
+        'luas': [1.25, None],
+        'tanggal': pa.array([datetime.date(2025, 1, 31), None]),
+        'diperbarui': pa.array([datetime.datetime(2025, 1, 31, 8, 30, 15, 500), None]),
+        'ogc_fid': [1, 2],
+        'geometry': [shapely.to_wkb(shapely.box(106.8, -6.2, 106.9, -6.1)), None],
+    })
+    parquet_file = str(tmp_path / 'existing_2025.parquet')
+    pq.write_table(table, parquet_file, row_group_size=1)
+    output_file = str(tmp_path / 'existing_2025.geojsons')
+
+    compiler = PMNCompiler.__new__(PMNCompiler)
+    assert compiler._write_geojsonseq_from_parquet(parquet_file, output_file, profile='tiles_national') == 2
+
+    with open(output_file, encoding='utf-8') as f:
+        # Urutan feature stabil dari isi (build reproducible), bukan urutan Parquet
+        features = sorted((json.loads(line) for line in f), key=lambda feature: feature['geometry'] is None)
+    assert features[0]['geometry']['type'] == 'Polygon'
+    assert features[0]['properties'] == {
+        'bpdas': 'Citarum', 'prov': 'Jawa Barat', 'tahun': 2025}  # Hanya kolom profile tiles_national
+    assert features[1] == {'type': 'Feature', 'geometry': None,
+                           'properties': {'bpdas': None, 'prov': 'Ñ "quoted"', 'tahun': None}}
+
+    compiler._write_geojsonseq_from_parquet(parquet_file, output_file)
+    with open(output_file, encoding='utf-8') as f:
+        properties = next(feature['properties'] for feature in map(json.loads, f) if feature['geometry'])
+    assert properties == {'bpdas': 'Citarum', 'prov': 'Jawa Barat', 'tahun': 2025, 'luas': 1.25,
+                          'tanggal': '2025-01-31', 'diperbarui': '2025-01-31T08:30:15', 'ogc_fid': 1}
+    assert isinstance(properties['tahun'], int)
+
+
+def test_geojsonseq_from_parquet_stable_order(tmp_path, monkeypatch):
+    monkeypatch.setitem(REPRODUCIBLE_CONFIG, 'enabled', True)
+    rng = np.random.default_rng(0)
+    n = 50
+    table = pa.table({
+        'bpdas': [f'BPDAS {i % 7}' for i in range(n)],
+        'tahun': pa.array([2025] * n, pa.int32()),
+        # Geometry kembar dengan atribut berbeda: urutan ditentukan hash atribut
+        'geometry': [shapely.to_wkb(shapely.Point(i // 2, 0)) for i in range(n)],
+    })
+    compiler = PMNCompiler.__new__(PMNCompiler)
+
+    outputs = []
+    for seed in range(3):
+        parquet_file = str(tmp_path / f'existing_{seed}.parquet')
+        pq.write_table(table.take(rng.permutation(n)), parquet_file, row_group_size=7)
+        output_file = str(tmp_path / f'existing_{seed}.geojsons')
+        assert compiler._write_geojsonseq_from_parquet(parquet_file, output_file) == n
+        with open(output_file, 'rb') as f:
+            outputs.append(f.read())
+    assert outputs[0] == outputs[1] == outputs[2]
@@ -0,0 +1,147 @@
+"""Test ZIP paralel (zip_builder.py): data descriptor, chunk deflate, ZIP64 dan build reproducible"""
+
+import io
+import os
+import random
+import shutil
+import struct
+import subprocess
+import zipfile
+import zlib
+
+import pytest
+
+import zip_builder
+from zip_builder import ParallelZipWriter
+
+
+class _Unseekable(io.RawIOBase):
+    """Output write-only tanpa seek/tell, seperti S3MultipartWriter"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer += data
+        return len(data)
+
+
+@pytest.fixture
+def members(tmp_path):
+    rng = random.Random(0)
+    words = [b'mangrove', b'bpdas', b'kawasan', b'lebat', b'sedang', b'jarang']
+    files = {
+        'data.dbf': b' '.join(rng.choice(words) for _ in range(60000)),          # multi-chunk
+        'random.shp': bytes(rng.getrandbits(8) for _ in range(50000)),         # tidak terkompresi
+        'empty.cpg': b'',
+        'tiles.pmtiles': b'PMTiles' + bytes(rng.getrandbits(8) for _ in range(3000)),  # stored
+        'sub/dir/ä.txt': 'non-ascii name'.encode('utf-8'),
+    }
+    paths = []
+    for name, content in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        paths.append((str(path), name))
+    return paths, files
+
+
+def _build(paths, **kwargs):
+    out = _Unseekable()
+    with ParallelZipWriter(out, max_workers=3, chunk_size=64 * 1024, **kwargs) as zipf:
+        for path, arcname in paths:
+            zipf.add(path, arcname)
+    return bytes(out.buffer)
+
+
+def _check_archive(data, files, tmp_path):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == list(files)
+        for info in archive.infolist():
+            # Data descriptor hanya untuk member deflate
+            assert bool(info.flag_bits & 0x08) == (info.compress_type == zipfile.ZIP_DEFLATED)
+            assert archive.read(info) == files[info.filename]
+        methods = {info.filename: info.compress_type for info in archive.infolist()}
+    assert methods['tiles.pmtiles'] == zipfile.ZIP_STORED
+    assert methods['data.dbf'] == zipfile.ZIP_DEFLATED
+
+    if shutil.which('unzip'):
+        path = tmp_path / 'archive.zip'
+        path.write_bytes(data)
+        assert subprocess.run(['unzip', '-tq', str(path)], capture_output=True).returncode == 0
+
+
+def _stream_members(data):
+    """
+    Baca member seperti pembaca streaming (tanpa central directory): akhir member deflate
+    dari stream deflate + data descriptor, akhir member stored dari ukuran di local header
+    """
+    members, offset = {}, 0
+    while struct.unpack_from('<I', data, offset)[0] == 0x04034b50:
+        (flags, method, crc, compress_size, file_size,
+         name_length, extra_length) = struct.unpack_from('<HHxxxxIIIHH', data, offset + 6)
+        name = data[offset + 30:offset + 30 + name_length].decode('utf-8')
+        extra = data[offset + 30 + name_length:offset + 30 + name_length + extra_length]
+        zip64 = compress_size == 0xFFFFFFFF
+        if zip64:
+            assert struct.unpack_from('<HH', extra) == (0x0001, 16)
+            file_size, compress_size = struct.unpack_from('<QQ', extra, 4)
+        start = offset + 30 + name_length + extra_length
+
+        if flags & 0x08:
+            assert method == zipfile.ZIP_DEFLATED
+            decompressor = zlib.decompressobj(-15)
+            content = decompressor.decompress(data[start:])
+            end = len(data) - len(decompressor.unused_data)
+            signature, crc, compress_size, file_size = struct.unpack_from('<IIQQ' if zip64 else '<IIII', data, end)
+            assert signature == 0x08074b50 and compress_size == end - start
+            offset = end + (24 if zip64 else 16)
+        else:
+            assert method == zipfile.ZIP_STORED
+            content = data[start:start + compress_size]
+            offset = start + compress_size
+
+        assert len(content) == file_size
+        assert zlib.crc32(content) == crc
+        members[name] = content
+    return members
+
+
+def test_round_trip(members, tmp_path):
+    paths, files = members
+    data = _build(paths)
+
+    _check_archive(data, files, tmp_path)
+    assert _stream_members(data) == files
+    # Chunk paralel tetap satu stream deflate dengan rasio mendekati kompresi satu thread
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.getinfo('data.dbf').compress_size < len(files['data.dbf']) // 4
+
+
+def test_zip64_round_trip(members, tmp_path, monkeypatch):
+    # Batas ZIP64 diturunkan agar record ZIP64 (local, central, EOCD64) ikut diuji tanpa file 4 GB
+    monkeypatch.setattr(zip_builder, '_ZIP64_LIMIT', 1000)
+    paths, files = members
+    data = _build(paths)
+
+    assert b'PK\x06\x06' in data and b'PK\x06\x07' in data
+    _check_archive(data, files, tmp_path)
+    assert _stream_members(data) == files
+
+
+def test_fixed_date_time_is_reproducible(members, tmp_path):
+    paths, files = members
+    first = _build(paths, date_time=(2025, 1, 1, 0, 0, 0))
+    for path, _ in paths:
+        os.utime(path, (1_700_000_000, 1_700_000_000))
+        os.chmod(path, 0o600)
+    second = _build(paths, date_time=(2025, 1, 1, 0, 0, 0))
+
+    assert first == second
+    with zipfile.ZipFile(io.BytesIO(first)) as archive:
+        assert {info.date_time for info in archive.infolist()} == {(2025, 1, 1, 0, 0, 0)}
+    _check_archive(first, files, tmp_path)
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Parallel ZIP Builder
+Tulis arsip ZIP dengan kompresi member secara paralel di thread pool (zlib melepas GIL
+saat kompresi). Member besar dipecah menjadi chunk yang di-deflate terpisah lalu
+disambung menjadi satu stream deflate (seperti pigz): tiap chunk diakhiri Z_SYNC_FLUSH,
+dan chunk berikutnya memakai 32 KB terakhir chunk sebelumnya sebagai dictionary sehingga
+rasio kompresi hampir sama dengan kompresi satu thread. Member yang sudah terkompresi
+(mis. .zip, .pmtiles) disimpan tanpa deflate ulang.
+
+Output ditulis berurutan tanpa seek (local header + data descriptor, ZIP64 bila perlu),
+sehingga bisa langsung ke S3MultipartWriter. Member stored tidak memakai data descriptor:
+CRC dan ukurannya dihitung lebih dulu dari file lokal dan ditulis di local header, karena
+pembaca streaming (unzip dari pipe, Java ZipInputStream) tidak bisa menemukan akhir data
+stored tanpa ukuran di header. Hasilnya ZIP standar yang bisa dibuka
+zipfile, unzip, 7-Zip, dan GDAL /vsizip/.
+
+Dengan date_time tetap, metadata member tidak bergantung filesystem (timestamp dan
+permission sama untuk semua member), sehingga isi dan urutan member yang sama selalu
+menghasilkan arsip yang identik per byte.
+"""
+
+import os
+import stat
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, List, Optional
+
+# Konfigurasi kompresi ZIP paralel
+ZIP_BUILDER_CONFIG = {
+    'compress_level': 6,              # Level zlib (1 = cepat, 9 = paling kecil)
+    'max_workers': None,              # None = jumlah CPU
+    'chunk_size': 4 * 1024 * 1024,    # Ukuran chunk deflate per thread
+    # Member dengan ekstensi ini disimpan apa adanya (sudah terkompresi)
+    'stored_extensions': ('.zip', '.gz', '.bz2', '.xz', '.zst', '.7z', '.pmtiles',
+                          '.png', '.jpg', '.jpeg', '.webp', '.parquet')
+}
+
+_DICT_SIZE = 32 * 1024          # Window deflate
+_ZIP64_LIMIT = (1 << 31) - 1    # Sama dengan zipfile.ZIP64_LIMIT
+_MAX_UINT32 = 0xFFFFFFFF
+
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+
+
+def _dos_datetime(date_time: tuple) -> tuple:
+    """(time, date) format DOS dari (year, month, day, hour, min, sec) (minimal 1980-01-01)"""
+    year, month, day, hour, minute, second = date_time[:6]
+    if year < 1980:
+        return 0, (0 << 9) | (1 << 5) | 1
+    return ((hour << 11) | (minute << 5) | (second // 2),
+            ((year - 1980) << 9) | (month << 5) | day)
+
+
+def _deflate_chunk(data: bytes, zdict: Optional[bytes], last: bool, level: int) -> bytes:
+    """Raw deflate satu chunk; chunk selain yang terakhir diakhiri sync flush (byte-aligned)"""
+    if zdict:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=zdict)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def _file_crc(path: str, chunk_size: int) -> int:
+    """CRC-32 seluruh isi file"""
+    crc = 0
+    with open(path, 'rb') as f:
+        for data in iter(lambda: f.read(chunk_size), b''):
+            crc = zlib.crc32(data, crc)
+    return crc
+
+
+def _completed(result) -> Future:
+    """Future yang sudah selesai (member stored tidak perlu dikirim ke executor)"""
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class _Entry:
+    """Status satu member: header lokal, CRC, dan ukuran yang diakumulasi selagi ditulis"""
+
+    def __init__(self, path: str, arcname: str, stored: bool, date_time: Optional[tuple] = None):
+        st = os.stat(path)
+        self.path = path
+        self.arcname = arcname.replace(os.sep, '/')
+        self.name = self.arcname.encode('utf-8')
+        self.method = zlib.DEFLATED if not stored and st.st_size > 0 else 0
+        # Ukuran hasil deflate baru diketahui setelah ditulis: data descriptor. Member stored
+        # (dan file kosong) ukurannya sudah diketahui, CRC-nya dihitung sebelum header ditulis
+        self.descriptor = self.method != 0
+        self.flags = ((_FLAG_DATA_DESCRIPTOR if self.descriptor else 0)
+                      | (0 if self.arcname.isascii() else _FLAG_UTF8))
+        if date_time is None:
+            self.dos_time, self.dos_date = _dos_datetime(time.localtime(st.st_mtime))
+            self.external_attr = (st.st_mode & 0xFFFF) << 16
+        else:
+            # Build reproducible: timestamp dan permission tidak diambil dari filesystem
+            self.dos_time, self.dos_date = _dos_datetime(date_time)
+            self.external_attr = (stat.S_IFREG | 0o644) << 16
+        self.file_size = st.st_size
+        # Ukuran deflate final belum diketahui saat header ditulis: perkiraan atas seperti zipfile
+        self.zip64 = (st.st_size * 1.05 if self.descriptor else st.st_size) > _ZIP64_LIMIT
+        self.crc = 0
+        self.compress_size = 0
+        self.header_offset = 0
+
+    @property
+    def version(self) -> int:
+        return 45 if self.zip64 else 20
+
+
+class ParallelZipWriter:
+    """
+    Arsip ZIP dengan kompresi paralel.
+
+    Member didaftarkan dengan add(); seluruh member dikompres dan ditulis saat close()
+    (atau keluar dari context manager) dalam satu pipeline, sehingga member kecil juga
+    dikompres bersamaan. Memori yang dipakai sebanding dengan jumlah chunk yang sedang
+    diproses (2 x max_workers x chunk_size), bukan ukuran member.
+    
+    Jika date_time diisi (year, month, day, hour, min, sec), semua member memakai timestamp
+    tersebut dan permission 0644, bukan mtime / mode file lokal.
+    """
+    
+    def __init__(self, fileobj: BinaryIO, compress_level: Optional[int] = None,
+                 max_workers: Optional[int] = None, chunk_size: Optional[int] = None,
+                 date_time: Optional[tuple] = None):
+        self.fileobj = fileobj
+        self.compress_level = (compress_level if compress_level is not None
+                               else ZIP_BUILDER_CONFIG['compress_level'])
+        self.max_workers = max_workers or ZIP_BUILDER_CONFIG['max_workers'] or os.cpu_count() or 1
+        self.chunk_size = chunk_size or ZIP_BUILDER_CONFIG['chunk_size']
+        self.date_time = tuple(date_time) if date_time is not None else None
+
+        self._members = []
+        self._entries: List[_Entry] = []
+        self._offset = 0
+        self._closed = False
+
+    def add(self, path: str, arcname: Optional[str] = None, stored: Optional[bool] = None):
+        """
+        Daftarkan file sebagai member.
+
+        Args:
+            path: Path file lokal
+            arcname: Nama di dalam ZIP (default: nama file)
+            stored: Paksa simpan tanpa kompresi; default dari ZIP_BUILDER_CONFIG['stored_extensions']
+        """
+        if self._closed:
+            raise ValueError("ZIP archive already closed")
+        if stored is None:
+            stored = path.lower().endswith(ZIP_BUILDER_CONFIG['stored_extensions'])
+        self._members.append((path, arcname or os.path.basename(path), stored))
+
+    # ---- output ----
+
+    def _write(self, data: bytes):
+        self.fileobj.write(data)
+        self._offset += len(data)
+
+    def _write_local_header(self, entry: _Entry):
+        entry.header_offset = self._offset
+        # Dengan data descriptor: CRC dan ukuran di header 0 (nilai sebenarnya di descriptor)
+        crc, size = (0, 0) if entry.descriptor else (entry.crc, entry.file_size)
+        extra = b''
+        size_field = size
+        if entry.zip64:
+            # Ukuran 8 byte di extra field ZIP64
+            extra = struct.pack('<HHQQ', 0x0001, 16, size, size)
+            size_field = _MAX_UINT32
+        self._write(struct.pack('<IHHHHHIIIHH', 0x04034b50, entry.version, entry.flags,
+                                entry.method, entry.dos_time, entry.dos_date,
+                                crc, size_field, size_field, len(entry.name), len(extra)))
+        self._write(entry.name + extra)
+
+    def _write_data_descriptor(self, entry: _Entry):
+        if not entry.descriptor:
+            if entry.compress_size != entry.file_size:
+                raise ValueError(f"{entry.path} changed while being added to the ZIP archive")
+            return
+        if entry.zip64:
+            self._write(struct.pack('<IIQQ', 0x08074b50, entry.crc, entry.compress_size, entry.file_size))
+        else:
+            self._write(struct.pack('<IIII', 0x08074b50, entry.crc, entry.compress_size, entry.file_size))
+
+    def _write_central_directory(self):
+        cd_offset = self._offset
+        for entry in self._entries:
+            fields = []
+            file_size, compress_size, header_offset = entry.file_size, entry.compress_size, entry.header_offset
+            if file_size > _ZIP64_LIMIT:
+                fields.append(file_size)
+                file_size = _MAX_UINT32
+            if compress_size > _ZIP64_LIMIT:
+                fields.append(compress_size)
+                compress_size = _MAX_UINT32
+            if header_offset > _ZIP64_LIMIT:
+                fields.append(header_offset)
+                header_offset = _MAX_UINT32
+            extra = struct.pack(f'<HH{len(fields)}Q', 0x0001, 8 * len(fields), *fields) if fields else b''
+            version = 45 if fields or entry.zip64 else 20
+
+            self._write(struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, (3 << 8) | version, version,
+                                    entry.flags, entry.method, entry.dos_time, entry.dos_date,
+                                    entry.crc, compress_size, file_size,
+                                    len(entry.name), len(extra), 0, 0, 0,
+                                    entry.external_attr, header_offset))
+            self._write(entry.name + extra)
+
+        cd_size = self._offset - cd_offset
+        count = len(self._entries)
+        if count > 0xFFFF or cd_size > _ZIP64_LIMIT or cd_offset > _ZIP64_LIMIT:
+            zip64_offset = self._offset
+            self._write(struct.pack('<IQHHIIQQQQ', 0x06064b50, 44, 45, 45, 0, 0,
+                                    count, count, cd_size, cd_offset))
+            self._write(struct.pack('<IIQI', 0x07064b50, 0, zip64_offset, 1))
+            count = min(count, 0xFFFF)
+            cd_size = min(cd_size, _MAX_UINT32)
+            cd_offset = min(cd_offset, _MAX_UINT32)
+        self._write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, count, count, cd_size, cd_offset, 0))
+
+    # ---- pipeline ----
+
+    def _jobs(self, executor):
+        """
+        Baca member berurutan per chunk (CRC dihitung di sini; member stored sebelum header),
+        kirim kompresi ke executor.
+        Yield (entry, event, future): event 'start' sebelum chunk pertama, 'chunk' per chunk,
+        'end' setelah chunk terakhir.
+        """
+        for path, arcname, stored in self._members:
+            entry = _Entry(path, arcname, stored, self.date_time)
+            if not entry.descriptor:
+                entry.crc = _file_crc(path, self.chunk_size)
+            yield entry, 'start', None
+
+            with open(path, 'rb') as f:
+                previous = None
+                data = f.read(self.chunk_size)
+                while data:
+                    following = f.read(self.chunk_size)
+                    if entry.method == 0:
+                        yield entry, 'chunk', _completed(data)
+                    else:
+                        entry.crc = zlib.crc32(data, entry.crc)
+                        zdict = previous[-_DICT_SIZE:] if previous else None
+                        yield entry, 'chunk', executor.submit(_deflate_chunk, data, zdict,
+                                                              not following, self.compress_level)
+                    previous, data = data, following
+
+            yield entry, 'end', None
+
+    def _flush_event(self, entry: _Entry, event: str, future):
+        if event == 'start':
+            self._write_local_header(entry)
+        elif event == 'chunk':
+            data = future.result()
+            entry.compress_size += len(data)
+            self._write(data)
+        else:
+            self._write_data_descriptor(entry)
+            self._entries.append(entry)
+
+    def close(self):
+        """Kompres dan tulis seluruh member, lalu central directory"""
+        if self._closed:
+            return
+        self._closed = True
+
+        window = self.max_workers * 2
+        pending = deque()
+        in_flight = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for item in self._jobs(executor):
+                pending.append(item)
+                in_flight += item[1] == 'chunk'
+                # Tulis hasil berurutan; jumlah chunk yang tertahan di memori dibatasi window
+                while in_flight > window:
+                    entry, event, future = pending.popleft()
+                    in_flight -= event == 'chunk'
+                    self._flush_event(entry, event, future)
+            while pending:
+                self._flush_event(*pending.popleft())
+
+        self._write_central_directory()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._closed = True
+        return False